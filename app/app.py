@@ -1,25 +1,59 @@
 """Bayern Leverkusen 2023/24 Bundesliga Analysis Dashboard."""
 
-import math
-
 import plotly.graph_objs as go
+from callback_cache import CallbackCache, get_backend
 from dash import Dash, dcc, html
 from dash.dependencies import Input, Output
-from pitch_plot import create_pitch
+from figures import (
+    clear_analyses,
+    match_scoreboard,
+    pass_network_figure,
+    player_passes_figure,
+    radar_chart_figure,
+    shot_bubble_figure,
+    shot_chart_figure,
+)
 
+from football_analysis.config import cc
 from football_analysis.config.constant import (
-    GAME_ID_TITLE,
-)
-from football_analysis.statsbomb.analysis import (
-    Event,
-    MatchInfo,
-    PassAnalysis,
-    ShotAnalysis,
+    BAYER_LEVERKUSEN_TEAM_ID,
+    BUNDESLIGA_COMPETITION_ID,
+    SEASON_2023_24_ID,
 )
+from football_analysis.statsbomb.figure_store import FigureStore
+from football_analysis.statsbomb.metadata import match_index
+from football_analysis.statsbomb.repository import match_repository
 
 app = Dash(__name__, title="Leverkusen 23-24 Statsbomb Data", update_title=None)
 server = app.server
 
+GAME_ID_TITLE = match_index.titles(
+    BUNDESLIGA_COMPETITION_ID, SEASON_2023_24_ID, BAYER_LEVERKUSEN_TEAM_ID
+)
+
+# Serve figures written by jobs/precompute_figures.py when enabled
+figure_store = FigureStore() if cc.DASHBOARD_PRECOMPUTED else None
+
+# Callback results, keyed on their inputs and the data version of the game
+callback_cache = CallbackCache(get_backend())
+
+
+@callback_cache.on_invalidate
+def reload_match(game_id):
+    """Forget the parsed events and analyses of a game whose data changed."""
+    match_repository.invalidate(str(game_id))
+    clear_analyses(game_id)
+
+
+@server.route("/cache-stats")
+def cache_stats():
+    """Hit rates of the callback cache and of the match repository."""
+    return {
+        "callbacks": callback_cache.stats.as_dict(),
+        "matches": match_repository.stats.as_dict(),
+    }
+
+
 default_layout = go.Layout(
     showlegend=False,
     autosize=False,
@@ -33,624 +67,87 @@ default_layout = go.Layout(
 )
 
 
-def create_pass_analysis(game_id):
-    """Create a PassAnalysis object for the given game_id."""
-    pass_analysis = PassAnalysis(
-        game_id=game_id, team_id=904, starting_players_only=True
-    )
-    return pass_analysis
-
-
-def create_shot_analysis(game_id):
-    """Create a ShotAnalysis object for the given game_id."""
-    shot_analysis = ShotAnalysis(
-        game_id=game_id,
-        team_id=904,
-    )
-    return shot_analysis
-
-
-def create_event_analysis(game_id, player_id):
-    """Create an Event object for the given game_id and player_id."""
-    event_analysis = Event(game_id=game_id, player_id=player_id)
-    return event_analysis
+def precomputed(name, game_id, player_id=None):
+    """Return a figure precomputed from the current data, or None to compute it."""
+    if figure_store is None or not game_id:
+        return None
+    version = callback_cache.versions.get(game_id)
+    return figure_store.get(name, game_id, player_id, version=version)
 
 
 @app.callback(
     [Output("pass-network-graph", "figure"), Output("player-dropdown", "options")],
     [Input("game-dropdown", "value")],
 )
+@callback_cache.memoize("pass_network")
 def update_pass_analysis(game_id):
     """Update the pass network graph and player dropdown options."""
-    pass_analysis = create_pass_analysis(game_id)
-    temp_passes_between, temp_passers_avg_location = pass_analysis.plotly_test_network()
-    title_text = f"{pass_analysis.team_name} vs {pass_analysis.opp_team_name}"
-
-    resize_factor = 0.58
-
-    # Update traces with new pass_analysis object
-    traces = create_pitch(resize_factor=resize_factor)
-    for i in range(len(temp_passes_between)):
-        traces.append(
-            go.Scatter(
-                x=temp_passes_between[["x", "x_end"]].iloc[i].values * resize_factor,
-                y=temp_passes_between[["y", "y_end"]].iloc[i].values * resize_factor,
-                mode="lines",
-                line={
-                    "width": float(temp_passes_between["width"].iloc[i])
-                    * resize_factor,
-                    "color": "rgba(128, 128, 128, 0.65)",
-                },
-                hovertemplate="Number of passes: %{text}",
-                text=f'{temp_passes_between["pass_count"].iloc[i]}',
-            )
-        )
-    # Add the marker trace
-    traces.append(
-        go.Scatter(
-            x=temp_passers_avg_location["x"] * resize_factor,
-            y=temp_passers_avg_location["y"] * resize_factor,
-            mode="markers",
-            marker={
-                "size": temp_passers_avg_location["normalized_marker_size"]
-                * resize_factor,
-                "sizemode": "diameter",
-                "sizemin": 4 * resize_factor,
-                "sizeref": 1 / 30 * resize_factor,
-                "color": "#E32221",
-                "opacity": 1,
-                "line": {"color": "#E32221", "width": 10 * resize_factor},
-            },
-            text=temp_passers_avg_location["player_name"]
-            + " ("
-            + temp_passers_avg_location["jersey_number"].astype(str)
-            + ") - "
-            + temp_passers_avg_location["position_name"]
-            + "<br>"
-            + temp_passers_avg_location["passes_given"].astype(str)
-            + " passes given<br>"
-            + temp_passers_avg_location["passes_received"].astype(str)
-            + " passes received",
-            textposition="middle center",
-            hovertemplate="%{text}<extra></extra>",
-            hoverinfo="text",
-        )
-    )
-
-    # Update layout with new pass_analysis object
-    annotations = []
-    for _, row in temp_passers_avg_location.iterrows():
-        annotations.append(
-            {
-                "x": row["x"] * resize_factor,
-                "y": row["y"] * resize_factor,
-                "text": str(row["jersey_number"]),
-                "showarrow": False,
-                "font": {
-                    "size": (15 * row["normalized_marker_size"] + 8) * resize_factor,
-                    "color": "white",
-                    "family": "DIN Alternate, bold",
-                },
-                "xanchor": "center",
-                "yanchor": "middle",
-            }
-        )
-
-    layout = go.Layout(
-        title={
-            "text": title_text,
-            "font": {
-                "color": "#808080",
-                "size": 36 * resize_factor,  # adjust as needed
-                "family": "DIN Alternate, bold",
-            },
-            "xanchor": "center",
-            "yanchor": "top",
-        },
-        showlegend=False,
-        autosize=False,
-        width=1200 * resize_factor,
-        height=800 * resize_factor,
-        xaxis={
-            "showgrid": False,
-            "zeroline": False,
-            "showticklabels": False,
-            "range": [value * resize_factor for value in [0, 120]],
-        },
-        yaxis={
-            "showgrid": False,
-            "zeroline": False,
-            "showticklabels": False,
-            "range": [value * resize_factor for value in [0, 80]],
-        },
-        annotations=annotations,
-        plot_bgcolor="rgba(20, 20, 20, 0.9)",
-        paper_bgcolor="rgba(20, 20, 20, 0.9)",
-        margin=dict(t=40, b=40, l=40, r=40),
-    )
-
-    # Update player dropdown options
-    player_dropdown_options = [
-        {"label": f"{player[0]} ({player[2]}) | {player[3]}", "value": player[1]}
-        for player in pass_analysis.players_df[
-            ["player_name", "player_id", "position_abbreviation", "jersey_number"]
-        ].values
-    ]
-
-    return {"data": traces, "layout": layout}, player_dropdown_options
+    figure = precomputed("pass_network", game_id)
+    if figure is not None:
+        return tuple(figure)
+    return pass_network_figure(game_id)
 
 
 @app.callback(
     Output("player-passes-graph", "figure"),
     [Input("game-dropdown", "value"), Input("player-dropdown", "value")],
 )
+@callback_cache.memoize("player_passes")
 def update_player_passes(game_id, player_id=None):
     """Update the player passes graph."""
-    pass_analysis = create_pass_analysis(game_id)
-    # player_passes = pass_analysis.get_player_passes(int(player_id))
-    player_passes = pass_analysis.team_passes
-
-    resize_factor = 0.58
-
-    # If player_id is not None, filter passes by player_id
-    if player_id:
-        player_passes = [
-            pass_obj
-            for pass_obj in player_passes
-            if pass_obj["player"]["id"] == int(player_id)
-        ]
-    else:  # If player_id is None, show first 100 passes
-        player_passes = player_passes[:100]
-
-    player_dict = pass_analysis.players_df.set_index("player_id")[
-        "player_name"
-    ].to_dict()
-    title_text = (
-        "First 100 passes of the game"
-        if player_id is None
-        else f"Passes by {player_dict[str(player_id)]}"
-    )
-
-    annotations = []
-
-    traces = create_pitch(resize_factor=resize_factor)
-    for pass_obj in player_passes:
-
-        start_location = pass_obj["location"]
-        end_location = pass_obj["pass"]["end_location"]
-
-        # If 'recipient' key exists, consider pass complete
-        if (
-            pass_obj.get("pass", {}).get("outcome", {}).get("name", "") == "Incomplete"
-            or "recipient" not in pass_obj["pass"]
-        ):
-            # draw red arrow for incomplete passes
-            arrow_color = "rgba(255, 0, 0, 0.65)"
-        else:
-            arrow_color = "rgba(128, 128, 128, 1)"
-
-        # Get recipient name if exists
-        recipient_name = (
-            pass_obj["pass"].get("recipient", {}).get("name", "No recipient")
-        )
-        # Get body part if exists
-        body_part = pass_obj["pass"].get("body_part", {}).get("name", "No body part")
-        # Get outcome name if exists
-        outcome_name = pass_obj["pass"].get("outcome", {}).get("name", "Complete")
-        # Get player name
-        player_name = pass_obj["player"]["name"]
-
-        # Draw the shaft of the arrow as a line without hover text:
-        traces.append(
-            go.Scatter(
-                x=[
-                    value * resize_factor
-                    for value in [start_location[0], end_location[0]]
-                ],
-                y=[
-                    value * resize_factor
-                    for value in [start_location[1], end_location[1]]
-                ],
-                mode="lines",
-                line={"width": 2 * resize_factor, "color": arrow_color},
-                hoverinfo="none",  # Disable hover for the lines
-            )
-        )
-        # Create individual points for pass start and end with hover text:
-        text_str = (
-            f"{player_name}<br><br>Play pattern: "
-            + f"{pass_obj['play_pattern']['name']}<br>Recipient: {recipient_name}<br>"
-            + f"Body Part: {body_part}<br>Outcome: {outcome_name}"
-        )
-
-        traces.append(
-            go.Scatter(
-                x=[
-                    value * resize_factor
-                    for value in [start_location[0], end_location[0]]
-                ],
-                y=[
-                    value * resize_factor
-                    for value in [start_location[1], end_location[1]]
-                ],
-                mode="markers",
-                marker={"size": 5 * resize_factor, "color": "rgba(128, 128, 128, 0.0)"},
-                text=[text_str, text_str],
-                hovertemplate="%{text}<extra></extra>",
-            )
-        )
-        # Add an arrow annotation for the pass:
-        annotations.append(
-            {
-                "y": end_location[1] * resize_factor,
-                "x": end_location[0] * resize_factor,
-                "ay": start_location[1] * resize_factor,
-                "ax": start_location[0] * resize_factor,
-                "xref": "x",
-                "yref": "y",
-                "axref": "x",
-                "ayref": "y",
-                "showarrow": True,
-                "arrowhead": 1,
-                "arrowsize": 1,
-                "arrowwidth": 2,
-                "arrowcolor": arrow_color,
-            }
-        )
-    layout = go.Layout(
-        title={
-            "text": title_text,
-            "font": {
-                "color": "#808080",
-                "size": 36 * resize_factor,  # adjust as needed
-                "family": "DIN Alternate, bold",
-            },
-            "xanchor": "center",
-            "yanchor": "top",
-        },
-        showlegend=False,
-        autosize=False,
-        width=1200 * resize_factor,  # 1200, 800, 600
-        height=800 * resize_factor,  # 800, 533.33, 400
-        xaxis={
-            "showgrid": False,
-            "zeroline": False,
-            "showticklabels": False,
-            "range": [value * resize_factor for value in [0, 120]],
-        },
-        yaxis={
-            "showgrid": False,
-            "zeroline": False,
-            "showticklabels": False,
-            "range": [value * resize_factor for value in [0, 80]],
-        },
-        plot_bgcolor="rgba(20, 20, 20, 0.0)",
-        paper_bgcolor="rgba(20, 20, 20, 0.9)",
-        annotations=annotations,
-        margin=dict(t=40, b=40, l=40, r=40),
-    )
-
-    return {"data": traces, "layout": layout}
+    figure = precomputed("player_passes", game_id, player_id)
+    if figure is not None:
+        return figure
+    return player_passes_figure(game_id, player_id)
 
 
 @app.callback(
     Output("shots-graph", "figure"),
     [Input("game-dropdown", "value"), Input("player-dropdown", "value")],
 )
+@callback_cache.memoize("shot_chart")
 def update_shot_chart(game_id, player_id=None):
     """Update the shots graph."""
-    shot_analysis = create_shot_analysis(game_id)
-    player_shots = shot_analysis.team_shots
-
-    # If player_id is not None, filter shots by player_id
-    if player_id:
-        player_shots = [
-            shot for shot in player_shots if shot["player"]["id"] == int(player_id)
-        ]
-    else:
-        player_shots = player_shots[:100]
-
-    annotations = []
-    resize_factor = 0.58
-
-    traces = create_pitch(resize_factor=resize_factor)
-    for shot_obj in player_shots:
-
-        start_location = shot_obj["location"]
-        end_location = shot_obj["shot"]["end_location"]
-
-        # If outcome is Goal, set color to green
-        if shot_obj["shot"]["outcome"]["name"] == "Goal":
-            marker_color = "rgba(0, 255, 0, 0.65)"
-        else:
-            # draw red arrow for missed shots
-            marker_color = "rgba(255, 0, 0, 0.50)"
-
-        # Get technique name if exists
-        technique_name = (
-            shot_obj["shot"].get("technique", {}).get("name", "No technique")
-        )
-        # Get body part if exists
-        body_part = shot_obj["shot"].get("body_part", {}).get("name", "No body part")
-        # Get outcome name if exists
-        outcome_name = shot_obj["shot"].get("outcome", {}).get("name", "Complete")
-        # Get type name if exists
-        type_name = shot_obj["shot"].get("type", {}).get("name", "No type")
-        # Get player name
-        player_name = shot_obj["player"]["name"]
-        # Get statsbomb_xg
-        statsbomb_xg = shot_obj["shot"].get("statsbomb_xg", "No xG")
-        # Adjust marker size based on logarithmic scale
-        marker_size = math.log(statsbomb_xg + 1) * 100
-
-        # Draw the shaft of the arrow as a line without hover text:
-        traces.append(
-            go.Scatter(
-                x=[value * resize_factor for value in [start_location[0]]],
-                y=[value * resize_factor for value in [start_location[1]]],
-                mode="markers",
-                line={"width": 4 * resize_factor, "color": marker_color},
-                hoverinfo="none",  # Disable hover for the lines
-            )
-        )
-        # Create individual points for pass start and end with hover text:
-        text_str = (
-            f"{player_name} (xG: {statsbomb_xg:.2f})<br><br>Play pattern: "
-            + f"{shot_obj['play_pattern']['name']}<br>Recipient: {type_name}<br>Body Part: "
-            + f"{body_part}<br>Outcome: {outcome_name}<br>Technique: {technique_name}"
-        )
-
-        traces.append(
-            go.Scatter(
-                x=[value * resize_factor for value in [start_location[0]]],
-                y=[value * resize_factor for value in [start_location[1]]],
-                mode="markers",
-                marker={"size": 1 * resize_factor, "color": "rgba(128, 128, 128, 0.0)"},
-                # marker={
-                #     "size":marker_size,
-                #     "sizemode":"diameter",
-                #     "sizeref":1,
-                #     "color":marker_color,
-                #     "opacity":0.65
-                # },
-                text=[text_str, text_str],
-                hovertemplate="%{text}<extra></extra>",
-            )
-        )
-        # Add an arrow annotation for the pass:
-        annotations.append(
-            {
-                "y": end_location[1] * resize_factor,
-                "x": end_location[0] * resize_factor,
-                "ay": start_location[1] * resize_factor,
-                "ax": start_location[0] * resize_factor,
-                "xref": "x",
-                "yref": "y",
-                "axref": "x",
-                "ayref": "y",
-                "showarrow": True,
-                "arrowhead": 1,
-                "arrowsize": 1,
-                "arrowwidth": 2,
-                "arrowcolor": marker_color,
-            }
-        )
-    layout = go.Layout(
-        title={
-            "text": "Shots by Team",
-            "font": {
-                "color": "#808080",
-                "size": 36 * resize_factor,  # adjust as needed
-                "family": "DIN Alternate, bold",
-            },
-            "xanchor": "center",
-            "yanchor": "top",
-        },
-        showlegend=False,
-        autosize=False,
-        width=1200 * resize_factor,
-        height=800 * resize_factor,
-        xaxis={
-            "showgrid": False,
-            "zeroline": False,
-            "showticklabels": False,
-            "range": [value * resize_factor for value in [0, 120]],
-        },
-        yaxis={
-            "showgrid": False,
-            "zeroline": False,
-            "showticklabels": False,
-            "range": [value * resize_factor for value in [0, 80]],
-        },
-        plot_bgcolor="rgba(20, 20, 20, 0.9)",
-        paper_bgcolor="rgba(20, 20, 20, 0.9)",
-        annotations=annotations,  # Include the annotations here
-        margin=dict(t=40, b=40, l=40, r=40),
-    )
-
-    return {"data": traces, "layout": layout}
+    figure = precomputed("shot_chart", game_id, player_id)
+    if figure is not None:
+        return figure
+    return shot_chart_figure(game_id, player_id)
 
 
 @app.callback(
     Output("radar-chart", "figure"),
     [Input("game-dropdown", "value"), Input("player-dropdown", "value")],
 )
+@callback_cache.memoize("radar_chart")
 def update_radar_chart(game_id, player_id=None):
     """Update the radar chart."""
-    event_analysis = create_event_analysis(game_id, player_id)
-    event_count = event_analysis.event_count
-    # opp_event_count = event_analysis.opp_event_count
-
-    data = [
-        go.Scatterpolar(
-            r=list(event_count.values()),
-            theta=list(event_count.keys()),
-            fill="toself",
-            name="Player Events",
-            fillcolor="rgba(255, 0, 0, 0.65)",
-            line={"color": "rgba(255, 0, 0, 0.65)"},
-        ),
-        # go.Scatterpolar(
-        #     r=list(opp_event_count.values()),
-        #     theta=list(opp_event_count.keys()),
-        #     fill='toself',
-        #     name='Opponent Events',
-        #     fillcolor='rgba(128, 128, 128, 0.65)',
-        #     line=dict(color='rgba(128, 128, 128, 0.65)')
-        # )
-    ]
-
-    layout = go.Layout(
-        polar={
-            "bgcolor": "rgba(20, 20, 20, 0.9)",
-            "radialaxis": {"showgrid": True, "gridcolor": "rgba(128, 128, 128, 0.3)"},
-            "angularaxis": {
-                "showgrid": True,
-                "gridcolor": "rgba(128, 128, 128, 0.5)",
-                "linecolor": "rgba(128, 128, 128, 0.5)",
-                "tickfont": {
-                    "color": "rgba(128, 128, 128, 1)",
-                    "size": 10,
-                    "family": "DIN Alternate, bold",
-                },
-                # "tickangle": -45  # rotate labels
-            },
-        },
-        plot_bgcolor="rgba(20, 20, 20, 0.9)",
-        paper_bgcolor="rgba(20, 20, 20, 0.9)",
-        width=600,
-        height=533.33,
-        margin=dict(t=40, b=40, l=80, r=80),  # increase left and right margins
-    )
-
-    return {"data": data, "layout": layout}
+    figure = precomputed("radar_chart", game_id, player_id)
+    if figure is not None:
+        return figure
+    return radar_chart_figure(game_id, player_id)
 
 
 @app.callback(
     Output("shot-bubble-graph", "figure"),
     [Input("game-dropdown", "value"), Input("player-dropdown", "value")],
 )
+@callback_cache.memoize("shot_bubble")
 def update_shot_bubble_chart(game_id, player_id=None):
     """Update the shot bubble chart."""
-    shot_analysis = create_shot_analysis(game_id)
-    player_shots = shot_analysis.team_shots
-
-    # If player_id is not None, filter shots by player_id
-    if player_id:
-        player_shots = [
-            shot for shot in player_shots if shot["player"]["id"] == int(player_id)
-        ]
-
-    resize_factor = 0.58
-
-    traces = create_pitch(resize_factor=resize_factor)
-    for shot_obj in player_shots:
-
-        start_location = shot_obj["location"]
-        # end_location = shot_obj["shot"]["end_location"]
-
-        # If outcome is Goal, set color to green
-        if shot_obj["shot"]["outcome"]["name"] == "Goal":
-            marker_color = "rgba(0, 255, 0, 0.65)"
-        else:
-            # draw red arrow for missed shots
-            marker_color = "rgba(255, 0, 0, 0.50)"
-
-        # Get technique name if exists
-        technique_name = (
-            shot_obj["shot"].get("technique", {}).get("name", "No technique")
-        )
-        # Get body part if exists
-        body_part = shot_obj["shot"].get("body_part", {}).get("name", "No body part")
-        # Get outcome name if exists
-        outcome_name = shot_obj["shot"].get("outcome", {}).get("name", "Complete")
-        # Get type name if exists
-        type_name = shot_obj["shot"].get("type", {}).get("name", "No type")
-        # Get player name
-        player_name = shot_obj["player"]["name"]
-        # Get statsbomb_xg
-        statsbomb_xg = shot_obj["shot"].get("statsbomb_xg", "No xG")
-        # Adjust marker size based on logarithmic scale
-        marker_size = math.log(statsbomb_xg + 1) * 100
-
-        text_str = (
-            f"{player_name} (xG: {statsbomb_xg:.2f})<br><br>Play pattern: "
-            + f"{shot_obj['play_pattern']['name']}<br>Recipient: {type_name}<br>Body Part: "
-            + f"{body_part}<br>Outcome: {outcome_name}<br>Technique: {technique_name}"
-        )
-
-        traces.append(
-            go.Scatter(
-                x=[start_location[0] * resize_factor],
-                y=[start_location[1] * resize_factor],
-                mode="markers",
-                marker={
-                    "size": marker_size,
-                    "sizemode": "diameter",
-                    "sizeref": 1,
-                    "color": marker_color,
-                    "opacity": 0.65,
-                },
-                text=[text_str],
-                hovertemplate="%{text}<extra></extra>",
-            )
-        )
-
-    layout = go.Layout(
-        title={
-            "text": "Shots by Team",
-            "font": {
-                "color": "#808080",
-                "size": 36 * resize_factor,  # adjust as needed
-                "family": "DIN Alternate, bold",
-            },
-            "xanchor": "center",
-            "yanchor": "top",
-        },
-        showlegend=False,
-        autosize=False,
-        width=1200 * resize_factor,
-        height=800 * resize_factor,
-        xaxis={
-            "showgrid": False,
-            "zeroline": False,
-            "showticklabels": False,
-            "range": [value * resize_factor for value in [0, 120]],
-        },
-        yaxis={
-            "showgrid": False,
-            "zeroline": False,
-            "showticklabels": False,
-            "range": [value * resize_factor for value in [0, 80]],
-        },
-        plot_bgcolor="rgba(20, 20, 20, 0.9)",
-        paper_bgcolor="rgba(20, 20, 20, 0.9)",
-        # annotations=annotations,  # Include the annotations here
-        margin=dict(t=40, b=40, l=40, r=40),
-    )
-    return {"data": traces, "layout": layout}
+    figure = precomputed("shot_bubble", game_id, player_id)
+    if figure is not None:
+        return figure
+    return shot_bubble_figure(game_id, player_id)
 
 
 @app.callback(Output("match-info", "children"), [Input("game-dropdown", "value")])
+@callback_cache.memoize("match_info")
 def update_match_info(game_id=None):
     """Update the match info."""
-    if game_id:
-        match = MatchInfo(game_id=game_id)
-
-        home_team = match.match_info.get("home_team", {}).get(
-            "home_team_name", "Home Team"
-        )
-        away_team = match.match_info.get("away_team", {}).get(
-            "away_team_name", "Away Team"
-        )
-        home_score = match.match_info.get("home_score", 0)
-        away_score = match.match_info.get("away_score", 0)
-
-        match_scoreboard = f"{home_team} {home_score} x {away_score} {away_team}"
-    else:
-        match_scoreboard = "No match info available"
-
-    return match_scoreboard
+    scoreboard = precomputed("match_info", game_id)
+    if scoreboard is not None:
+        return scoreboard
+    return match_scoreboard(game_id)
 
 
 app.layout = html.Div(
@@ -691,7 +188,7 @@ app.layout = html.Div(
                                 {"label": game[1], "value": game[0]}
                                 for game in GAME_ID_TITLE.items()
                             ],
-                            value=list(GAME_ID_TITLE.items())[0][0],
+                            value=next(iter(GAME_ID_TITLE), None),
                         ),
                     ],
                     style={"width": "45%"},
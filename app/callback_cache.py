@@ -0,0 +1,319 @@
+"""Server-side cache of the dashboard callback results."""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import wraps
+
+from plotly.utils import PlotlyJSONEncoder
+
+from football_analysis.config import cc
+from football_analysis.io import json as fast_json
+from football_analysis.statsbomb.ledger import ProcessingLedger
+
+try:
+    import redis
+except ImportError:  # only the redis backend needs it
+    redis = None
+
+# Returned by the backends for a key they do not hold
+MISSING = object()
+
+
+def dumps(value) -> bytes:
+    """Serialize a callback result (figures, dropdown options or text)."""
+    return json.dumps(value, cls=PlotlyJSONEncoder).encode()
+
+
+@dataclass
+class MemoryBackend:
+    """
+    In-process LRU of callback results, kept as the returned objects.
+
+    Args:
+    max_entries (int): Maximum number of results kept
+    """
+
+    max_entries: int = cc.CALLBACK_CACHE_MAX_ENTRIES
+
+    def __post_init__(self):
+        self._entries: OrderedDict[tuple[str, str], object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, game_id: str, key: str):
+        with self._lock:
+            value = self._entries.get((game_id, key), MISSING)
+            if value is not MISSING:
+                self._entries.move_to_end((game_id, key))
+            return value
+
+    def set(self, game_id: str, key: str, value):
+        with self._lock:
+            self._entries[(game_id, key)] = value
+            self._entries.move_to_end((game_id, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_match(self, game_id: str):
+        with self._lock:
+            for entry in [entry for entry in self._entries if entry[0] == game_id]:
+                del self._entries[entry]
+
+
+@dataclass
+class DiskBackend:
+    """
+    Gzip-compressed JSON files of callback results, one folder per game.
+
+    Results survive restarts and are shared by the processes of a server.
+
+    Args:
+    root (str): Folder holding the results
+    """
+
+    root: str = cc.CALLBACK_CACHE_PATH
+
+    def _path(self, game_id: str, key: str) -> str:
+        return os.path.join(self.root, str(game_id), f"{key}.json.gz")
+
+    def get(self, game_id: str, key: str):
+        try:
+            with gzip.open(self._path(game_id, key), "rb") as f:
+                return fast_json.loads(f.read())
+        except FileNotFoundError:
+            return MISSING
+
+    def set(self, game_id: str, key: str, value):
+        path = self._path(game_id, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(dumps(value)))
+        os.replace(tmp_path, path)
+
+    def delete_match(self, game_id: str):
+        shutil.rmtree(os.path.join(self.root, str(game_id)), ignore_errors=True)
+
+
+@dataclass
+class RedisBackend:
+    """
+    Callback results in Redis (or any server speaking its protocol).
+
+    Args:
+    url (str): Redis URL
+    prefix (str): Prefix of the keys
+    """
+
+    url: str = cc.CALLBACK_CACHE_REDIS_URL
+    prefix: str = "callback-cache"
+
+    def __post_init__(self):
+        if redis is None:
+            raise ValueError("The redis callback cache needs the redis package")
+        self._client = redis.Redis.from_url(self.url)
+
+    def get(self, game_id: str, key: str):
+        data = self._client.get(f"{self.prefix}:{game_id}:{key}")
+        return MISSING if data is None else fast_json.loads(data)
+
+    def set(self, game_id: str, key: str, value):
+        self._client.set(f"{self.prefix}:{game_id}:{key}", dumps(value))
+
+    def delete_match(self, game_id: str):
+        keys = list(self._client.scan_iter(f"{self.prefix}:{game_id}:*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+BACKENDS = {"memory": MemoryBackend, "disk": DiskBackend, "redis": RedisBackend}
+
+
+def get_backend(name: str | None = cc.CALLBACK_CACHE_BACKEND):
+    """Backend named in the settings, or None to not cache."""
+    if not name:
+        return None
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown callback cache backend {name!r}")
+    return BACKENDS[name]()
+
+
+@dataclass
+class MatchVersions:
+    """
+    Version of the data behind each match, that cached results are keyed on.
+
+    A processed match is versioned by the hash the processing ledger recorded
+    for its event file; the ledger is read again whenever it changes. Other
+    matches are versioned by the size and modification time of their file.
+
+    jobs/process_data.py writes the ledger only once the merged and summary
+    partitions are rebuilt, so a version read before a callback runs is never
+    newer than the data the callback reads. A result computed while a match
+    is reprocessed is kept under the previous version, and dropped as soon as
+    the ledger records the new one.
+
+    Args:
+    ledger_path (str): Ledger written by jobs/process_data.py
+    data_folder (str): Folder holding the ``<game_id>.json`` event files
+    """
+
+    ledger_path: str = cc.PROCESSING_LEDGER_PATH
+    data_folder: str = os.path.join("data", "events")
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._entries: dict[str, dict] = {}
+
+    def _ledger(self) -> dict[str, dict]:
+        try:
+            stat = os.stat(self.ledger_path)
+        except FileNotFoundError:
+            return {}
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if stamp != self._stamp:
+                self._entries = ProcessingLedger(self.ledger_path).entries
+                self._stamp = stamp
+            return self._entries
+
+    def get(self, game_id: str) -> str:
+        entry = self._ledger().get(f"events/{game_id}.json")
+        if entry is not None:
+            return entry["sha256"]
+        try:
+            stat = os.stat(os.path.join(self.data_folder, f"{game_id}.json"))
+        except FileNotFoundError:
+            return ""
+        return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+@dataclass
+class CallbackStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    callbacks: dict[str, list[int]] = field(default_factory=dict)
+
+    @staticmethod
+    def _rate(hits: int, misses: int) -> float:
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self._rate(self.hits, self.misses),
+            "invalidations": self.invalidations,
+            "callbacks": {
+                name: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": self._rate(hits, misses),
+                }
+                for name, (hits, misses) in sorted(self.callbacks.items())
+            },
+        }
+
+
+@dataclass
+class CallbackCache:
+    """
+    Memoizes dashboard callbacks, which are pure functions of their inputs.
+
+    Results are keyed on the callback name, its inputs and the version of
+    the data of the game (the first input). When the data of a game changes,
+    e.g. because jobs/process_data.py reprocessed it, its results are
+    deleted and the invalidation hooks run for it.
+
+    Args:
+    backend: MemoryBackend, DiskBackend, RedisBackend, or None to not cache
+    versions (MatchVersions): Data version of each game
+    """
+
+    backend: object | None = None
+    versions: MatchVersions = field(default_factory=MatchVersions)
+    stats: CallbackStats = field(default_factory=CallbackStats)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._seen: dict[str, str] = {}
+        self._hooks = []
+
+    def on_invalidate(self, hook):
+        """Register a function called with the game_id of changed data."""
+        self._hooks.append(hook)
+        return hook
+
+    def invalidate(self, game_id: str):
+        """Delete the results of a game and run the invalidation hooks."""
+        if self.backend is not None:
+            self.backend.delete_match(game_id)
+        with self._lock:
+            self.stats.invalidations += 1
+        for hook in self._hooks:
+            hook(game_id)
+
+    def version(self, game_id: str) -> str:
+        """Data version of a game, invalidating it if it changed."""
+        version = self.versions.get(game_id)
+        with self._lock:
+            previous = self._seen.get(game_id)
+            self._seen[game_id] = version
+        if previous is not None and previous != version:
+            self.invalidate(game_id)
+        return version
+
+    @staticmethod
+    def key(name: str, inputs: list, version: str) -> str:
+        return hashlib.sha256(
+            json.dumps([name, inputs, version], default=str).encode()
+        ).hexdigest()
+
+    def _count(self, name: str, hit: bool):
+        with self._lock:
+            counts = self.stats.callbacks.setdefault(name, [0, 0])
+            if hit:
+                self.stats.hits += 1
+                counts[0] += 1
+            else:
+                self.stats.misses += 1
+                counts[1] += 1
+
+    def memoize(self, name: str):
+        """
+        Decorator caching a callback whose first input is the game_id.
+
+        Args:
+        name (str): Name of the callback in the keys and statistics
+
+        Returns:
+        Callable: Decorator
+        """
+
+        def decorator(func):
+            if self.backend is None:
+                return func
+
+            @wraps(func)
+            def wrapper(game_id=None, *inputs):
+                # Nothing to version before a game is selected
+                if not game_id:
+                    return func(game_id, *inputs)
+                key = self.key(name, [game_id, *inputs], self.version(game_id))
+                value = self.backend.get(game_id, key)
+                self._count(name, hit=value is not MISSING)
+                if value is MISSING:
+                    value = func(game_id, *inputs)
+                    self.backend.set(game_id, key, value)
+                return value
+
+            return wrapper
+
+        return decorator
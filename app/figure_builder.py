@@ -0,0 +1,126 @@
+"""Batched Plotly traces: one trace per colour class instead of one per item."""
+
+import numpy as np
+import plotly.graph_objs as go
+
+
+def _interleave(start, end):
+    """Return [start0, end0, None, start1, end1, None, ...] for a line trace."""
+    values = np.empty(3 * len(start), dtype=object)
+    values[0::3] = start
+    values[1::3] = end
+    values[2::3] = None
+    return values
+
+
+def segments_trace(x, y, x_end, y_end, color, width, text=None, resize_factor=1.0):
+    """Draw every (x, y) -> (x_end, y_end) segment as a single line trace."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    x_end, y_end = np.asarray(x_end, dtype=float), np.asarray(y_end, dtype=float)
+    trace = go.Scatter(
+        x=_interleave(x * resize_factor, x_end * resize_factor),
+        y=_interleave(y * resize_factor, y_end * resize_factor),
+        mode="lines",
+        line={"width": width * resize_factor, "color": color},
+    )
+    if text is None:
+        trace.hoverinfo = "none"
+    else:
+        trace.text = _interleave(text, text)
+        trace.hovertemplate = "%{text}<extra></extra>"
+    return trace
+
+
+def grouped_segments_traces(
+    x, y, x_end, y_end, colors, width, text=None, resize_factor=1.0
+):
+    """Draw segments as one line trace per distinct colour."""
+    colors = np.asarray(colors, dtype=object)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    x_end, y_end = np.asarray(x_end, dtype=float), np.asarray(y_end, dtype=float)
+    text = None if text is None else np.asarray(text, dtype=object)
+    traces = []
+    for color in dict.fromkeys(colors):
+        mask = colors == color
+        traces.append(
+            segments_trace(
+                x[mask],
+                y[mask],
+                x_end[mask],
+                y_end[mask],
+                color=color,
+                width=width,
+                text=None if text is None else text[mask],
+                resize_factor=resize_factor,
+            )
+        )
+    return traces
+
+
+def weighted_segments_traces(
+    x, y, x_end, y_end, widths, color, text=None, width_classes=6, resize_factor=1.0
+):
+    """
+    Draw segments of varying width as one line trace per width class.
+
+    Plotly line widths are per trace, so widths are bucketed into
+    ``width_classes`` equal steps up to the largest width and each bucket is drawn
+    at its upper bound.
+    """
+    widths = np.asarray(widths, dtype=float)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    x_end, y_end = np.asarray(x_end, dtype=float), np.asarray(y_end, dtype=float)
+    text = None if text is None else np.asarray(text, dtype=object)
+    if len(widths) == 0:
+        return []
+    step = widths.max() / width_classes
+    width_class = np.maximum(np.ceil(widths / step), 1)
+    traces = []
+    for level in np.unique(width_class):
+        mask = width_class == level
+        traces.append(
+            segments_trace(
+                x[mask],
+                y[mask],
+                x_end[mask],
+                y_end[mask],
+                color=color,
+                width=level * step,
+                text=None if text is None else text[mask],
+                resize_factor=resize_factor,
+            )
+        )
+    return traces
+
+
+def arrowheads_trace(x, y, x_end, y_end, colors, size=8, resize_factor=1.0):
+    """Draw an arrowhead at every segment end as one rotated triangle trace."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    x_end, y_end = np.asarray(x_end, dtype=float), np.asarray(y_end, dtype=float)
+    # marker angles are clockwise from north, in degrees
+    angle = np.degrees(np.arctan2(x_end - x, y_end - y))
+    return go.Scatter(
+        x=x_end * resize_factor,
+        y=y_end * resize_factor,
+        mode="markers",
+        marker={
+            "symbol": "triangle-up",
+            "angle": angle,
+            "size": size * resize_factor,
+            "color": colors,
+            "line": {"width": 0},
+        },
+        hoverinfo="none",
+    )
+
+
+def hover_markers_trace(x, y, text, size=5, resize_factor=1.0):
+    """Invisible markers carrying hover text, one point per location."""
+    return go.Scatter(
+        x=np.asarray(x, dtype=float) * resize_factor,
+        y=np.asarray(y, dtype=float) * resize_factor,
+        mode="markers",
+        marker={"size": size * resize_factor, "color": "rgba(128, 128, 128, 0.0)"},
+        text=text,
+        hovertemplate="%{text}<extra></extra>",
+    )
@@ -0,0 +1,610 @@
+"""Figures shown by the dashboard, as pure functions of (game_id, player_id)."""
+
+import math
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objs as go
+from figure_builder import (
+    arrowheads_trace,
+    grouped_segments_traces,
+    hover_markers_trace,
+    weighted_segments_traces,
+)
+from pitch_plot import create_pitch_shapes
+
+from football_analysis.config import cc
+from football_analysis.config.constant import BAYER_LEVERKUSEN_TEAM_ID
+from football_analysis.statsbomb.analysis import (
+    Event,
+    MatchInfo,
+    PassAnalysis,
+    ShotAnalysis,
+)
+
+# Analyses are built once per game and shared by the callbacks; a player
+# selection only slices them with for_player. Kept per game, most recent
+# last, so that the analyses of one game can be dropped on their own.
+_analyses: OrderedDict[str, dict] = OrderedDict()
+_analyses_lock = threading.Lock()
+
+
+def _get_analysis(game_id, analysis_class, **kwargs):
+    """Analysis of a game, built on first use and kept for the next callbacks."""
+    key = str(game_id)
+    with _analyses_lock:
+        analysis = _analyses.get(key, {}).get(analysis_class)
+        if analysis is not None:
+            _analyses.move_to_end(key)
+            return analysis
+
+    analysis = analysis_class(game_id=game_id, **kwargs)
+    with _analyses_lock:
+        _analyses.setdefault(key, {})[analysis_class] = analysis
+        _analyses.move_to_end(key)
+        while len(_analyses) > cc.MATCH_CACHE_MAX_MATCHES:
+            _analyses.popitem(last=False)
+    return analysis
+
+
+def create_pass_analysis(game_id):
+    """Create a PassAnalysis object for the given game_id."""
+    return _get_analysis(
+        game_id,
+        PassAnalysis,
+        team_id=BAYER_LEVERKUSEN_TEAM_ID,
+        starting_players_only=True,
+    )
+
+
+def create_shot_analysis(game_id):
+    """Create a ShotAnalysis object for the given game_id."""
+    return _get_analysis(game_id, ShotAnalysis, team_id=BAYER_LEVERKUSEN_TEAM_ID)
+
+
+def create_event_analysis(game_id):
+    """Create an Event object for the given game_id."""
+    return _get_analysis(game_id, Event)
+
+
+def clear_analyses(game_id=None):
+    """Forget the analyses of a game (default: every game) whose data changed."""
+    with _analyses_lock:
+        if game_id is None:
+            _analyses.clear()
+        else:
+            _analyses.pop(str(game_id), None)
+
+
+def pass_network_figure(game_id):
+    """Build the pass network figure and player dropdown options."""
+    pass_analysis = create_pass_analysis(game_id)
+    temp_passes_between, temp_passers_avg_location = pass_analysis.plotly_test_network()
+    title_text = f"{pass_analysis.team_name} vs {pass_analysis.opp_team_name}"
+
+    resize_factor = 0.58
+
+    # Update traces with new pass_analysis object
+    traces = []
+    # One line trace per width class instead of one per pair of players
+    traces.extend(
+        weighted_segments_traces(
+            temp_passes_between["x"],
+            temp_passes_between["y"],
+            temp_passes_between["x_end"],
+            temp_passes_between["y_end"],
+            widths=temp_passes_between["width"],
+            color="rgba(128, 128, 128, 0.65)",
+            text="Number of passes: " + temp_passes_between["pass_count"].astype(str),
+            resize_factor=resize_factor,
+        )
+    )
+    # Add the marker trace
+    traces.append(
+        go.Scatter(
+            x=temp_passers_avg_location["x"] * resize_factor,
+            y=temp_passers_avg_location["y"] * resize_factor,
+            mode="markers",
+            marker={
+                "size": temp_passers_avg_location["normalized_marker_size"]
+                * resize_factor,
+                "sizemode": "diameter",
+                "sizemin": 4 * resize_factor,
+                "sizeref": 1 / 30 * resize_factor,
+                "color": "#E32221",
+                "opacity": 1,
+                "line": {"color": "#E32221", "width": 10 * resize_factor},
+            },
+            text=temp_passers_avg_location["player_name"]
+            + " ("
+            + temp_passers_avg_location["jersey_number"].astype(str)
+            + ") - "
+            + temp_passers_avg_location["position_name"]
+            + "<br>"
+            + temp_passers_avg_location["passes_given"].astype(str)
+            + " passes given<br>"
+            + temp_passers_avg_location["passes_received"].astype(str)
+            + " passes received",
+            textposition="middle center",
+            hovertemplate="%{text}<extra></extra>",
+            hoverinfo="text",
+        )
+    )
+
+    # Update layout with new pass_analysis object
+    annotations = []
+    for _, row in temp_passers_avg_location.iterrows():
+        annotations.append(
+            {
+                "x": row["x"] * resize_factor,
+                "y": row["y"] * resize_factor,
+                "text": str(row["jersey_number"]),
+                "showarrow": False,
+                "font": {
+                    "size": (15 * row["normalized_marker_size"] + 8) * resize_factor,
+                    "color": "white",
+                    "family": "DIN Alternate, bold",
+                },
+                "xanchor": "center",
+                "yanchor": "middle",
+            }
+        )
+
+    layout = go.Layout(
+        title={
+            "text": title_text,
+            "font": {
+                "color": "#808080",
+                "size": 36 * resize_factor,  # adjust as needed
+                "family": "DIN Alternate, bold",
+            },
+            "xanchor": "center",
+            "yanchor": "top",
+        },
+        showlegend=False,
+        autosize=False,
+        # Pitch markings as cached layout shapes instead of ~15 traces
+        shapes=create_pitch_shapes(resize_factor),
+        width=1200 * resize_factor,
+        height=800 * resize_factor,
+        xaxis={
+            "showgrid": False,
+            "zeroline": False,
+            "showticklabels": False,
+            "range": [value * resize_factor for value in [0, 120]],
+        },
+        yaxis={
+            "showgrid": False,
+            "zeroline": False,
+            "showticklabels": False,
+            "range": [value * resize_factor for value in [0, 80]],
+        },
+        annotations=annotations,
+        plot_bgcolor="rgba(20, 20, 20, 0.9)",
+        paper_bgcolor="rgba(20, 20, 20, 0.9)",
+        margin=dict(t=40, b=40, l=40, r=40),
+    )
+
+    # Update player dropdown options
+    player_dropdown_options = [
+        {"label": f"{player[0]} ({player[2]}) | {player[3]}", "value": player[1]}
+        for player in pass_analysis.players_df[
+            ["player_name", "player_id", "position_abbreviation", "jersey_number"]
+        ].values
+    ]
+
+    return {"data": traces, "layout": layout}, player_dropdown_options
+
+
+def player_passes_figure(game_id, player_id=None):
+    """Build the player passes figure."""
+    pass_analysis = create_pass_analysis(game_id)
+
+    resize_factor = 0.58
+
+    # If player_id is not None, filter passes by player_id
+    if player_id:
+        player_passes = pass_analysis.for_player(player_id).team_passes
+    else:  # If player_id is None, show first 100 passes
+        player_passes = pass_analysis.team_passes[:100]
+
+    player_dict = pass_analysis.players_df.set_index("player_id")[
+        "player_name"
+    ].to_dict()
+    title_text = (
+        "First 100 passes of the game"
+        if player_id is None
+        else f"Passes by {player_dict[int(player_id)]}"
+    )
+
+    x, y, x_end, y_end, arrow_colors, hover_text = [], [], [], [], [], []
+    for pass_obj in player_passes:
+
+        start_location = pass_obj["location"]
+        end_location = pass_obj["pass"]["end_location"]
+
+        # If 'recipient' key exists, consider pass complete
+        if (
+            pass_obj.get("pass", {}).get("outcome", {}).get("name", "") == "Incomplete"
+            or "recipient" not in pass_obj["pass"]
+        ):
+            # draw red arrow for incomplete passes
+            arrow_color = "rgba(255, 0, 0, 0.65)"
+        else:
+            arrow_color = "rgba(128, 128, 128, 1)"
+
+        # Get recipient name if exists
+        recipient_name = (
+            pass_obj["pass"].get("recipient", {}).get("name", "No recipient")
+        )
+        # Get body part if exists
+        body_part = pass_obj["pass"].get("body_part", {}).get("name", "No body part")
+        # Get outcome name if exists
+        outcome_name = pass_obj["pass"].get("outcome", {}).get("name", "Complete")
+        # Get player name
+        player_name = pass_obj["player"]["name"]
+
+        text_str = (
+            f"{player_name}<br><br>Play pattern: "
+            + f"{pass_obj['play_pattern']['name']}<br>Recipient: {recipient_name}<br>"
+            + f"Body Part: {body_part}<br>Outcome: {outcome_name}"
+        )
+
+        x.append(start_location[0])
+        y.append(start_location[1])
+        x_end.append(end_location[0])
+        y_end.append(end_location[1])
+        arrow_colors.append(arrow_color)
+        hover_text.append(text_str)
+
+    traces = []
+    # Arrow shafts, one line trace per colour
+    traces.extend(
+        grouped_segments_traces(
+            x, y, x_end, y_end, arrow_colors, width=2, resize_factor=resize_factor
+        )
+    )
+    # Hover points at pass start and end
+    traces.append(
+        hover_markers_trace(
+            x + x_end, y + y_end, hover_text + hover_text, resize_factor=resize_factor
+        )
+    )
+    # Arrowheads
+    traces.append(
+        arrowheads_trace(
+            x, y, x_end, y_end, arrow_colors, size=8, resize_factor=resize_factor
+        )
+    )
+    layout = go.Layout(
+        title={
+            "text": title_text,
+            "font": {
+                "color": "#808080",
+                "size": 36 * resize_factor,  # adjust as needed
+                "family": "DIN Alternate, bold",
+            },
+            "xanchor": "center",
+            "yanchor": "top",
+        },
+        showlegend=False,
+        autosize=False,
+        # Pitch markings as cached layout shapes instead of ~15 traces
+        shapes=create_pitch_shapes(resize_factor),
+        width=1200 * resize_factor,  # 1200, 800, 600
+        height=800 * resize_factor,  # 800, 533.33, 400
+        xaxis={
+            "showgrid": False,
+            "zeroline": False,
+            "showticklabels": False,
+            "range": [value * resize_factor for value in [0, 120]],
+        },
+        yaxis={
+            "showgrid": False,
+            "zeroline": False,
+            "showticklabels": False,
+            "range": [value * resize_factor for value in [0, 80]],
+        },
+        plot_bgcolor="rgba(20, 20, 20, 0.0)",
+        paper_bgcolor="rgba(20, 20, 20, 0.9)",
+        margin=dict(t=40, b=40, l=40, r=40),
+    )
+
+    return {"data": traces, "layout": layout}
+
+
+def shot_chart_figure(game_id, player_id=None):
+    """Build the shots figure."""
+    shot_analysis = create_shot_analysis(game_id)
+
+    # If player_id is not None, filter shots by player_id
+    if player_id:
+        player_shots = shot_analysis.for_player(player_id).team_shots
+    else:
+        player_shots = shot_analysis.team_shots[:100]
+
+    resize_factor = 0.58
+
+    x, y, x_end, y_end, marker_colors, hover_text = [], [], [], [], [], []
+    for shot_obj in player_shots:
+
+        start_location = shot_obj["location"]
+        end_location = shot_obj["shot"]["end_location"]
+
+        # If outcome is Goal, set color to green
+        if shot_obj["shot"]["outcome"]["name"] == "Goal":
+            marker_color = "rgba(0, 255, 0, 0.65)"
+        else:
+            # draw red arrow for missed shots
+            marker_color = "rgba(255, 0, 0, 0.50)"
+
+        # Get technique name if exists
+        technique_name = (
+            shot_obj["shot"].get("technique", {}).get("name", "No technique")
+        )
+        # Get body part if exists
+        body_part = shot_obj["shot"].get("body_part", {}).get("name", "No body part")
+        # Get outcome name if exists
+        outcome_name = shot_obj["shot"].get("outcome", {}).get("name", "Complete")
+        # Get type name if exists
+        type_name = shot_obj["shot"].get("type", {}).get("name", "No type")
+        # Get player name
+        player_name = shot_obj["player"]["name"]
+        # Get statsbomb_xg
+        statsbomb_xg = shot_obj["shot"].get("statsbomb_xg", "No xG")
+
+        text_str = (
+            f"{player_name} (xG: {statsbomb_xg:.2f})<br><br>Play pattern: "
+            + f"{shot_obj['play_pattern']['name']}<br>Recipient: {type_name}<br>Body Part: "
+            + f"{body_part}<br>Outcome: {outcome_name}<br>Technique: {technique_name}"
+        )
+
+        x.append(start_location[0])
+        y.append(start_location[1])
+        x_end.append(end_location[0])
+        y_end.append(end_location[1])
+        marker_colors.append(marker_color)
+        hover_text.append(text_str)
+
+    traces = []
+    # Shot trajectories, one line trace per outcome colour
+    traces.extend(
+        grouped_segments_traces(
+            x, y, x_end, y_end, marker_colors, width=2, resize_factor=resize_factor
+        )
+    )
+    # Shot locations with hover text
+    traces.append(
+        go.Scatter(
+            x=[value * resize_factor for value in x],
+            y=[value * resize_factor for value in y],
+            mode="markers",
+            marker={"size": 6 * resize_factor, "color": marker_colors},
+            text=hover_text,
+            hovertemplate="%{text}<extra></extra>",
+        )
+    )
+    # Arrowheads at the shot end locations
+    traces.append(
+        arrowheads_trace(
+            x, y, x_end, y_end, marker_colors, size=8, resize_factor=resize_factor
+        )
+    )
+    layout = go.Layout(
+        title={
+            "text": "Shots by Team",
+            "font": {
+                "color": "#808080",
+                "size": 36 * resize_factor,  # adjust as needed
+                "family": "DIN Alternate, bold",
+            },
+            "xanchor": "center",
+            "yanchor": "top",
+        },
+        showlegend=False,
+        autosize=False,
+        # Pitch markings as cached layout shapes instead of ~15 traces
+        shapes=create_pitch_shapes(resize_factor),
+        width=1200 * resize_factor,
+        height=800 * resize_factor,
+        xaxis={
+            "showgrid": False,
+            "zeroline": False,
+            "showticklabels": False,
+            "range": [value * resize_factor for value in [0, 120]],
+        },
+        yaxis={
+            "showgrid": False,
+            "zeroline": False,
+            "showticklabels": False,
+            "range": [value * resize_factor for value in [0, 80]],
+        },
+        plot_bgcolor="rgba(20, 20, 20, 0.9)",
+        paper_bgcolor="rgba(20, 20, 20, 0.9)",
+        margin=dict(t=40, b=40, l=40, r=40),
+    )
+
+    return {"data": traces, "layout": layout}
+
+
+def radar_chart_figure(game_id, player_id=None):
+    """Build the radar chart figure."""
+    event_analysis = create_event_analysis(game_id)
+    if player_id is not None:
+        event_analysis = event_analysis.for_player(player_id)
+    event_count = event_analysis.event_count
+    # opp_event_count = event_analysis.opp_event_count
+
+    data = [
+        go.Scatterpolar(
+            r=list(event_count.values()),
+            theta=list(event_count.keys()),
+            fill="toself",
+            name="Player Events",
+            fillcolor="rgba(255, 0, 0, 0.65)",
+            line={"color": "rgba(255, 0, 0, 0.65)"},
+        ),
+        # go.Scatterpolar(
+        #     r=list(opp_event_count.values()),
+        #     theta=list(opp_event_count.keys()),
+        #     fill='toself',
+        #     name='Opponent Events',
+        #     fillcolor='rgba(128, 128, 128, 0.65)',
+        #     line=dict(color='rgba(128, 128, 128, 0.65)')
+        # )
+    ]
+
+    layout = go.Layout(
+        polar={
+            "bgcolor": "rgba(20, 20, 20, 0.9)",
+            "radialaxis": {"showgrid": True, "gridcolor": "rgba(128, 128, 128, 0.3)"},
+            "angularaxis": {
+                "showgrid": True,
+                "gridcolor": "rgba(128, 128, 128, 0.5)",
+                "linecolor": "rgba(128, 128, 128, 0.5)",
+                "tickfont": {
+                    "color": "rgba(128, 128, 128, 1)",
+                    "size": 10,
+                    "family": "DIN Alternate, bold",
+                },
+                # "tickangle": -45  # rotate labels
+            },
+        },
+        plot_bgcolor="rgba(20, 20, 20, 0.9)",
+        paper_bgcolor="rgba(20, 20, 20, 0.9)",
+        width=600,
+        height=533.33,
+        margin=dict(t=40, b=40, l=80, r=80),  # increase left and right margins
+    )
+
+    return {"data": data, "layout": layout}
+
+
+def shot_bubble_figure(game_id, player_id=None):
+    """Build the shot bubble chart figure."""
+    shot_analysis = create_shot_analysis(game_id)
+
+    # If player_id is not None, filter shots by player_id
+    if player_id:
+        shot_analysis = shot_analysis.for_player(player_id)
+    player_shots = shot_analysis.team_shots
+
+    resize_factor = 0.58
+
+    x, y, marker_sizes, marker_colors, hover_text = [], [], [], [], []
+    for shot_obj in player_shots:
+
+        start_location = shot_obj["location"]
+        # end_location = shot_obj["shot"]["end_location"]
+
+        # If outcome is Goal, set color to green
+        if shot_obj["shot"]["outcome"]["name"] == "Goal":
+            marker_color = "rgba(0, 255, 0, 0.65)"
+        else:
+            # draw red arrow for missed shots
+            marker_color = "rgba(255, 0, 0, 0.50)"
+
+        # Get technique name if exists
+        technique_name = (
+            shot_obj["shot"].get("technique", {}).get("name", "No technique")
+        )
+        # Get body part if exists
+        body_part = shot_obj["shot"].get("body_part", {}).get("name", "No body part")
+        # Get outcome name if exists
+        outcome_name = shot_obj["shot"].get("outcome", {}).get("name", "Complete")
+        # Get type name if exists
+        type_name = shot_obj["shot"].get("type", {}).get("name", "No type")
+        # Get player name
+        player_name = shot_obj["player"]["name"]
+        # Get statsbomb_xg
+        statsbomb_xg = shot_obj["shot"].get("statsbomb_xg", "No xG")
+        # Adjust marker size based on logarithmic scale
+        marker_size = math.log(statsbomb_xg + 1) * 100
+
+        text_str = (
+            f"{player_name} (xG: {statsbomb_xg:.2f})<br><br>Play pattern: "
+            + f"{shot_obj['play_pattern']['name']}<br>Recipient: {type_name}<br>Body Part: "
+            + f"{body_part}<br>Outcome: {outcome_name}<br>Technique: {technique_name}"
+        )
+
+        x.append(start_location[0] * resize_factor)
+        y.append(start_location[1] * resize_factor)
+        marker_sizes.append(marker_size)
+        marker_colors.append(marker_color)
+        hover_text.append(text_str)
+
+    traces = []
+    # All shots as one bubble trace
+    traces.append(
+        go.Scatter(
+            x=x,
+            y=y,
+            mode="markers",
+            marker={
+                "size": marker_sizes,
+                "sizemode": "diameter",
+                "sizeref": 1,
+                "color": marker_colors,
+                "opacity": 0.65,
+            },
+            text=hover_text,
+            hovertemplate="%{text}<extra></extra>",
+        )
+    )
+
+    layout = go.Layout(
+        title={
+            "text": "Shots by Team",
+            "font": {
+                "color": "#808080",
+                "size": 36 * resize_factor,  # adjust as needed
+                "family": "DIN Alternate, bold",
+            },
+            "xanchor": "center",
+            "yanchor": "top",
+        },
+        showlegend=False,
+        autosize=False,
+        # Pitch markings as cached layout shapes instead of ~15 traces
+        shapes=create_pitch_shapes(resize_factor),
+        width=1200 * resize_factor,
+        height=800 * resize_factor,
+        xaxis={
+            "showgrid": False,
+            "zeroline": False,
+            "showticklabels": False,
+            "range": [value * resize_factor for value in [0, 120]],
+        },
+        yaxis={
+            "showgrid": False,
+            "zeroline": False,
+            "showticklabels": False,
+            "range": [value * resize_factor for value in [0, 80]],
+        },
+        plot_bgcolor="rgba(20, 20, 20, 0.9)",
+        paper_bgcolor="rgba(20, 20, 20, 0.9)",
+        # annotations=annotations,  # Include the annotations here
+        margin=dict(t=40, b=40, l=40, r=40),
+    )
+    return {"data": traces, "layout": layout}
+
+
+def match_scoreboard(game_id=None):
+    """Build the match scoreboard text."""
+    if game_id:
+        match = MatchInfo(game_id=game_id)
+
+        home_team = match.match_info.get("home_team", {}).get(
+            "home_team_name", "Home Team"
+        )
+        away_team = match.match_info.get("away_team", {}).get(
+            "away_team_name", "Away Team"
+        )
+        home_score = match.match_info.get("home_score", 0)
+        away_score = match.match_info.get("away_score", 0)
+
+        match_scoreboard = f"{home_team} {home_score} x {away_score} {away_team}"
+    else:
+        match_scoreboard = "No match info available"
+
+    return match_scoreboard
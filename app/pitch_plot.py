@@ -1,8 +1,20 @@
+from functools import lru_cache
+
 import numpy as np
 import plotly.graph_objs as go
 
+PITCH_LINE_COLOR = "#808080"
+# Penalty arc half-angle: the part of the 9.15m circle outside the 16.5m box
+PENALTY_ARC_ANGLE = np.arccos((16.5 - 11) / 9.15)
+
 
 def create_pitch(resize_factor=1.0):
+    # Traces are built once per resize_factor; callers get a fresh list to extend
+    return list(_pitch_traces(resize_factor))
+
+
+@lru_cache(maxsize=8)
+def _pitch_traces(resize_factor):
     # Create a trace for the pitch
     pitch_trace = go.Scatter(
         x=[value * resize_factor for value in [0, 120, 120, 0, 0]],
@@ -199,7 +211,7 @@ def create_pitch(resize_factor=1.0):
         hoverinfo="none",
     )
 
-    return [
+    return (
         pitch_trace,
         midfield_trace,
         center_circle_trace,
@@ -215,10 +227,15 @@ def create_pitch(resize_factor=1.0):
         penalty_arc2_trace_positive,
         penalty_arc2_trace_negative,
         penalty_arc2_trace_linear,
-    ]
+    )
 
 
 def create_half_pitch_rotated():
+    return list(_half_pitch_rotated_traces())
+
+
+@lru_cache(maxsize=1)
+def _half_pitch_rotated_traces():
     # Create a trace for the pitch
     pitch_trace = go.Scatter(
         x=[0, 80, 80, 0, 0],
@@ -329,7 +346,7 @@ def create_half_pitch_rotated():
         x=x_linear, y=y_linear, mode="lines", marker=dict(color="#808080")
     )
 
-    return [
+    return (
         pitch_trace,
         center_circle_trace,
         penalty_area1_trace,
@@ -341,4 +358,101 @@ def create_half_pitch_rotated():
         # penalty_arc2_trace_positive,
         # penalty_arc2_trace_negative,
         # penalty_arc2_trace_linear
-    ]
+    )
+
+
+def _line_style(resize_factor):
+    return {"color": PITCH_LINE_COLOR, "width": 2 * resize_factor}
+
+
+def _rect(x0, y0, x1, y1, resize_factor):
+    return {
+        "type": "rect",
+        "xref": "x",
+        "yref": "y",
+        "x0": x0 * resize_factor,
+        "y0": y0 * resize_factor,
+        "x1": x1 * resize_factor,
+        "y1": y1 * resize_factor,
+        "line": _line_style(resize_factor),
+        "layer": "below",
+    }
+
+
+def _line(x0, y0, x1, y1, resize_factor):
+    return {**_rect(x0, y0, x1, y1, resize_factor), "type": "line"}
+
+
+def _circle(h, k, r, resize_factor, filled=False):
+    shape = {**_rect(h - r, k - r, h + r, k + r, resize_factor), "type": "circle"}
+    if filled:
+        shape["fillcolor"] = PITCH_LINE_COLOR
+    return shape
+
+
+def _arc(h, k, r, start, end, resize_factor, points=24):
+    # Shape paths do not support SVG arcs, so draw the arc as a polyline
+    t = np.linspace(start, end, points)
+    x = (h + r * np.cos(t)) * resize_factor
+    y = (k + r * np.sin(t)) * resize_factor
+    path = "M" + "L".join(f"{xi:.3f},{yi:.3f}" for xi, yi in zip(x, y, strict=True))
+    return {
+        "type": "path",
+        "xref": "x",
+        "yref": "y",
+        "path": path,
+        "line": _line_style(resize_factor),
+        "layer": "below",
+    }
+
+
+@lru_cache(maxsize=8)
+def create_pitch_shapes(resize_factor=1.0):
+    """
+    Pitch markings as layout shapes, computed once per resize_factor.
+
+    Shapes serialize to a few hundred bytes instead of the ~1600 points of the
+    trace-based pitch, and are drawn below the data traces.
+    """
+    penalty_area = ((80 - 40.32) / 2, (80 + 40.32) / 2)
+    six_yard_box = ((80 - 18.32) / 2, (80 + 18.32) / 2)
+    return (
+        _rect(0, 0, 120, 80, resize_factor),
+        _line(60, 0, 60, 80, resize_factor),
+        _circle(60, 40, 9.15, resize_factor),
+        _rect(120 - 16.5, penalty_area[0], 120, penalty_area[1], resize_factor),
+        _rect(0, penalty_area[0], 16.5, penalty_area[1], resize_factor),
+        _rect(120 - 5.5, six_yard_box[0], 120, six_yard_box[1], resize_factor),
+        _rect(0, six_yard_box[0], 5.5, six_yard_box[1], resize_factor),
+        _circle(120 - 11, 40, 0.4, resize_factor, filled=True),
+        _circle(11, 40, 0.4, resize_factor, filled=True),
+        _circle(60, 40, 0.4, resize_factor, filled=True),
+        _arc(11, 40, 9.15, -PENALTY_ARC_ANGLE, PENALTY_ARC_ANGLE, resize_factor),
+        _arc(
+            120 - 11,
+            40,
+            9.15,
+            np.pi - PENALTY_ARC_ANGLE,
+            np.pi + PENALTY_ARC_ANGLE,
+            resize_factor,
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def create_half_pitch_rotated_shapes():
+    """Rotated half pitch markings as layout shapes, computed once."""
+    return (
+        _rect(0, 0, 80, 60, 1.0),
+        _circle(40, 0, 9.15, 1.0),
+        _rect((80 - 40.32) / 2, 60 - 16.5, (80 + 40.32) / 2, 60, 1.0),
+        _rect((80 - 18.32) / 2, 60 - 5.5, (80 + 18.32) / 2, 60, 1.0),
+        _circle(40, 80 - 11, 0.4, 1.0, filled=True),
+        _circle(40, 0, 0.4, 1.0, filled=True),
+    )
+
+
+@lru_cache(maxsize=8)
+def create_pitch_template(resize_factor=1.0):
+    """Reusable layout template that draws the pitch on any figure using it."""
+    return go.layout.Template(layout={"shapes": create_pitch_shapes(resize_factor)})
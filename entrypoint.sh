@@ -2,6 +2,8 @@
 
 if [ "$1" = "download" ]; then
     python /code/jobs/download_data.py
+elif [ "$1" = "precompute" ]; then
+    python /code/jobs/precompute_figures.py
 else
     python /code/app/app.py
 fi
@@ -18,5 +18,31 @@ class CentralConfig(BaseSettings):
     AWS_DEFAULT_REGION: str = "us-east-1"
     AWS_ENDPOINT_URL: Optional[str] = "http://localhost:9000"
 
+    # JSON library ("orjson", "msgspec" or "stdlib"), the fastest installed if unset
+    JSON_BACKEND: Optional[str] = None
+
+    # Download manifest (what is already in the bucket)
+    DOWNLOAD_MANIFEST_PATH: str = "data/download_manifest.json"
+
+    # Processed parquet datasets, partitioned by competition/season/match
+    EVENTS_DATASET_PATH: str = "data/processed/events"
+    SUMMARY_DATASET_PATH: str = "data/processed/summary"
+
+    # Match repository (in-memory cache of parsed event files)
+    MATCH_CACHE_MAX_MATCHES: int = 8
+    MATCH_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Dashboard
+    FIGURE_STORE_PATH: str = "data/figures"
+    DASHBOARD_PRECOMPUTED: bool = False
+
+    # Dashboard callback results ("memory", "disk" or "redis"), not cached if unset
+    CALLBACK_CACHE_BACKEND: Optional[str] = "memory"
+    CALLBACK_CACHE_MAX_ENTRIES: int = 1024
+    CALLBACK_CACHE_PATH: str = "data/callback_cache"
+    CALLBACK_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    # Ledger of jobs/process_data.py, whose hashes version the cached results
+    PROCESSING_LEDGER_PATH: str = "data/processed/ledger.json"
+
 
 cc: CentralConfig = CentralConfig()
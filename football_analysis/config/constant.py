@@ -70,41 +70,14 @@ BAYER_LEVERKUSEN_GAMES_BUNDESLIGA_23_24 = [
 DATA_REPOSITORY_URL = (
     "https://raw.githubusercontent.com/statsbomb/open-data/master/data/{}/{}.json"
 )
+DOWNLOAD_CONCURRENCY = 8
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
 
-GAME_ID_TITLE = {
-    "3895052": "Bayer Leverkusen x RB Leipzig (2023-08-19)",
-    "3895060": "Borussia Mönchengladbach x Bayer Leverkusen (2023-08-26)",
-    "3895067": "Bayer Leverkusen x Darmstadt 98 (2023-09-02)",
-    "3895074": "Bayern Munich x Bayer Leverkusen (2023-09-15)",
-    "3895086": "Bayer Leverkusen x FC Heidenheim (2023-09-24)",
-    "3895095": "FSV Mainz 05 x Bayer Leverkusen (2023-09-30)",
-    "3895107": "Bayer Leverkusen x FC Köln (2023-10-08)",
-    "3895113": "Wolfsburg x Bayer Leverkusen (2023-10-21)",
-    "3895121": "Bayer Leverkusen x Freiburg (2023-10-29)",
-    "3895134": "Hoffenheim x Bayer Leverkusen (2023-11-04)",
-    "3895139": "Bayer Leverkusen x Union Berlin (2023-11-12)",
-    "3895153": "Werder Bremen x Bayer Leverkusen (2023-11-25)",
-    "3895158": "Bayer Leverkusen x Borussia Dortmund (2023-12-03)",
-    "3895167": "VfB Stuttgart x Bayer Leverkusen (2023-12-10)",
-    "3895180": "Bayer Leverkusen x Eintracht Frankfurt (2023-12-17)",
-    "3895182": "Bayer Leverkusen x Bochum (2023-12-20)",
-    "3895194": "Augsburg x Bayer Leverkusen (2024-01-13)",
-    "3895202": "RB Leipzig x Bayer Leverkusen (2024-01-20)",
-    "3895210": "Bayer Leverkusen x Borussia Mönchengladbach (2024-01-27)",
-    "3895220": "Darmstadt 98 x Bayer Leverkusen (2024-02-03)",
-    "3895232": "Bayer Leverkusen x Bayern Munich (2024-02-10)",
-    "3895244": "FC Heidenheim x Bayer Leverkusen (2024-02-17)",
-    "3895250": "Bayer Leverkusen x FSV Mainz 05 (2024-02-23)",
-    "3895258": "FC Köln x Bayer Leverkusen (2024-03-03)",
-    "3895266": "Bayer Leverkusen x Wolfsburg (2024-03-10)",
-    "3895275": "Freiburg x Bayer Leverkusen (2024-03-17)",
-    "3895286": "Bayer Leverkusen x Hoffenheim (2024-03-30)",
-    "3895292": "Union Berlin x Bayer Leverkusen (2024-04-06)",
-    "3895302": "Bayer Leverkusen x Werder Bremen (2024-04-14)",
-    "3895309": "Borussia Dortmund x Bayer Leverkusen (2024-04-21)",
-    "3895320": "Bayer Leverkusen x VfB Stuttgart (2024-04-27)",
-    "3895333": "Eintracht Frankfurt x Bayer Leverkusen (2024-05-05)",
-    "3895340": "Bochum x Bayer Leverkusen (2024-05-12)",
-    "3895348": "Bayer Leverkusen x Augsburg (2024-05-18)",
-}
+# Dashboard: its match dropdown is built from the matches metadata, see
+# statsbomb.metadata.MatchIndex.titles
+BUNDESLIGA_COMPETITION_ID = 9
+SEASON_2023_24_ID = 281
+BAYER_LEVERKUSEN_TEAM_ID = 904
@@ -0,0 +1,125 @@
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+from football_analysis.config import cc
+
+try:
+    import orjson
+except ImportError:  # the fast backends are optional
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    """
+    Decoder and encoder of one JSON library.
+
+    Args:
+    name (str): Library name
+    loads (Callable): Decodes bytes or str
+    dumps (Callable): Encodes to bytes, with ``indent`` and ``sort_keys`` flags
+    """
+
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[..., bytes]
+
+
+def _stdlib_dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys).encode()
+
+
+def _orjson_dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    option = (orjson.OPT_INDENT_2 if indent else 0) | (
+        orjson.OPT_SORT_KEYS if sort_keys else 0
+    )
+    return orjson.dumps(obj, option=option)
+
+
+def _msgspec_dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    data = msgspec.json.encode(obj, order="sorted" if sort_keys else None)
+    return msgspec.json.format(data, indent=2) if indent else data
+
+
+# Fastest first (see jobs/benchmark.py json)
+BACKENDS = {"stdlib": JsonBackend("stdlib", json.loads, _stdlib_dumps)}
+if orjson is not None:
+    BACKENDS = {
+        "orjson": JsonBackend("orjson", orjson.loads, _orjson_dumps),
+        **BACKENDS,
+    }
+if msgspec is not None:
+    BACKENDS = {
+        "msgspec": JsonBackend("msgspec", msgspec.json.decode, _msgspec_dumps),
+        **BACKENDS,
+    }
+
+
+def get_backend(name: str | None = None) -> JsonBackend:
+    """
+    JSON backend by name, or the fastest installed one.
+
+    Args:
+    name (str): "orjson", "msgspec" or "stdlib" (default: cc.JSON_BACKEND,
+        else the fastest installed)
+
+    Returns:
+    JsonBackend: Backend
+    """
+    name = name or cc.JSON_BACKEND
+    if name is None:
+        return next(iter(BACKENDS.values()))
+    if name not in BACKENDS:
+        raise ValueError(
+            f"JSON backend {name} is not installed, use one of {list(BACKENDS)}"
+        )
+    return BACKENDS[name]
+
+
+backend = get_backend()
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON with the selected backend."""
+    return backend.loads(data)
+
+
+def dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Encode JSON to bytes with the selected backend."""
+    return backend.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+
+def decode_events(data: bytes) -> list:
+    """
+    Decode an event file straight into typed events.
+
+    Like loads, this uses the fastest installed library: with msgspec, events
+    are decoded into the structs of models.structs in one pass; otherwise
+    they are validated into the pydantic models. Both have the same fields.
+
+    Args:
+    data (bytes): Content of an event file
+
+    Returns:
+    list: models.structs.Event with msgspec, else the pydantic event models
+    """
+    if msgspec is not None:
+        return _events_decoder().decode(data)
+
+    from football_analysis.models.validation import EVENTS_ADAPTER
+
+    return EVENTS_ADAPTER.validate_json(data)
+
+
+@lru_cache
+def _events_decoder():
+    from football_analysis.models.structs import Event
+
+    return msgspec.json.Decoder(list[Event])
@@ -1 +1,2 @@
-from .statsbomb import StatsBombEvent
+from .statsbomb import Event, StatsBombEvent
+from .validation import ValidationReport, validate_batch
@@ -1,7 +1,8 @@
-from typing import Any, Dict, List, Literal, Optional
+from typing import Annotated, Any, ClassVar, Dict, List, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, GetPydanticSchema
+from pydantic_core import core_schema
 
 
 class Team(BaseModel):
@@ -56,28 +57,23 @@ class Card(BaseModel):
 
 
 class FiftyFifty(BaseModel):
-    event_id: int = Literal[33]
     outcome: Optional[Outcome] = None  # e.g., {108: "Won", 109: "Lost"}
 
 
 class BadBehaviour(BaseModel):
-    event_id: int = Literal[24]
     card: Optional[Card] = None  # e.g., {65: "Yellow", 67: "Red"}
 
 
 class BallReceipt(BaseModel):
-    event_id: int = Literal[42]
     outcome: Optional[Outcome] = None
 
 
 class BallRecovery(BaseModel):
-    event_id: int = Literal[2,]
     offensive: Optional[bool] = None
     recovery_failure: Optional[bool] = None
 
 
 class Block(BaseModel):
-    event_id: int = Literal[6,]
     counterpress: Optional[bool] = None
     deflection: Optional[bool] = None
     offensive: Optional[bool] = None
@@ -85,12 +81,10 @@ class Block(BaseModel):
 
 
 class Carry(BaseModel):
-    event_id: int = Literal[43]
     end_location: Optional[List[float]]
 
 
 class Clearance(BaseModel):
-    event_id: int = Literal[9,]
     aerial_won: Optional[bool] = None
     body_part: Optional[BodyPart] = (
         None  # e.g., {40: "Right Foot", 38: "Left Foot", etc.}
@@ -98,11 +92,10 @@ class Clearance(BaseModel):
 
 
 class Dispossessed(BaseModel):
-    event_id: int = Literal[3,]
+    pass
 
 
 class Dribble(BaseModel):
-    event_id: int = Literal[14]
     outcome: Optional[Outcome] = None  # e.g., {106: "Complete", 107: "Incomplete"}
     nutmeg: Optional[bool] = None
     overrun: Optional[bool] = None
@@ -110,22 +103,19 @@ class Dribble(BaseModel):
 
 
 class DribbledPast(BaseModel):
-    event_id: int = Literal[39]
     counterpress: Optional[bool]
 
 
 class Duel(BaseModel):
-    event_id: int = Literal[4,]
     counterpress: Optional[bool] = None
     type: Optional[EventType] = None  # e.g., {10: "Aerial Lost", 11: "Tackle", etc.}
 
 
 class Error(BaseModel):
-    event_id: int = Literal[37]
+    pass
 
 
 class FoulCommitted(BaseModel):
-    event_id: int = Literal[22]
     advantage: Optional[bool] = None
     counterpress: Optional[bool] = None
     offensive: Optional[bool] = None
@@ -135,14 +125,12 @@ class FoulCommitted(BaseModel):
 
 
 class FoulWon(BaseModel):
-    event_id: int = Literal[21]
     advantage: Optional[bool] = None
     defensive: Optional[bool] = None
     penalty: Optional[bool] = None
 
 
 class GoalKeeper(BaseModel):
-    event_id: int = Literal[23]
     position: Optional[Position] = None  # e.g., {42: "Moving", 44: "Set", etc.}
     technique: Optional[Technique] = None  # e.g., {45: "Diving", 46: "Standing", etc.}
     body_part: Optional[BodyPart] = (
@@ -153,41 +141,36 @@ class GoalKeeper(BaseModel):
 
 
 class HalfEnd(BaseModel):
-    event_id: int = Literal[34]
     early_video_end: Optional[bool]
     match_suspend: Optional[bool]
 
 
 class HalfStart(BaseModel):
-    event_id: int = Literal[18]
     late_video_start: Optional[bool]
 
 
 class InjuryStoppage(BaseModel):
-    event_id: int = Literal[40]
     in_chain: Optional[bool]
 
 
 class Interception(BaseModel):
-    event_id: int = Literal[10]
     outcome: Optional[Outcome] = None  # e.g., {4: "Won", 1: "Lost"}
 
 
 class Miscontrol(BaseModel):
-    event_id: int = Literal[38]
     aerial_won: Optional[bool]
 
 
 class Offside(BaseModel):
-    event_id: int = Literal[8,]
+    pass
 
 
 class OwnGoalAgainst(BaseModel):
-    event_id: int = Literal[20]
+    pass
 
 
 class OwnGoalFor(BaseModel):
-    event_id: int = Literal[25]
+    pass
 
 
 class Pass(BaseModel):
@@ -218,29 +201,26 @@ class Pass(BaseModel):
 
 
 class PlayerOff(BaseModel):
-    event_id: int = Literal[27]
     permanent: Optional[bool]
 
 
 class PlayerOn(BaseModel):
-    event_id: int = Literal[26]
+    pass
 
 
 class Pressure(BaseModel):
-    event_id: int = Literal[17]
     counterpress: Optional[bool]
 
 
 class RefereeBallDrop(BaseModel):
-    event_id: int = Literal[41]
+    pass
 
 
 class Shield(BaseModel):
-    event_id: int = Literal[28]
+    pass
 
 
 class Shot(BaseModel):
-    event_id: int = Literal[16]
     key_pass_id: Optional[UUID] = None
     end_location: Optional[List[float]] = None
     aerial_won: Optional[bool] = None
@@ -261,22 +241,21 @@ class Shot(BaseModel):
 
 
 class StartingXI(BaseModel):
-    event_id: int = Literal[35]
     tactics: Optional[Tactics]
 
 
 class Substitution(BaseModel):
-    event_id: int = Literal[19]
     replacement: Player
     outcome: Optional[Outcome] = None  # e.g., {103: "Tactical", 102: "Injury", etc.}
 
 
 class TacticalShift(BaseModel):
-    event_id: int = Literal[36]
     tactics: Tactics
 
 
 class StatsBombEvent(BaseModel):
+    """Flat event model, every type-specific payload is an optional field."""
+
     id: UUID
     index: int
     period: int
@@ -328,5 +307,250 @@ class StatsBombEvent(BaseModel):
     referee_ball_drop: Optional[RefereeBallDrop] = None
 
 
+class BaseEvent(BaseModel):
+    """Fields shared by every event type."""
+
+    id: UUID
+    index: int
+    period: int
+    timestamp: str
+    minute: int
+    second: int
+    type: EventType
+    possession: int
+    possession_team: Team
+    play_pattern: dict
+    team: Team
+    duration: Optional[float] = None
+    under_pressure: Optional[bool] = None
+    off_camera: Optional[bool] = None
+    out: Optional[bool] = None
+    related_events: Optional[List[UUID]] = None
+    location: Optional[List[float]] = None
+
+
+class BallRecoveryEvent(BaseEvent):
+    type_id: ClassVar[int] = 2
+    ball_recovery: Optional[BallRecovery] = None
+
+
+class DispossessedEvent(BaseEvent):
+    type_id: ClassVar[int] = 3
+
+
+class CameraOnEvent(BaseEvent):
+    type_id: ClassVar[int] = 5
+
+
+class DuelEvent(BaseEvent):
+    type_id: ClassVar[int] = 4
+    duel: Optional[Duel] = None
+
+
+class BlockEvent(BaseEvent):
+    type_id: ClassVar[int] = 6
+    block: Optional[Block] = None
+
+
+class OffsideEvent(BaseEvent):
+    type_id: ClassVar[int] = 8
+
+
+class ClearanceEvent(BaseEvent):
+    type_id: ClassVar[int] = 9
+    clearance: Optional[Clearance] = None
+
+
+class InterceptionEvent(BaseEvent):
+    type_id: ClassVar[int] = 10
+    interception: Optional[Interception] = None
+
+
+class DribbleEvent(BaseEvent):
+    type_id: ClassVar[int] = 14
+    dribble: Optional[Dribble] = None
+
+
+class ShotEvent(BaseEvent):
+    type_id: ClassVar[int] = 16
+    shot: Shot
+
+
+class PressureEvent(BaseEvent):
+    type_id: ClassVar[int] = 17
+    pressure: Optional[Pressure] = None
+
+
+class HalfStartEvent(BaseEvent):
+    type_id: ClassVar[int] = 18
+    half_start: Optional[HalfStart] = None
+
+
+class SubstitutionEvent(BaseEvent):
+    type_id: ClassVar[int] = 19
+    substitution: Substitution
+
+
+class OwnGoalAgainstEvent(BaseEvent):
+    type_id: ClassVar[int] = 20
+    own_goal_against: Optional[OwnGoalAgainst] = None
+
+
+class FoulWonEvent(BaseEvent):
+    type_id: ClassVar[int] = 21
+    foul_won: Optional[FoulWon] = None
+
+
+class FoulCommittedEvent(BaseEvent):
+    type_id: ClassVar[int] = 22
+    foul_committed: Optional[FoulCommitted] = None
+
+
+class GoalKeeperEvent(BaseEvent):
+    type_id: ClassVar[int] = 23
+    goalkeeper: Optional[GoalKeeper] = None
+
+
+class BadBehaviourEvent(BaseEvent):
+    type_id: ClassVar[int] = 24
+    bad_behaviour: Optional[BadBehaviour] = None
+
+
+class OwnGoalForEvent(BaseEvent):
+    type_id: ClassVar[int] = 25
+    own_goal_for: Optional[OwnGoalFor] = None
+
+
+class PlayerOnEvent(BaseEvent):
+    type_id: ClassVar[int] = 26
+    player_on: Optional[PlayerOn] = None
+
+
+class PlayerOffEvent(BaseEvent):
+    type_id: ClassVar[int] = 27
+    player_off: Optional[PlayerOff] = None
+
+
+class ShieldEvent(BaseEvent):
+    type_id: ClassVar[int] = 28
+    shield: Optional[Shield] = None
+
+
+class PassEvent(BaseEvent):
+    type_id: ClassVar[int] = 30
+    pass_: Pass = Field(alias="pass")
+
+
+class FiftyFiftyEvent(BaseEvent):
+    type_id: ClassVar[int] = 33
+    fifty_fifty: Optional[FiftyFifty] = Field(None, alias="50_50")
+
+
+class HalfEndEvent(BaseEvent):
+    type_id: ClassVar[int] = 34
+    half_end: Optional[HalfEnd] = None
+
+
+class StartingXIEvent(BaseEvent):
+    type_id: ClassVar[int] = 35
+    tactics: Tactics
+
+
+class TacticalShiftEvent(BaseEvent):
+    type_id: ClassVar[int] = 36
+    tactics: Tactics
+
+
+class ErrorEvent(BaseEvent):
+    type_id: ClassVar[int] = 37
+    error: Optional[Error] = None
+
+
+class MiscontrolEvent(BaseEvent):
+    type_id: ClassVar[int] = 38
+    miscontrol: Optional[Miscontrol] = None
+
+
+class DribbledPastEvent(BaseEvent):
+    type_id: ClassVar[int] = 39
+    dribbled_past: Optional[DribbledPast] = None
+
+
+class InjuryStoppageEvent(BaseEvent):
+    type_id: ClassVar[int] = 40
+    injury_stoppage: Optional[InjuryStoppage] = None
+
+
+class RefereeBallDropEvent(BaseEvent):
+    type_id: ClassVar[int] = 41
+    referee_ball_drop: Optional[RefereeBallDrop] = None
+
+
+class BallReceiptEvent(BaseEvent):
+    type_id: ClassVar[int] = 42
+    ball_receipt: Optional[BallReceipt] = None
+
+
+class CarryEvent(BaseEvent):
+    type_id: ClassVar[int] = 43
+    carry: Carry
+
+
+EVENT_MODELS = {
+    model.type_id: model
+    for model in (
+        BallRecoveryEvent,
+        DispossessedEvent,
+        DuelEvent,
+        CameraOnEvent,
+        BlockEvent,
+        OffsideEvent,
+        ClearanceEvent,
+        InterceptionEvent,
+        DribbleEvent,
+        ShotEvent,
+        PressureEvent,
+        HalfStartEvent,
+        SubstitutionEvent,
+        OwnGoalAgainstEvent,
+        FoulWonEvent,
+        FoulCommittedEvent,
+        GoalKeeperEvent,
+        BadBehaviourEvent,
+        OwnGoalForEvent,
+        PlayerOnEvent,
+        PlayerOffEvent,
+        ShieldEvent,
+        PassEvent,
+        FiftyFiftyEvent,
+        HalfEndEvent,
+        StartingXIEvent,
+        TacticalShiftEvent,
+        ErrorEvent,
+        MiscontrolEvent,
+        DribbledPastEvent,
+        InjuryStoppageEvent,
+        RefereeBallDropEvent,
+        BallReceiptEvent,
+        CarryEvent,
+    )
+}
+
+
+def _event_schema(source, handler):
+    # Tagged union on the nested type.id: pydantic-core reads the id and only
+    # validates the model of that type. Unknown type ids are errors.
+    return core_schema.tagged_union_schema(
+        {
+            type_id: handler.generate_schema(model)
+            for type_id, model in EVENT_MODELS.items()
+        },
+        discriminator=[["type", "id"]],
+    )
+
+
+Event = Annotated[Union[tuple(EVENT_MODELS.values())], GetPydanticSchema(_event_schema)]
+
+
 class EventData(BaseModel):
-    events: List[StatsBombEvent]
+    events: List[Event]
@@ -0,0 +1,142 @@
+# msgspec structs of the StatsBomb events, to decode files straight into typed
+# objects, see football_analysis.io.json.decode_events
+from typing import List, Optional
+
+try:
+    import msgspec
+
+    Struct, field = msgspec.Struct, msgspec.field
+except ImportError:  # msgspec is optional, decode_events falls back to pydantic
+    msgspec = None
+
+    class Struct:
+        """Stand-in base so the module imports without msgspec."""
+
+        def __init_subclass__(cls, **kwargs):
+            super().__init_subclass__()
+
+    def field(default=None, name=None):
+        return default
+
+
+class Named(Struct, frozen=True):
+    """Any {"id": ..., "name": ...} object (team, player, type, outcome...)."""
+
+    id: int
+    name: str
+
+
+class LineupPlayer(Struct, frozen=True):
+    player: Named
+    position: Named
+    jersey_number: int
+
+
+class Tactics(Struct, frozen=True):
+    formation: int
+    lineup: List[LineupPlayer]
+
+
+class Pass(Struct, frozen=True):
+    recipient: Optional[Named] = None
+    length: Optional[float] = None
+    angle: Optional[float] = None
+    height: Optional[Named] = None
+    end_location: Optional[List[float]] = None
+    assisted_shot_id: Optional[str] = None
+    backheel: Optional[bool] = None
+    deflected: Optional[bool] = None
+    miscommunication: Optional[bool] = None
+    cross: Optional[bool] = None
+    cut_back: Optional[bool] = None
+    switch: Optional[bool] = None
+    shot_assist: Optional[bool] = None
+    goal_assist: Optional[bool] = None
+    body_part: Optional[Named] = None
+    type: Optional[Named] = None
+    outcome: Optional[Named] = None
+    technique: Optional[Named] = None
+
+
+class Shot(Struct, frozen=True):
+    key_pass_id: Optional[str] = None
+    end_location: Optional[List[float]] = None
+    aerial_won: Optional[bool] = None
+    follows_dribble: Optional[bool] = None
+    first_time: Optional[bool] = None
+    freeze_frame: Optional[List[dict]] = None
+    open_goal: Optional[bool] = None
+    statsbomb_xg: Optional[float] = None
+    deflected: Optional[bool] = None
+    technique: Optional[Named] = None
+    body_part: Optional[Named] = None
+    type: Optional[Named] = None
+    outcome: Optional[Named] = None
+
+
+class Carry(Struct, frozen=True):
+    end_location: Optional[List[float]] = None
+
+
+class Duel(Struct, frozen=True):
+    counterpress: Optional[bool] = None
+    type: Optional[Named] = None
+    outcome: Optional[Named] = None
+
+
+class Substitution(Struct, frozen=True):
+    replacement: Named
+    outcome: Optional[Named] = None
+
+
+class Event(Struct, frozen=True):
+    """
+    Flat event, like models.StatsBombEvent.
+
+    The payloads used by the analyses are typed, the other ones are kept as
+    dicts.
+    """
+
+    id: str
+    index: int
+    period: int
+    timestamp: str
+    minute: int
+    second: int
+    type: Named
+    possession: int
+    possession_team: Named
+    play_pattern: Named
+    team: Named
+    player: Optional[Named] = None
+    position: Optional[Named] = None
+    duration: Optional[float] = None
+    under_pressure: Optional[bool] = None
+    counterpress: Optional[bool] = None
+    off_camera: Optional[bool] = None
+    out: Optional[bool] = None
+    related_events: Optional[List[str]] = None
+    location: Optional[List[float]] = None
+    tactics: Optional[Tactics] = None
+    pass_: Optional[Pass] = field(default=None, name="pass")
+    shot: Optional[Shot] = None
+    carry: Optional[Carry] = None
+    duel: Optional[Duel] = None
+    substitution: Optional[Substitution] = None
+    pressure: Optional[dict] = None
+    block: Optional[dict] = None
+    interception: Optional[dict] = None
+    clearance: Optional[dict] = None
+    bad_behaviour: Optional[dict] = None
+    foul_committed: Optional[dict] = None
+    foul_won: Optional[dict] = None
+    dribble: Optional[dict] = None
+    fifty_fifty: Optional[dict] = field(default=None, name="50_50")
+    injury_stoppage: Optional[dict] = None
+    goalkeeper: Optional[dict] = None
+    half_start: Optional[dict] = None
+    half_end: Optional[dict] = None
+    player_off: Optional[dict] = None
+    ball_recovery: Optional[dict] = None
+    ball_receipt: Optional[dict] = None
+    miscontrol: Optional[dict] = None
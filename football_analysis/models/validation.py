@@ -0,0 +1,99 @@
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+
+from pydantic import TypeAdapter, ValidationError
+
+from .statsbomb import Event
+
+EVENTS_ADAPTER = TypeAdapter(list[Event])
+
+
+@dataclass
+class ValidationReport:
+    """
+    Aggregated outcome of validating event files.
+
+    Args:
+    events (int): Number of events validated
+    errors (Counter): Number of errors per pydantic error type
+    examples (list): First errors, as readable strings
+    max_examples (int): Maximum number of examples kept
+    """
+
+    events: int = 0
+    errors: Counter = field(default_factory=Counter)
+    examples: list = field(default_factory=list)
+    max_examples: int = 5
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add_error(self, error: ValidationError, file: str, indexes: list | None = None):
+        """Count the errors of a validation, mapping positions back to the file."""
+        for detail in error.errors():
+            self.errors[detail["type"]] += 1
+            if len(self.examples) < self.max_examples:
+                position, *loc = detail["loc"]
+                index = indexes[position] if indexes else position
+                # Errors inside an event start with the type id of its model
+                tagged = loc and isinstance(loc[0], int)
+                kind = f" (type {loc.pop(0)})" if tagged else ""
+                path = ".".join(str(part) for part in loc)
+                self.examples.append(
+                    f"{file} event {index}{kind} {path}: {detail['msg']}"
+                )
+
+    def merge(self, other: "ValidationReport"):
+        """Add the counts and examples of another report to this one."""
+        self.events += other.events
+        self.errors.update(other.errors)
+        room = self.max_examples - len(self.examples)
+        self.examples.extend(other.examples[: max(room, 0)])
+
+    def __str__(self) -> str:
+        if self.ok:
+            return f"Validated {self.events} events"
+        lines = [f"{sum(self.errors.values())} errors in {self.events} events"]
+        lines += [f"  {count} x {kind}" for kind, count in self.errors.most_common()]
+        lines += ["First errors:"] + [f"  {example}" for example in self.examples]
+        return "\n".join(lines)
+
+
+def validate_batch(
+    events: list,
+    file: str,
+    offset: int = 0,
+    sample: float = 1.0,
+    max_examples: int = 5,
+) -> ValidationReport:
+    """
+    Validate a batch of decoded events, e.g. read with iter_events.
+
+    Args:
+    events (list): Decoded events
+    file (str): File name, for error messages and sampling
+    offset (int): Position of the first event of the batch in the file
+    sample (float): Share of the events to validate, between 0 and 1
+    max_examples (int): Maximum number of errors kept as examples
+
+    Returns:
+    ValidationReport: Number of events validated and errors found
+    """
+    report = ValidationReport(max_examples=max_examples)
+    if sample >= 1:
+        indexes = list(range(offset, offset + len(events)))
+        batch = events
+    else:
+        # Seeded per file for reproducible reports, not security-sensitive
+        rng = random.Random(f"{file}:{offset}" if offset else file)  # noqa: S311
+        positions = sorted(rng.sample(range(len(events)), round(len(events) * sample)))
+        indexes = [offset + i for i in positions]
+        batch = [events[i] for i in positions]
+    report.events = len(batch)
+    try:
+        EVENTS_ADAPTER.validate_python(batch)
+    except ValidationError as e:
+        report.add_error(e, file, indexes)
+    return report
@@ -1,6 +1,6 @@
-import json
+import copy
+import operator
 import os
-from collections import Counter
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -9,20 +9,247 @@ from matplotlib.colors import to_rgba
 from mplsoccer import FontManager, Pitch
 
 from football_analysis.config.constant import (
+    BAYER_LEVERKUSEN_TEAM_ID,
     MAX_LINE_WIDTH,
     MAX_MARKER_SIZE,
     MIN_TRANSPARENCY,
 )
+from football_analysis.statsbomb.dataset import event_dataset
+from football_analysis.statsbomb.events import (
+    EVENT_COUNT_TYPES,
+    PASS_TYPE_ID,
+    SHOT_TYPE_ID,
+    SUBSTITUTION_TYPE_ID,
+)
+from football_analysis.statsbomb.metadata import match_index
+from football_analysis.statsbomb.repository import match_repository
+from football_analysis.statsbomb.summary import count_events, summary_store
+
+# Columns of build_pass_df, as named in the events dataset
+PASS_DF_COLUMNS = {
+    "id": "id",
+    "index": "index",
+    "period": "period",
+    "timestamp": "timestamp",
+    "minute": "minute",
+    "second": "second",
+    "type_name": "type_name",
+    "type_id": "type_id",
+    "possession": "possession",
+    "possession_team_id": "possession_team_id",
+    "possession_team_name": "possession_team_name",
+    "play_pattern_id": "play_pattern_id",
+    "play_pattern_name": "play_pattern_name",
+    "team_id": "team_id",
+    "team_name": "team_name",
+    "player_id": "player_id",
+    "player_name": "player_name",
+    "position_id": "position_id",
+    "position_name": "position_name",
+    "location_x": "location_x",
+    "location_y": "location_y",
+    "duration": "duration",
+    "pass_recipient_id": "pass_recipient_id",
+    "pass_recipient_name": "pass_recipient_name",
+    "pass_length": "pass_length",
+    "pass_angle": "pass_angle",
+    "pass_height_id": "pass_height_id",
+    "pass_height_name": "pass_height_name",
+    "pass_end_location_x": "pass_end_x",
+    "pass_end_location_y": "pass_end_y",
+    "pass_outcome_id": "pass_outcome_id",
+    "pass_outcome_name": "pass_outcome_name",
+}
+
+
+# Columns of build_pass_df: (column, keys leading to the value in a pass
+# event, dtype). Only the nullable "Int32" columns and the names of the same
+# objects may be missing.
+PASS_DF_SCHEMA = [
+    ("id", ("id",), "object"),
+    ("index", ("index",), "int32"),
+    ("period", ("period",), "int8"),
+    ("timestamp", ("timestamp",), "object"),
+    ("minute", ("minute",), "int16"),
+    ("second", ("second",), "int16"),
+    ("type_name", ("type", "name"), "category"),
+    ("type_id", ("type", "id"), "int32"),
+    ("possession", ("possession",), "int32"),
+    ("possession_team_id", ("possession_team", "id"), "int32"),
+    ("possession_team_name", ("possession_team", "name"), "category"),
+    ("play_pattern_id", ("play_pattern", "id"), "int32"),
+    ("play_pattern_name", ("play_pattern", "name"), "category"),
+    ("team_id", ("team", "id"), "int32"),
+    ("team_name", ("team", "name"), "category"),
+    ("player_id", ("player", "id"), "int32"),
+    ("player_name", ("player", "name"), "category"),
+    ("position_id", ("position", "id"), "int32"),
+    ("position_name", ("position", "name"), "category"),
+    ("location_x", ("location", 0), "float32"),
+    ("location_y", ("location", 1), "float32"),
+    ("duration", ("duration",), "float32"),
+    ("pass_recipient_id", ("pass", "recipient", "id"), "Int32"),
+    ("pass_recipient_name", ("pass", "recipient", "name"), "category"),
+    ("pass_length", ("pass", "length"), "float32"),
+    ("pass_angle", ("pass", "angle"), "float32"),
+    ("pass_height_id", ("pass", "height", "id"), "int32"),
+    ("pass_height_name", ("pass", "height", "name"), "category"),
+    ("pass_end_location_x", ("pass", "end_location", 0), "float32"),
+    ("pass_end_location_y", ("pass", "end_location", 1), "float32"),
+    ("pass_outcome_id", ("pass", "outcome", "id"), "Int32"),
+    ("pass_outcome_name", ("pass", "outcome", "name"), "category"),
+]
+
+
+# Object levels with at most this many keys are read one key at a time
+_NARROW_LEVEL_KEYS = 4
+
+
+def _schema_columns(events, schema: list) -> list[list]:
+    """
+    Values of the fields of a schema, one list per field.
+
+    Each key is read across all the events with ``itemgetter``, level by
+    level (e.g. ``pass`` once, then its children from those objects). The
+    wide levels fetch all their keys in one call per object, which beats one
+    pass per key; on narrow ones, the tuples it allocates cost more (they
+    trigger garbage collections over the events) than they save. Below the
+    parents of the nullable "Int32" fields, missing objects read as None.
+    """
+    optional = {path[:-1] for _, path, dtype in schema if dtype == "Int32"}
+    # Keys read from each object level, parents listed before their children
+    children: dict[tuple, list] = {}
+    for _, path, _ in schema:
+        for depth in range(len(path)):
+            keys = children.setdefault(path[:depth], [])
+            if path[depth] not in keys:
+                keys.append(path[depth])
+
+    levels = {(): events}
+    for prefix, keys in children.items():
+        parent = levels[prefix]
+        required = []
+        for key in keys:
+            path = (*prefix, key)
+            if any(path[:depth] in optional for depth in range(1, len(path) + 1)):
+                levels[path] = [None if v is None else v.get(key) for v in parent]
+            else:
+                required.append(key)
+        if len(required) > _NARROW_LEVEL_KEYS:
+            rows = list(map(operator.itemgetter(*required), parent))
+            for position, key in enumerate(required):
+                levels[(*prefix, key)] = list(map(operator.itemgetter(position), rows))
+        else:
+            for key in required:
+                levels[(*prefix, key)] = list(map(operator.itemgetter(key), parent))
+    return [levels[path] for _, path, _ in schema]
+
+
+def build_pass_df(passes) -> pd.DataFrame:
+    """
+    Flatten pass events into a typed DataFrame.
+
+    The fields of PASS_DF_SCHEMA are read column by column, then each column
+    is typed: ids as int32 (nullable Int32 when the field is optional),
+    coordinates and measures as float32 and names as categoricals.
+
+    Args:
+    passes (Sequence[dict]): Pass events
+
+    Returns:
+    pd.DataFrame: One row per pass
+    """
+    columns = {}
+    values = _schema_columns(passes, PASS_DF_SCHEMA)
+    for (name, _, dtype), column in zip(PASS_DF_SCHEMA, values, strict=True):
+        if dtype == "category":
+            columns[name] = pd.Categorical(np.array(column, dtype=object))
+        elif dtype == "Int32":
+            array = np.array(column, dtype=object)
+            missing = array == None  # noqa: E711 - elementwise
+            columns[name] = pd.arrays.IntegerArray(
+                np.where(missing, 0, array).astype(np.int32), missing
+            )
+        else:
+            columns[name] = np.array(column, dtype=dtype)
+    return pd.DataFrame(columns)
+
+
+def read_pass_df(game_id, team_id=None) -> pd.DataFrame | None:
+    """
+    Read the passes of a match from the events dataset.
+
+    Only the partition of the match and the columns of build_pass_df are read.
+
+    Args:
+    game_id: Match id
+    team_id (int): Only keep the passes of this team
+
+    Returns:
+    pd.DataFrame: Same columns as build_pass_df, or None if the match is not
+    in the dataset
+    """
+    df = event_dataset.read_match(
+        game_id, columns=list(PASS_DF_COLUMNS.values()), type_ids=[PASS_TYPE_ID]
+    )
+    if df is None:
+        return None
+    if team_id is not None:
+        df = df.loc[df["team_id"] == team_id].reset_index(drop=True)
+    return df.rename(columns={v: k for k, v in PASS_DF_COLUMNS.items()})
+
+
+def _size_pass_network(passes_between, passers_avg_location, font_sizes=(10, 20)):
+    """
+    Line widths and node sizes of a pass network.
+
+    The frames may be shared with other views of the match (see
+    PassAnalysis.for_player), so new frames are returned and the given ones
+    are left untouched.
+
+    Args:
+    passes_between (pd.DataFrame): Pass counts between players
+    passers_avg_location (pd.DataFrame): Average location and total passes of
+    each passer
+    font_sizes (tuple): Minimum and maximum font size of the jersey numbers
+
+    Returns:
+    tuple: (passes_between with a width column, passers_avg_location with
+    marker_size, normalized_marker_size and font_size columns)
+    """
+    min_font_size, max_font_size = font_sizes
+    passes_between = passes_between.assign(
+        width=passes_between.pass_count
+        / passes_between.pass_count.max()
+        * MAX_LINE_WIDTH
+    )
+    marker_size = (
+        passers_avg_location["total_passes"]
+        / passers_avg_location["total_passes"].max()
+        * MAX_MARKER_SIZE
+    )
+    # Normalize marker_size to get values between 0 and 1
+    normalized_marker_size = marker_size / marker_size.max()
+    passers_avg_location = passers_avg_location.assign(
+        marker_size=marker_size,
+        normalized_marker_size=normalized_marker_size,
+        # Font sizes between min_font_size and max_font_size
+        font_size=min_font_size
+        + normalized_marker_size * (max_font_size - min_font_size),
+    )
+    return passes_between, passers_avg_location
 
 
 class PassAnalysis:
     def __init__(self, game_id=None, team_id=None, starting_players_only: bool = True):
         self.file_path = os.path.join("data", "events", game_id + ".json")
+        self.game_id = game_id
         self.team_id = team_id
-        with open(self.file_path) as f:
-            self.data = json.load(f)
+        self.player_id = None
+        self.match = match_repository.get_match(game_id)
+        self.data = self.match.events
         self.players_to_plot = [
-            str(player["player"]["id"])
+            player["player"]["id"]
             for x in self.data[:2]
             if "tactics" in x
             and "lineup" in x["tactics"]  # Only Starting XI
@@ -31,9 +258,8 @@ class PassAnalysis:
         ]
         if not starting_players_only:
             replacements = [
-                str(x["substitution"]["replacement"]["id"])
-                for x in self.data
-                if x["type"]["id"] == 19
+                x["substitution"]["replacement"]["id"]
+                for x in self.match.take(self.match.rows(type_id=SUBSTITUTION_TYPE_ID))
             ]
             self.players_to_plot = self.players_to_plot + replacements
         # #print(self.players_to_plot)
@@ -56,76 +282,48 @@ class PassAnalysis:
         self.enrich_passes_between_players()
 
     def get_player_passes(self, player_id):
-        player_passes = [x for x in self.team_passes if x["player"]["id"] == player_id]
+        player_passes = self.match.take(
+            self.match.rows(
+                type_id=PASS_TYPE_ID, player_id=player_id, team_id=self.team_id
+            )
+        )
         return player_passes
 
+    def for_player(self, player_id) -> "PassAnalysis":
+        """
+        View of the analysis restricted to the passes of one player.
+
+        The view shares the match, players and pass network of this analysis;
+        only team_passes and team_passes_df are sliced, through the player
+        index of the match, so no event is read or parsed again.
+
+        Args:
+        player_id: Player id
+
+        Returns:
+        PassAnalysis: Shallow copy holding the passes of the player
+        """
+        view = copy.copy(self)
+        view.player_id = int(player_id)
+        view.team_passes = self.get_player_passes(view.player_id)
+        view.team_passes_df = self.team_passes_df.loc[
+            self.team_passes_df["player_id"] == view.player_id
+        ].reset_index(drop=True)
+        return view
+
     def get_team_passes(self):
-        match_passes = [x for x in self.data if x["type"]["id"] == 30]
-        self.team_passes = [x for x in match_passes if x["team"]["id"] == self.team_id]
+        self.team_passes = self.match.take(
+            self.match.rows(type_id=PASS_TYPE_ID, team_id=self.team_id)
+        )
         # print(self.team_passes[10])
         # print(len(self.team_passes))
 
     def get_pass_df(self):
-        self.team_passes_df = pd.DataFrame(
-            {
-                "id": [i["id"] for i in self.team_passes],
-                "index": [i["index"] for i in self.team_passes],
-                "period": [i["period"] for i in self.team_passes],
-                "timestamp": [i["timestamp"] for i in self.team_passes],
-                "minute": [i["minute"] for i in self.team_passes],
-                "second": [i["second"] for i in self.team_passes],
-                "type_name": [i["type"]["name"] for i in self.team_passes],
-                "type_id": [i["type"]["id"] for i in self.team_passes],
-                "possession": [i["possession"] for i in self.team_passes],
-                "possession_team_id": [
-                    i["possession_team"]["id"] for i in self.team_passes
-                ],
-                "possession_team_name": [
-                    i["possession_team"]["name"] for i in self.team_passes
-                ],
-                "play_pattern_id": [i["play_pattern"]["id"] for i in self.team_passes],
-                "play_pattern_name": [
-                    i["play_pattern"]["name"] for i in self.team_passes
-                ],
-                "team_id": [i["team"]["id"] for i in self.team_passes],
-                "team_name": [i["team"]["name"] for i in self.team_passes],
-                "player_id": [i["player"]["id"] for i in self.team_passes],
-                "player_name": [i["player"]["name"] for i in self.team_passes],
-                "position_id": [i["position"]["id"] for i in self.team_passes],
-                "position_name": [i["position"]["name"] for i in self.team_passes],
-                "location_x": [i["location"][0] for i in self.team_passes],
-                "location_y": [i["location"][1] for i in self.team_passes],
-                "duration": [i["duration"] for i in self.team_passes],
-                "pass_recipient_id": [
-                    i["pass"].get("recipient", {}).get("id", None)
-                    for i in self.team_passes
-                ],
-                "pass_recipient_name": [
-                    i["pass"].get("recipient", {}).get("name", None)
-                    for i in self.team_passes
-                ],
-                "pass_length": [i["pass"]["length"] for i in self.team_passes],
-                "pass_angle": [i["pass"]["angle"] for i in self.team_passes],
-                "pass_height_id": [i["pass"]["height"]["id"] for i in self.team_passes],
-                "pass_height_name": [
-                    i["pass"]["height"]["name"] for i in self.team_passes
-                ],
-                "pass_end_location_x": [
-                    i["pass"]["end_location"][0] for i in self.team_passes
-                ],
-                "pass_end_location_y": [
-                    i["pass"]["end_location"][1] for i in self.team_passes
-                ],
-                "pass_outcome_id": [
-                    i["pass"].get("outcome", {}).get("id", None)
-                    for i in self.team_passes
-                ],
-                "pass_outcome_name": [
-                    i["pass"].get("outcome", {}).get("name", None)
-                    for i in self.team_passes
-                ],
-            }
-        )
+        # Processed matches are read from their partition, the others are
+        # built from the raw events
+        self.team_passes_df = read_pass_df(self.game_id, self.team_id)
+        if self.team_passes_df is None:
+            self.team_passes_df = build_pass_df(self.team_passes)
         # print(self.team_passes_df.head())
         # #print unique team names
         # print(self.team_passes_df['team_name'].unique())
@@ -208,7 +406,6 @@ class PassAnalysis:
         self.players_df["position_abbreviation"] = self.players_df.position_id.map(
             formation_dict
         )
-        self.players_df["player_id"] = self.players_df["player_id"].astype(str)
 
         # print(self.players_df.head())
 
@@ -241,52 +438,39 @@ class PassAnalysis:
             passers_avg_location["passes_given"]
             + passers_avg_location["passes_received"]
         )
-        # Force player_id to string
-        passers_avg_location["player_id"] = passers_avg_location["player_id"].astype(
-            str
-        )
-
         self.passers_avg_location = passers_avg_location
 
         # print(self.passers_avg_location.head())
 
-    def get_passes_between_players(self):
-        # create a temporary dataframe with sorted player_id and pass_recipient_id
-        temp_df = self.team_passes_df[["player_id", "pass_recipient_id"]].apply(
-            lambda x: sorted(x), axis=1, result_type="expand"
+    def get_passes_between_players(self, directed: bool = False):
+        # passes without a recipient are not part of the network
+        has_recipient = self.team_passes_df["pass_recipient_id"].notna().to_numpy()
+        passer = self.team_passes_df["player_id"].to_numpy(dtype=np.int64)
+        recipient = self.team_passes_df["pass_recipient_id"].to_numpy(
+            dtype=np.int64, na_value=-1
         )
+        passer, recipient = passer[has_recipient], recipient[has_recipient]
 
-        # rename the columns
-        temp_df.columns = ["player1", "player2"]
-
-        # add the 'id' column from the original dataframe
-        temp_df["id"] = self.team_passes_df["id"]
-
-        # now groupby 'player1' and 'player2' and count the number of 'id'
-        passes_between = (
-            temp_df.groupby(["player1", "player2"]).agg({"id": "count"}).reset_index()
-        )
+        # undirected: count A->B and B->A as the same (sorted) pair
+        if not directed:
+            passer, recipient = (
+                np.minimum(passer, recipient),
+                np.maximum(passer, recipient),
+            )
 
-        # rename the columns back to 'player_id' and 'pass_recipient_id'
-        passes_between.rename(
-            columns={
-                "player1": "player_id",
-                "player2": "pass_recipient_id",
-                "id": "pass_count",
-            },
-            inplace=True,
+        # pack each pair into one int64 key and count the distinct keys
+        pair_keys, pass_count = np.unique(
+            (passer << 32) | recipient, return_counts=True
         )
 
-        # Transform player_id and pass_rcipient_id back to string, without .0
-        passes_between["player_id"] = (
-            passes_between["player_id"].astype(int).astype(str)
-        )
-        passes_between["pass_recipient_id"] = (
-            passes_between["pass_recipient_id"].astype(int).astype(str)
+        self.passes_between = pd.DataFrame(
+            {
+                "player_id": (pair_keys >> 32).astype(np.int32),
+                "pass_recipient_id": (pair_keys & 0xFFFFFFFF).astype(np.int32),
+                "pass_count": pass_count,
+            }
         )
 
-        self.passes_between = passes_between
-
         # print(self.passes_between.head())
 
     def enrich_passes_between_players(self):
@@ -312,31 +496,8 @@ class PassAnalysis:
         # print(self.passes_between.head())
 
     def plot_pass_network(self):
-        # Define the minimum and maximum font size for the jersey number annotations
-        MIN_FONT_SIZE = 10
-        MAX_FONT_SIZE = 20
-
-        self.passes_between["width"] = (
-            self.passes_between.pass_count
-            / self.passes_between.pass_count.max()
-            * MAX_LINE_WIDTH
-        )
-        self.passers_avg_location["marker_size"] = (
-            self.passers_avg_location["total_passes"]
-            / self.passers_avg_location["total_passes"].max()
-            * MAX_MARKER_SIZE
-        )
-        # Normalize marker_size to get values between 0 and 1
-        self.passers_avg_location["normalized_marker_size"] = (
-            self.passers_avg_location["marker_size"]
-            / self.passers_avg_location["marker_size"].max()
-        )
-
-        # Scale normalized_marker_size to get font sizes between MIN_FONT_SIZE and MAX_FONT_SIZE
-        self.passers_avg_location["font_size"] = (
-            MIN_FONT_SIZE
-            + self.passers_avg_location["normalized_marker_size"]
-            * (MAX_FONT_SIZE - MIN_FONT_SIZE)
+        passes_between, passers_avg_location = _size_pass_network(
+            self.passes_between, self.passers_avg_location
         )
         pitch = Pitch(
             pitch_type="statsbomb", pitch_color="#22312b", line_color="#c7d5cc"
@@ -360,12 +521,12 @@ class PassAnalysis:
         fig.set_facecolor("#22312b")
 
         # Filter only starting players
-        temp_passes_between = self.passes_between.loc[
-            (self.passes_between.player_id.isin(self.players_to_plot))
-            & (self.passes_between.pass_recipient_id.isin(self.players_to_plot))
+        temp_passes_between = passes_between.loc[
+            (passes_between.player_id.isin(self.players_to_plot))
+            & (passes_between.pass_recipient_id.isin(self.players_to_plot))
         ]
-        temp_passers_avg_location = self.passers_avg_location.loc[
-            self.passers_avg_location.player_id.isin(self.players_to_plot)
+        temp_passers_avg_location = passers_avg_location.loc[
+            passers_avg_location.player_id.isin(self.players_to_plot)
         ]
         # print(type(temp_passers_avg_location.player_id[0]))
         temp_passers_avg_location = temp_passers_avg_location.merge(
@@ -480,28 +641,9 @@ class PassAnalysis:
             players_to_plot = self.players_to_plot
         if players_df is None:
             players_df = self.players_df
-        # Define the minimum and maximum font size for the jersey number annotations
-        MIN_FONT_SIZE = 10
-        MAX_FONT_SIZE = 20
-
-        passes_between["width"] = (
-            passes_between.pass_count / passes_between.pass_count.max() * MAX_LINE_WIDTH
-        )
-        passers_avg_location["marker_size"] = (
-            passers_avg_location["total_passes"]
-            / passers_avg_location["total_passes"].max()
-            * MAX_MARKER_SIZE
+        passes_between, passers_avg_location = _size_pass_network(
+            passes_between, passers_avg_location
         )
-        # Normalize marker_size to get values between 0 and 1
-        passers_avg_location["normalized_marker_size"] = (
-            passers_avg_location["marker_size"]
-            / passers_avg_location["marker_size"].max()
-        )
-
-        # Scale normalized_marker_size to get font sizes between MIN_FONT_SIZE and MAX_FONT_SIZE
-        passers_avg_location["font_size"] = MIN_FONT_SIZE + passers_avg_location[
-            "normalized_marker_size"
-        ] * (MAX_FONT_SIZE - MIN_FONT_SIZE)
 
         # Filter only starting players
         temp_passes_between = passes_between.loc[
@@ -551,8 +693,9 @@ class ShotAnalysis:
     def __init__(self, game_id=None, team_id=None):
         self.file_path = os.path.join("data", "events", game_id + ".json")
         self.team_id = team_id
-        with open(self.file_path) as f:
-            self.data = json.load(f)
+        self.player_id = None
+        self.match = match_repository.get_match(game_id)
+        self.data = self.match.events
         self.team_name = [
             x["team"]["name"] for x in self.data[:2] if x["team"]["id"] == team_id
         ][0]
@@ -565,8 +708,26 @@ class ShotAnalysis:
         # self.get_shots_by_player()
 
     def get_team_shots(self):
-        match_shots = [x for x in self.data if x["type"]["id"] == 16]
-        self.team_shots = [x for x in match_shots if x["team"]["id"] == self.team_id]
+        self.team_shots = self.match.take(
+            self.match.rows(
+                type_id=SHOT_TYPE_ID, player_id=self.player_id, team_id=self.team_id
+            )
+        )
+
+    def for_player(self, player_id) -> "ShotAnalysis":
+        """
+        View of the analysis restricted to the shots of one player.
+
+        Args:
+        player_id: Player id
+
+        Returns:
+        ShotAnalysis: Shallow copy sharing the match, with the player's shots
+        """
+        view = copy.copy(self)
+        view.player_id = int(player_id)
+        view.get_team_shots()
+        return view
 
     # def get_shots_df(self):
     #     self.team_shots_df = pd.DataFrame(
@@ -588,90 +749,67 @@ class ShotAnalysis:
 
 class Event:
     def __init__(self, game_id: str, player_id: str | None = None):
+        self.game_id = game_id
         self.file_path = os.path.join("data", "events", game_id + ".json")
-        with open(self.file_path) as f:
-            self.data = json.load(f)
         self.player_id = player_id
+        # the summary rows of the match answer without scanning its events
+        self.event_counts_df = summary_store.read("event_counts", [game_id])
+        if self.event_counts_df is None:
+            self.match = match_repository.get_match(game_id)
+            self.data = self.match.events
         self.get_event_count()
 
-    def get_event_count(self):
-        team_events = [
-            x
-            for x in self.data
-            if isinstance(x, dict)
-            and x.get("possession_team", {}).get("id") == 904
-            and x["type"]["name"]
-            in [
-                "Miscontrol",
-                "Block",
-                "Foul Committed",
-                "Foul Won",
-                "Interception",
-                "Ball Recovery",
-                "Shot",
-                "Goal Keeper",
-                "Duel",
-                "Clearance",
-                "Dribble",
-                "Dispossessed",
-                "Dribbled Past",
-                # 'Injury Stoppage',
-                # 'Shield',
-                "Bad Behaviour",
-                # '50/50'
-            ]
-        ]
+    def for_player(self, player_id) -> "Event":
+        """
+        View of the event counts of one player.
 
-        opponent_events = [
-            x
-            for x in self.data
-            if isinstance(x, dict)
-            # and x.get('possession_team', {}).get('id') != 904
-            and x["type"]["name"]
-            in [
-                "Miscontrol",
-                "Block",
-                "Foul Committed",
-                "Foul Won",
-                "Interception",
-                "Ball Recovery",
-                "Shot",
-                "Goal Keeper",
-                "Duel",
-                "Clearance",
-                "Dribble",
-                "Dispossessed",
-                "Dribbled Past",
-                # 'Injury Stoppage',
-                # 'Shield',
-                "Bad Behaviour",
-                # '50/50'
-            ]
-        ]
+        The view shares the summary rows (or the parsed match) of this
+        analysis, so only the counts are recomputed.
 
-        if self.player_id is not None:
-            # Filter team_events by player_id
-            team_events = [
-                x
-                for x in team_events
-                if x.get("player", {}).get("id", None) == int(self.player_id)
-            ]
+        Args:
+        player_id: Player id
 
-            # Filter opponent_events by player_id (so it gets filtered out)
-            opponent_events = [
-                x
-                for x in opponent_events
-                if x.get("player", {}).get("id", None) == int(self.player_id)
-            ]
+        Returns:
+        Event: Shallow copy counting the events of the player
+        """
+        view = copy.copy(self)
+        view.player_id = player_id
+        view.get_event_count()
+        return view
 
-        self.event_count = dict(Counter([x["type"]["name"] for x in team_events]))
-        self.opp_event_count = dict(
-            Counter([x["type"]["name"] for x in opponent_events])
+    def get_event_count(self):
+        player_id = int(self.player_id) if self.player_id is not None else None
+        if self.event_counts_df is not None:
+            self.event_count, self.opp_event_count = count_events(
+                self.event_counts_df, BAYER_LEVERKUSEN_TEAM_ID, player_id
+            )
+            return
+
+        type_ids = [
+            self.match.type_ids[name]
+            for name in EVENT_COUNT_TYPES
+            if name in self.match.type_ids
+        ]
+
+        team_rows = self.match.rows(
+            type_id=type_ids,
+            player_id=player_id,
+            possession_team_id=BAYER_LEVERKUSEN_TEAM_ID,
         )
+        # opponent events are not filtered by possession team
+        opponent_rows = self.match.rows(type_id=type_ids, player_id=player_id)
+
+        self.event_count = self._count_types(team_rows)
+        self.opp_event_count = self._count_types(opponent_rows)
 
+    def _count_types(self, rows):
+        type_ids, counts = np.unique(self.match.type_id[rows], return_counts=True)
+        event_count = {
+            self.match.type_names[type_id]: int(count)
+            for type_id, count in zip(type_ids, counts, strict=True)
+        }
         # sort the dictionary alphabetically
-        self.event_count = dict(sorted(self.event_count.items()))
-        self.opp_event_count = dict(sorted(self.opp_event_count.items()))
+        return dict(sorted(event_count.items()))
 
     # def pass_events(self):
     #     team_events = [
@@ -718,22 +856,24 @@ class MatchInfo:
     def __init__(self, game_id: str | None = None):
         self.game_id = game_id
         if game_id is not None:
-            data = pd.read_json(os.path.join("data", "matches", "9", "281.json"))
-            self.data = data.loc[data.match_id == int(game_id)]
+            # Parsed once per season file, then looked up by match id
+            self.data = match_index.get(game_id)
+            if self.data is None:
+                raise ValueError(f"Match {game_id} is not in the matches metadata")
             self.get_match_info()
 
     def get_match_info(self):
         self.match_info = {
-            "home_team": self.data.home_team.values[0],
-            "away_team": self.data.away_team.values[0],
-            "home_score": self.data.home_score.values[0],
-            "away_score": self.data.away_score.values[0],
-            "competition": self.data.competition.values[0],
-            "season": self.data.season.values[0],
-            "kick_off": self.data.kick_off.values[0],
-            "metadata": self.data.metadata.values[0],
-            "stadium": self.data.stadium.values[0],
-            "referee": self.data.referee.values[0],
+            "home_team": self.data["home_team"],
+            "away_team": self.data["away_team"],
+            "home_score": self.data["home_score"],
+            "away_score": self.data["away_score"],
+            "competition": self.data["competition"],
+            "season": self.data["season"],
+            "kick_off": self.data["kick_off"],
+            "metadata": self.data.get("metadata"),
+            "stadium": self.data.get("stadium"),
+            "referee": self.data.get("referee"),
         }
         print(self.match_info)
         return self.match_info
@@ -0,0 +1,325 @@
+import glob
+import os
+import shutil
+from dataclasses import dataclass
+
+import fastparquet
+import numpy as np
+import pandas as pd
+from fastparquet import parquet_thrift
+
+from football_analysis.config import cc
+from football_analysis.io import json
+from football_analysis.statsbomb.metadata import MatchIndex
+from football_analysis.statsbomb.schema import EVENT_DTYPES
+
+PARTITION_KEYS = ("competition_id", "season_id", "match_id")
+
+# Columns holding UUIDs as 16-byte keys, see schema.uuid_keys
+UUID_KEY_COLUMNS = ("event_uuid",)
+
+# Minimum rows per row group of the partitions written batch by batch (see
+# write_batches): each column chunk has a fixed cost to write and read, which
+# a batch of events is too small to amortize
+ROW_GROUP_SIZE = 10_000
+
+# Dictionary of the row groups written before a categorical column holds any
+# value: fastparquet cannot read back an empty one, and null codes never
+# point into it
+PLACEHOLDER_CATEGORIES = pd.Index([""])
+
+
+def match_seasons(matches_folder: str = "data/matches/") -> dict[str, tuple]:
+    """
+    Map every match of the matches metadata files to its competition and season.
+
+    Args:
+    matches_folder (str): Folder of the {competition_id}/{season_id}.json files
+
+    Returns:
+    dict: match_id -> (competition_id, season_id)
+    """
+    return {
+        str(match["match_id"]): (
+            match["competition"]["competition_id"],
+            match["season"]["season_id"],
+        )
+        for match in MatchIndex(matches_folder).matches()
+    }
+
+
+def partition_path(root: str, competition_id, season_id, match_id) -> str:
+    """Folder of the hive partition of a match."""
+    return os.path.join(
+        root,
+        f"competition_id={competition_id}",
+        f"season_id={season_id}",
+        f"match_id={match_id}",
+    )
+
+
+def write_partition(df: pd.DataFrame, folder: str, type_row_groups: bool = False):
+    """
+    Write the DataFrame of one match as a partition.
+
+    Args:
+    df (pd.DataFrame): Rows of the match, without the partition columns
+    folder (str): Partition folder, see partition_path
+    type_row_groups (bool): Write one row group per event type, so that the
+        row group statistics of type_id skip the other types on read
+
+    Returns:
+    str: Path of the partition file
+    """
+    row_group_offsets = 50_000_000  # fastparquet default: one row group
+    if type_row_groups:
+        df = df.sort_values(["type_id", "index"], kind="stable", ignore_index=True)
+        type_id = df["type_id"].to_numpy()
+        row_group_offsets = np.flatnonzero(
+            np.r_[True, type_id[1:] != type_id[:-1]]
+        ).tolist()
+
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, "part.0.parquet")
+    fixed_text = {column: 16 for column in UUID_KEY_COLUMNS if column in df.columns}
+    fastparquet.write(
+        path, df, row_group_offsets=row_group_offsets, fixed_text=fixed_text
+    )
+    return path
+
+
+def _concat(frames: list) -> pd.DataFrame:
+    """Concatenate batches of rows, keeping the categorical columns categorical."""
+    df = pd.concat(frames, ignore_index=True)
+    for column in df.columns:
+        categorical = any(
+            isinstance(frame[column].dtype, pd.CategoricalDtype)
+            for frame in frames
+            if column in frame.columns
+        )
+        if categorical and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = pd.Categorical(df[column])
+    return df
+
+
+def _unify_categories(df: pd.DataFrame, categories: dict) -> pd.DataFrame:
+    """
+    Code the categorical columns of a row group with the categories of the file.
+
+    New values are appended to the categories, so the codes of the row groups
+    already written stay valid: fastparquet reads each row group with its own
+    dictionary and keeps the categories of the last one.
+
+    Args:
+    df (pd.DataFrame): Rows of the row group
+    categories (dict): column -> categories of the row groups so far, updated
+
+    Returns:
+    pd.DataFrame: The rows with their categorical columns coded accordingly
+    """
+    columns = {}
+    for column, known in categories.items():
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            present = values.cat.categories
+        else:
+            present = pd.Index(values.dropna().unique())
+        grown = categories[column] = known.append(present.difference(known, sort=False))
+        columns[column] = pd.Categorical(
+            values, categories=grown if len(grown) else PLACEHOLDER_CATEGORIES
+        )
+    return df.assign(**columns)
+
+
+def _write_categories(path: str, categories: dict):
+    """
+    Record the final categories of the columns in the pandas metadata.
+
+    The metadata is written with the first row group: it sizes the codes for
+    the categories of that row group, and columns that never hold a value
+    are read back as strings (None) rather than as the placeholder category.
+    """
+    metadata = fastparquet.ParquetFile(path).pandas_metadata
+    for column in metadata["columns"]:
+        known = categories.get(column["name"])
+        if known is None:
+            continue
+        if len(known):
+            column["metadata"]["num_categories"] = len(known)
+        else:
+            column.update(pandas_type="unicode", numpy_type="object", metadata=None)
+    fastparquet.update_file_custom_metadata(path, {"pandas": json.dumps(metadata)})
+
+
+def _regroup(frames, size: int):
+    """Concatenate consecutive batches into frames of at least ``size`` rows."""
+    pending, rows = [], 0
+    for df in frames:
+        pending.append(df)
+        rows += len(df)
+        if rows >= size:
+            yield _concat(pending)
+            pending, rows = [], 0
+    if pending:
+        yield _concat(pending)
+
+
+def write_batches(
+    frames,
+    folder: str,
+    type_row_groups: bool = False,
+    row_group_size: int = ROW_GROUP_SIZE,
+):
+    """
+    Write the batches of rows of one match as a partition.
+
+    Batches are gathered into row groups of row_group_size rows, appended one
+    at a time, so that at most one row group is in memory. fastparquet
+    expects a single dictionary per column in a file: the categorical columns
+    (those of EVENT_SCHEMA, and any other one of the first row group) are
+    coded with categories that grow row group by row group, see
+    _unify_categories. Batches to sort by type are concatenated first.
+
+    Args:
+    frames (Iterable[pd.DataFrame]): Batches of rows, at least one
+    folder (str): Partition folder, see partition_path
+    type_row_groups (bool): Write one row group per event type
+    row_group_size (int): Minimum number of rows of a row group, but the last
+
+    Returns:
+    str: Path of the partition file
+    """
+    if type_row_groups:
+        return write_partition(_concat(list(frames)), folder, type_row_groups)
+
+    groups = _regroup(frames, row_group_size)
+    first = next(groups)
+    categories = {
+        column: pd.Index([], dtype=object)
+        for column, dtype in first.dtypes.items()
+        if EVENT_DTYPES.get(column) == "category"
+        or isinstance(dtype, pd.CategoricalDtype)
+    }
+    first = _unify_categories(first, categories)
+    path = write_partition(first, folder)
+    # Later row groups must keep the encodings of the first one, even where
+    # they hold no value to infer them from
+    pf = fastparquet.ParquetFile(path)
+    object_encoding = {}
+    for column in first.columns:
+        element = pf.schema.schema_element(column)
+        if element.converted_type == parquet_thrift.ConvertedType.JSON:
+            object_encoding[column] = "json"
+        elif element.converted_type == parquet_thrift.ConvertedType.UTF8:
+            object_encoding[column] = "utf8"
+        elif element.type == parquet_thrift.Type.BYTE_ARRAY:
+            object_encoding[column] = "bytes"
+    fixed_text = {column: 16 for column in UUID_KEY_COLUMNS if column in first.columns}
+    for df in groups:
+        fastparquet.write(
+            path,
+            _unify_categories(df, categories),
+            append=True,
+            object_encoding=object_encoding,
+            fixed_text=fixed_text,
+        )
+    if categories:
+        _write_categories(path, categories)
+    return path
+
+
+def replace_partition(source: str, destination: str):
+    """Move a partition folder over an existing one."""
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    if os.path.exists(destination):
+        shutil.rmtree(destination)
+    os.replace(source, destination)
+
+
+@dataclass
+class ParquetDataset:
+    """
+    Hive-partitioned parquet dataset, one partition per match.
+
+    Files live under ``competition_id=/season_id=/match_id=`` folders. There
+    is no ``_metadata`` file, so partitions can be replaced independently.
+
+    Args:
+    root (str): Folder of the dataset
+    """
+
+    root: str = cc.EVENTS_DATASET_PATH
+
+    def match_files(self, match_id) -> list[str]:
+        return sorted(
+            glob.glob(
+                os.path.join(partition_path(self.root, "*", "*", match_id), "*.parquet")
+            )
+        )
+
+    def read_match(
+        self, match_id, columns: list | None = None, type_ids: list | None = None
+    ) -> pd.DataFrame | None:
+        """
+        Read the rows of one match, touching only its partition.
+
+        Args:
+        match_id: Match id
+        columns (list): Columns to read (default: all)
+        type_ids (list): Only keep events of these types
+
+        Returns:
+        pd.DataFrame: Rows of the match, or None if it is not in the dataset
+        """
+        files = self.match_files(match_id)
+        if not files:
+            return None
+
+        read_columns = columns
+        filters = None
+        if type_ids is not None:
+            type_ids = list(type_ids)
+            # Row group statistics skip the row groups of other types
+            filters = [("type_id", "in", type_ids)]
+            if columns is not None and "type_id" not in columns:
+                read_columns = [*columns, "type_id"]
+
+        df = fastparquet.ParquetFile(files).to_pandas(
+            columns=read_columns, filters=filters
+        )
+        if type_ids is not None:
+            df = df.loc[df["type_id"].isin(type_ids)]
+            if read_columns is not columns:
+                df = df.drop(columns="type_id")
+        # Partitions written with type row groups are sorted by type
+        if "index" in df.columns:
+            df = df.sort_values("index", kind="stable")
+        return df.reset_index(drop=True)
+
+    def read(
+        self, columns: list | None = None, filters: list | None = None
+    ) -> pd.DataFrame:
+        """
+        Read several partitions.
+
+        Filters on the partition keys (e.g. ``[("season_id", "==", 281)]``)
+        skip whole partitions, other filters skip row groups by their
+        statistics.
+
+        Args:
+        columns (list): Columns to read (default: all)
+        filters (list): fastparquet filters
+
+        Returns:
+        pd.DataFrame: Rows of the selected partitions
+        """
+        pf = fastparquet.ParquetFile(self.root)
+        # Each partition has its own dictionaries: decode them as strings,
+        # fastparquet assumes one dictionary for the whole dataset
+        df = pf.to_pandas(columns=columns, filters=filters, categories=[])
+        for column in set(pf.categories) & set(df.columns):
+            df[column] = df[column].astype("category")
+        return df
+
+
+event_dataset = ParquetDataset()
@@ -0,0 +1,170 @@
+from collections.abc import Iterable
+
+import numpy as np
+
+PASS_TYPE_ID = 30
+SHOT_TYPE_ID = 16
+SUBSTITUTION_TYPE_ID = 19
+
+# Event types counted by analysis.Event
+EVENT_COUNT_TYPES = [
+    "Miscontrol",
+    "Block",
+    "Foul Committed",
+    "Foul Won",
+    "Interception",
+    "Ball Recovery",
+    "Shot",
+    "Goal Keeper",
+    "Duel",
+    "Clearance",
+    "Dribble",
+    "Dispossessed",
+    "Dribbled Past",
+    # 'Injury Stoppage',
+    # 'Shield',
+    "Bad Behaviour",
+    # '50/50'
+]
+
+# Payload keys that carry an end location, by event type id
+END_LOCATION_PAYLOADS = {30: "pass", 16: "shot", 43: "carry"}
+
+
+def _group_rows(keys: np.ndarray) -> dict[int, np.ndarray]:
+    """Map every distinct key to the (ascending) rows holding it."""
+    if keys.size == 0:
+        return {}
+    order = np.argsort(keys, kind="stable")
+    values, starts = np.unique(keys[order], return_index=True)
+    return {
+        int(value): rows
+        for value, rows in zip(values, np.split(order, starts[1:]), strict=True)
+    }
+
+
+class MatchEvents:
+    """
+    Columnar view over the events of one match.
+
+    Every array is aligned with ``events``: row ``i`` of any column describes
+    ``events[i]``, so a row number is also the offset of the nested payloads
+    (pass, shot, tactics, ...) that stay in the original event dicts. Missing ids
+    are stored as -1 and missing coordinates as NaN.
+
+    Args:
+    events (Sequence[dict]): Events of the match, in file order
+    """
+
+    def __init__(self, events):
+        self.events = events
+        n = len(events)
+        self.type_id = np.empty(n, dtype=np.int16)
+        self.team_id = np.empty(n, dtype=np.int32)
+        self.possession_team_id = np.empty(n, dtype=np.int32)
+        self.player_id = np.empty(n, dtype=np.int32)
+        self.period = np.empty(n, dtype=np.int8)
+        self.minute = np.empty(n, dtype=np.int16)
+        self.second = np.empty(n, dtype=np.int16)
+        self.x = np.full(n, np.nan, dtype=np.float32)
+        self.y = np.full(n, np.nan, dtype=np.float32)
+        self.end_x = np.full(n, np.nan, dtype=np.float32)
+        self.end_y = np.full(n, np.nan, dtype=np.float32)
+        self.type_names: dict[int, str] = {}
+
+        for i, event in enumerate(events):
+            type_id = event["type"]["id"]
+            self.type_id[i] = type_id
+            self.type_names.setdefault(type_id, event["type"]["name"])
+            self.team_id[i] = event["team"]["id"]
+            self.possession_team_id[i] = event.get("possession_team", {}).get("id", -1)
+            self.player_id[i] = event.get("player", {}).get("id", -1)
+            self.period[i] = event["period"]
+            self.minute[i] = event["minute"]
+            self.second[i] = event["second"]
+            location = event.get("location")
+            if location:
+                self.x[i], self.y[i] = location[0], location[1]
+            payload = END_LOCATION_PAYLOADS.get(type_id)
+            if payload is not None:
+                end_location = event.get(payload, {}).get("end_location")
+                if end_location:
+                    self.end_x[i], self.end_y[i] = end_location[0], end_location[1]
+
+        self.type_ids = {name: type_id for type_id, name in self.type_names.items()}
+        self.rows_by_type = _group_rows(self.type_id)
+        self.rows_by_player = _group_rows(self.player_id)
+
+    def __len__(self):
+        return len(self.events)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            column.nbytes
+            for column in (
+                self.type_id,
+                self.team_id,
+                self.possession_team_id,
+                self.player_id,
+                self.period,
+                self.minute,
+                self.second,
+                self.x,
+                self.y,
+                self.end_x,
+                self.end_y,
+            )
+        )
+
+    def _rows_for(self, index: dict, keys) -> np.ndarray:
+        empty = np.empty(0, dtype=np.intp)
+        if isinstance(keys, Iterable):
+            parts = [index.get(int(key), empty) for key in keys]
+            return np.sort(np.concatenate(parts)) if parts else empty
+        return index.get(int(keys), empty)
+
+    def rows(
+        self,
+        type_id: int | Iterable[int] | None = None,
+        player_id: int | None = None,
+        team_id: int | None = None,
+        possession_team_id: int | None = None,
+    ) -> np.ndarray:
+        """
+        Return the ascending row numbers matching every given filter.
+
+        Type and player filters are answered from the prebuilt indexes, so the cost
+        is proportional to the number of matching rows rather than to the match.
+
+        Args:
+        type_id (int | Iterable[int]): Event type id(s) to keep
+        player_id (int): Player id to keep
+        team_id (int): Team id to keep
+        possession_team_id (int): Possession team id to keep
+
+        Returns:
+        np.ndarray: Row numbers into ``events`` and every column
+        """
+        if type_id is not None and player_id is not None:
+            rows = np.intersect1d(
+                self._rows_for(self.rows_by_type, type_id),
+                self._rows_for(self.rows_by_player, player_id),
+                assume_unique=True,
+            )
+        elif type_id is not None:
+            rows = self._rows_for(self.rows_by_type, type_id)
+        elif player_id is not None:
+            rows = self._rows_for(self.rows_by_player, player_id)
+        else:
+            rows = np.arange(len(self))
+
+        if team_id is not None:
+            rows = rows[self.team_id[rows] == team_id]
+        if possession_team_id is not None:
+            rows = rows[self.possession_team_id[rows] == possession_team_id]
+        return rows
+
+    def take(self, rows: np.ndarray) -> list:
+        """Return the event dicts at the given rows."""
+        return [self.events[row] for row in rows]
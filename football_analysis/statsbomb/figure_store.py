@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+
+from football_analysis.config import cc
+from football_analysis.io import json
+
+
+@dataclass
+class FigureStore:
+    """
+    Compressed, content-addressed store of precomputed dashboard figures.
+
+    Figures are saved gzip-compressed under ``objects/`` and named after the
+    SHA-256 of their JSON, so identical figures are stored once. ``index.json``
+    maps each (figure name, game_id, player_id) to the digest of its figure and
+    records the version of the data each game was precomputed from; it is read
+    again whenever the file changes.
+
+    Args:
+    root (str): Folder holding the index and the objects
+    """
+
+    root: str = cc.FIGURE_STORE_PATH
+
+    def __post_init__(self):
+        self._index: dict[str, dict[str, str]] = {}
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name: str, game_id: str, player_id=None) -> str:
+        return f"{name}/{game_id}/{'' if player_id is None else player_id}"
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest[2:]}.json.gz")
+
+    def put(self, data: bytes) -> str:
+        """Save serialized figure bytes (if new) and return their digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(data))
+            os.replace(tmp_path, path)
+        return digest
+
+    def write_index(self, entries: dict[str, str], versions: dict[str, str]):
+        """
+        Replace the index.
+
+        Args:
+        entries (dict): Key -> digest of every figure
+        versions (dict): game_id -> version of the data its figures were
+            computed from
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        index = {"figures": entries, "versions": versions}
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(index, indent=True, sort_keys=True))
+        os.replace(tmp_path, self.index_path)
+
+    def _load_index(self) -> dict[str, dict[str, str]]:
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return {"figures": {}, "versions": {}}
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if stamp != self._stamp:
+                with open(self.index_path, "rb") as f:
+                    # An index written before versions were recorded has
+                    # neither key, so its figures are computed live
+                    self._index = {
+                        "figures": {},
+                        "versions": {},
+                        **json.loads(f.read()),
+                    }
+                self._stamp = stamp
+            return self._index
+
+    def get(self, name: str, game_id: str, player_id=None, version=None):
+        """
+        Return the decoded figure, or None if it was not precomputed.
+
+        Args:
+        name (str): Figure name
+        game_id (str): Game id
+        player_id: Selected player, if any
+        version (str): Current version of the game data; figures precomputed
+            from another version are ignored
+
+        Returns:
+        object: Decoded figure, or None
+        """
+        index = self._load_index()
+        if version is not None and index["versions"].get(str(game_id)) != version:
+            return None
+        digest = index["figures"].get(self.key(name, game_id, player_id))
+        if digest is None:
+            return None
+        with gzip.open(self._object_path(digest), "rb") as f:
+            return json.loads(f.read())
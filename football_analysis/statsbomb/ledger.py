@@ -0,0 +1,128 @@
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+
+from football_analysis.io import json
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file, read in chunks."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+@dataclass
+class ProcessingLedger:
+    """
+    Persistent record of the source files already processed into a dataset.
+
+    Each source file (e.g. ``events/3895052.json``) maps to the SHA-256, size
+    and modification time of the content that was processed, to the options
+    it was processed with and to the dataset partition it was written to. A
+    file whose size and modification time did not change is not read again;
+    otherwise it is only reprocessed if its hash changed.
+
+    Processed and removed files are staged, and only saved by ``commit`` once
+    every output derived from their partitions (merged data, summaries) is
+    rebuilt. An interrupted run thus leaves them unrecorded, and the next run
+    processes them again.
+
+    Args:
+    path (str): JSON file holding the ledger
+    """
+
+    path: str
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+        # Key -> entry to save, or None to forget the file, on commit
+        self._staged: dict[str, dict | None] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                self.entries = json.loads(f.read())
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            return self.entries.get(key)
+
+    def keys(self, source: str) -> list[str]:
+        """Keys of the files of a source folder, e.g. "events"."""
+        with self._lock:
+            return [key for key in self.entries if key.startswith(f"{source}/")]
+
+    def is_current(self, key: str, path: str, dataset: str, **options) -> bool:
+        """
+        Whether a source file is already processed into the dataset.
+
+        Args:
+        key (str): Ledger key of the file
+        path (str): Local path of the file
+        dataset (str): Root of the dataset holding its partition
+        options: Processing options that change the output
+
+        Returns:
+        bool: True if the file, its partition and the options did not change
+        """
+        entry = self.get(key)
+        if entry is None or entry.get("options") != options:
+            return False
+        if not os.path.exists(os.path.join(dataset, entry["partition"])):
+            return False
+
+        stat = os.stat(path)
+        if (stat.st_size, stat.st_mtime_ns) == (entry["size"], entry["mtime_ns"]):
+            return True
+        if file_sha256(path) != entry["sha256"]:
+            return False
+        # Touched but identical: remember the new modification time
+        self.record(key, **{**entry, "mtime_ns": stat.st_mtime_ns})
+        return True
+
+    def stage_file(self, key: str, path: str, partition: str, **options):
+        """Stage the entry of a file that was just processed."""
+        stat = os.stat(path)
+        entry = {
+            "sha256": file_sha256(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "partition": partition,
+            "options": options,
+        }
+        with self._lock:
+            self._staged[key] = entry
+
+    def stage_removal(self, key: str):
+        """Stage forgetting a file removed from its folder."""
+        with self._lock:
+            self._staged[key] = None
+
+    def commit(self):
+        """Apply the staged entries and write the ledger to disk."""
+        with self._lock:
+            for key, entry in self._staged.items():
+                if entry is None:
+                    self.entries.pop(key, None)
+                else:
+                    self.entries[key] = entry
+            self._staged = {}
+            self._save()
+
+    def record(self, key: str, **entry):
+        """Save the entry of a file and write the ledger to disk."""
+        with self._lock:
+            self.entries[key] = entry
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(self.entries, indent=True, sort_keys=True))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,56 @@
+import os
+import threading
+from dataclasses import dataclass
+
+from football_analysis.config import cc
+from football_analysis.io import json
+
+
+@dataclass
+class DownloadManifest:
+    """
+    Persistent record of the files already copied to the bucket.
+
+    Each object key maps to what was seen upstream (ETag, Last-Modified,
+    SHA-256 and size of the downloaded bytes) and to the ETag of the object
+    written to the bucket. The manifest is saved after every object, so an
+    interrupted download can pick up where it stopped.
+
+    Args:
+    path (str): JSON file holding the manifest
+    """
+
+    path: str = cc.DOWNLOAD_MANIFEST_PATH
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                self.entries = json.loads(f.read())
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            return self.entries.get(key)
+
+    def conditional_headers(self, key: str) -> dict[str, str]:
+        """HTTP headers that make the repository answer 304 if nothing changed."""
+        entry = self.get(key) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, key: str, **entry):
+        """Save the entry of an object and write the manifest to disk."""
+        with self._lock:
+            self.entries[key] = entry
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(self.entries, indent=True, sort_keys=True))
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,151 @@
+import glob
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+from football_analysis.io import json
+
+
+@dataclass
+class MatchIndex:
+    """
+    Index of the matches metadata under ``data/matches/``.
+
+    Each ``{competition_id}/{season_id}.json`` file is parsed at most once,
+    when one of its matches is first asked for, and its matches are indexed by
+    match id, team id and date for O(1) lookups.
+
+    Args:
+    folder (str): Folder of the {competition_id}/{season_id}.json files
+    """
+
+    folder: str = os.path.join("data", "matches")
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._loaded: set[tuple[int, int]] = set()
+        self._matches: dict[int, dict] = {}
+        self._by_team: dict[int, list[int]] = defaultdict(list)
+        self._by_date: dict[str, list[int]] = defaultdict(list)
+
+    def seasons(self, competition_id: int | None = None) -> list[tuple[int, int]]:
+        """(competition_id, season_id) of the metadata files, without parsing them."""
+        competition = "*" if competition_id is None else str(competition_id)
+        seasons = []
+        for path in glob.glob(os.path.join(self.folder, competition, "*.json")):
+            folder, file = os.path.split(path)
+            seasons.append((int(os.path.basename(folder)), int(file[: -len(".json")])))
+        return sorted(seasons)
+
+    def load(self, competition_id: int | None = None, season_id: int | None = None):
+        """Parse the metadata files of a competition (or season) not loaded yet."""
+        for season in self.seasons(competition_id):
+            if season_id is None or season[1] == season_id:
+                self._load_season(*season)
+
+    def _load_season(self, competition_id: int, season_id: int):
+        with self._lock:
+            if (competition_id, season_id) in self._loaded:
+                return
+            path = os.path.join(self.folder, str(competition_id), f"{season_id}.json")
+            with open(path, "rb") as f:
+                matches = json.loads(f.read())
+            for match in matches:
+                match_id = match["match_id"]
+                self._matches[match_id] = match
+                self._by_team[match["home_team"]["home_team_id"]].append(match_id)
+                self._by_team[match["away_team"]["away_team_id"]].append(match_id)
+                self._by_date[match["match_date"]].append(match_id)
+            self._loaded.add((competition_id, season_id))
+
+    def get(
+        self,
+        match_id,
+        competition_id: int | None = None,
+        season_id: int | None = None,
+    ) -> dict | None:
+        """
+        Metadata of a match.
+
+        Args:
+        match_id: Match id
+        competition_id (int): Competition of the match, to only parse its files
+        season_id (int): Season of the match, to only parse its file
+
+        Returns:
+        dict: Match metadata, or None if no metadata file has the match
+        """
+        match_id = int(match_id)
+        match = self._matches.get(match_id)
+        if match is not None:
+            return match
+        # Parse the files one at a time until one holds the match
+        for season in self.seasons(competition_id):
+            if season_id is None or season[1] == season_id:
+                self._load_season(*season)
+                if match_id in self._matches:
+                    return self._matches[match_id]
+        return None
+
+    def matches(
+        self,
+        competition_id: int | None = None,
+        season_id: int | None = None,
+        team_id: int | None = None,
+    ) -> list[dict]:
+        """
+        Metadata of the matches of a competition, season and/or team, by date.
+
+        Args:
+        competition_id (int): Only this competition
+        season_id (int): Only this season
+        team_id (int): Only the matches of this team
+
+        Returns:
+        list: Match metadata, sorted by date and kick off
+        """
+        self.load(competition_id, season_id)
+        if team_id is not None:
+            matches = [self._matches[i] for i in self._by_team.get(team_id, ())]
+        else:
+            matches = list(self._matches.values())
+        matches = [
+            match
+            for match in matches
+            if competition_id in (None, match["competition"]["competition_id"])
+            and season_id in (None, match["season"]["season_id"])
+        ]
+        return sorted(matches, key=lambda x: (x["match_date"], x["kick_off"] or ""))
+
+    def on_date(self, match_date: str) -> list[dict]:
+        """Metadata of the loaded matches played on a date (YYYY-MM-DD)."""
+        return [self._matches[i] for i in self._by_date.get(match_date, ())]
+
+    def titles(
+        self,
+        competition_id: int | None = None,
+        season_id: int | None = None,
+        team_id: int | None = None,
+    ) -> dict[str, str]:
+        """
+        Dropdown titles of matches, e.g. "Home x Away (2023-08-19)", by date.
+
+        Args:
+        competition_id (int): Only this competition
+        season_id (int): Only this season
+        team_id (int): Only the matches of this team
+
+        Returns:
+        dict: match_id (str) -> title
+        """
+        return {
+            str(match["match_id"]): (
+                f"{match['home_team']['home_team_name']} x "
+                f"{match['away_team']['away_team_name']} ({match['match_date']})"
+            )
+            for match in self.matches(competition_id, season_id, team_id)
+        }
+
+
+match_index: MatchIndex = MatchIndex()
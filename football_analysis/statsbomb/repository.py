@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from football_analysis.config import cc
+from football_analysis.statsbomb.events import MatchEvents
+
+
+class FrozenDict(dict):
+    """Dict that refuses in-place mutation, shared between analysis objects."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Match events are read-only, copy them before mutating")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def _freeze(obj: dict) -> FrozenDict:
+    # json calls the hook bottom-up, so nested dicts are already frozen here
+    return FrozenDict(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in obj.items()
+    )
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    matches: int = 0
+    bytes: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "matches": self.matches,
+            "bytes": self.bytes,
+        }
+
+
+@dataclass
+class MatchRepository:
+    """
+    Process-wide LRU cache of parsed match event files.
+
+    Each match is parsed once into a ``MatchEvents`` (read-only events plus their
+    columnar index) that every analysis object built for the match shares. The
+    byte budget is measured on the size of the JSON files on disk plus the columns.
+
+    Args:
+    data_folder (str): Folder holding the ``<game_id>.json`` event files
+    max_matches (int): Maximum number of matches kept in memory
+    max_bytes (int): Maximum total size (in source bytes) of cached matches
+    """
+
+    data_folder: str = os.path.join("data", "events")
+    max_matches: int = cc.MATCH_CACHE_MAX_MATCHES
+    max_bytes: int = cc.MATCH_CACHE_MAX_BYTES
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def __post_init__(self):
+        self._entries: OrderedDict[str, tuple[MatchEvents, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per match so concurrent requests for it parse the file once
+        self._loading: dict[str, threading.Lock] = {}
+
+    def get_events(self, game_id: str) -> tuple:
+        return self.get_match(game_id).events
+
+    def get_match(self, game_id: str) -> MatchEvents:
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is not None:
+                self._entries.move_to_end(game_id)
+                self.stats.hits += 1
+                return entry[0]
+            load_lock = self._loading.setdefault(game_id, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(game_id)
+                if entry is not None:
+                    self._entries.move_to_end(game_id)
+                    self.stats.hits += 1
+                    return entry[0]
+                self.stats.misses += 1
+
+            try:
+                match, size = self._load(game_id)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(game_id, None)
+                raise
+
+            # Insert before releasing the load lock, so that a thread arriving
+            # now finds the entry instead of parsing the file again
+            with self._lock:
+                previous = self._entries.get(game_id)
+                if previous is not None:
+                    self.stats.bytes -= previous[1]
+                self._entries[game_id] = (match, size)
+                self.stats.bytes += size
+                self._loading.pop(game_id, None)
+                self._evict()
+                self.stats.matches = len(self._entries)
+        return match
+
+    def invalidate(self, game_id: str | None = None):
+        with self._lock:
+            if game_id is None:
+                self._entries.clear()
+                self.stats.bytes = 0
+            elif game_id in self._entries:
+                self.stats.bytes -= self._entries.pop(game_id)[1]
+            self.stats.matches = len(self._entries)
+
+    def _load(self, game_id: str) -> tuple[MatchEvents, int]:
+        file_path = os.path.join(self.data_folder, game_id + ".json")
+        # Not football_analysis.io.json: freezing every object dominates, and
+        # freezing orjson's output afterwards is no faster than this hook
+        with open(file_path) as f:
+            match = MatchEvents(tuple(json.load(f, object_hook=_freeze)))
+        return match, os.path.getsize(file_path) + match.nbytes
+
+    def _evict(self):
+        # Always keep the most recent match, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_matches or self.stats.bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.stats.bytes -= size
+            self.stats.evictions += 1
+
+
+match_repository: MatchRepository = MatchRepository()
@@ -0,0 +1,177 @@
+import uuid
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Column of the flat event schema.
+
+    Args:
+    name (str): Column name
+    path (tuple): Keys (and list positions) leading to the value in an event
+    dtype (str): pandas dtype, "category" for dictionary-encoded strings
+    """
+
+    name: str
+    path: tuple
+    dtype: str
+
+
+def _named(prefix: str, path: tuple, id_dtype: str = "Int16") -> list[Column]:
+    """Columns of an {"id": ..., "name": ...} object."""
+    return [
+        Column(f"{prefix}_id", (*path, "id"), id_dtype),
+        Column(f"{prefix}_name", (*path, "name"), "category"),
+    ]
+
+
+def _point(prefix: str, path: tuple, dims: str = "xy") -> list[Column]:
+    """Columns of an [x, y(, z)] location."""
+    return [
+        Column(f"{prefix}_{dim}", (*path, i), "float32") for i, dim in enumerate(dims)
+    ]
+
+
+# One row per event. Integers that every event has are plain numpy ints, the
+# optional ones are nullable, strings repeated across events are categories.
+EVENT_SCHEMA = [
+    Column("id", ("id",), "object"),
+    Column("index", ("index",), "int32"),
+    Column("period", ("period",), "int8"),
+    Column("timestamp", ("timestamp",), "object"),
+    Column("minute", ("minute",), "int16"),
+    Column("second", ("second",), "int16"),
+    *_named("type", ("type",), "int16"),
+    Column("possession", ("possession",), "int32"),
+    *_named("possession_team", ("possession_team",), "int32"),
+    *_named("play_pattern", ("play_pattern",), "int16"),
+    *_named("team", ("team",), "int32"),
+    *_named("player", ("player",), "Int32"),
+    *_named("position", ("position",), "Int16"),
+    *_point("location", ("location",)),
+    Column("duration", ("duration",), "float32"),
+    Column("under_pressure", ("under_pressure",), "boolean"),
+    Column("counterpress", ("counterpress",), "boolean"),
+    Column("off_camera", ("off_camera",), "boolean"),
+    Column("out", ("out",), "boolean"),
+    Column("tactics_formation", ("tactics", "formation"), "Int16"),
+    # Pass
+    *_named("pass_recipient", ("pass", "recipient"), "Int32"),
+    Column("pass_length", ("pass", "length"), "float32"),
+    Column("pass_angle", ("pass", "angle"), "float32"),
+    *_named("pass_height", ("pass", "height")),
+    *_point("pass_end", ("pass", "end_location")),
+    *_named("pass_body_part", ("pass", "body_part")),
+    *_named("pass_type", ("pass", "type")),
+    *_named("pass_outcome", ("pass", "outcome")),
+    *_named("pass_technique", ("pass", "technique")),
+    Column("pass_assisted_shot_id", ("pass", "assisted_shot_id"), "object"),
+    Column("pass_cross", ("pass", "cross"), "boolean"),
+    Column("pass_switch", ("pass", "switch"), "boolean"),
+    Column("pass_cut_back", ("pass", "cut_back"), "boolean"),
+    Column("pass_shot_assist", ("pass", "shot_assist"), "boolean"),
+    Column("pass_goal_assist", ("pass", "goal_assist"), "boolean"),
+    # Carry
+    *_point("carry_end", ("carry", "end_location")),
+    # Shot
+    Column("shot_statsbomb_xg", ("shot", "statsbomb_xg"), "float32"),
+    *_point("shot_end", ("shot", "end_location"), "xyz"),
+    *_named("shot_outcome", ("shot", "outcome")),
+    *_named("shot_type", ("shot", "type")),
+    *_named("shot_technique", ("shot", "technique")),
+    *_named("shot_body_part", ("shot", "body_part")),
+    Column("shot_key_pass_id", ("shot", "key_pass_id"), "object"),
+    Column("shot_first_time", ("shot", "first_time"), "boolean"),
+    # Duel
+    *_named("duel_type", ("duel", "type")),
+    *_named("duel_outcome", ("duel", "outcome")),
+    # Substitution
+    *_named("substitution_replacement", ("substitution", "replacement"), "Int32"),
+    *_named("substitution_outcome", ("substitution", "outcome")),
+]
+
+EVENT_DTYPES = {column.name: column.dtype for column in EVENT_SCHEMA}
+
+
+def _step(values: list, key) -> list:
+    """Take ``key`` (a dict key or a list position) of every value, or None."""
+    if isinstance(key, int):
+        return [v[key] if v is not None and len(v) > key else None for v in values]
+    return [v.get(key) if v is not None else None for v in values]
+
+
+def flatten_events(events: list) -> pd.DataFrame:
+    """
+    Flatten events into the typed columns of EVENT_SCHEMA.
+
+    Args:
+    events (list): Decoded events
+
+    Returns:
+    pd.DataFrame: One row per event
+    """
+    # Values of every path prefix, so that e.g. "pass" is looked up once for
+    # all the pass columns
+    prefixes = {(): events}
+    columns = {}
+    for column in EVENT_SCHEMA:
+        for depth in range(1, len(column.path) + 1):
+            prefix = column.path[:depth]
+            if prefix not in prefixes:
+                prefixes[prefix] = _step(prefixes[prefix[:-1]], prefix[-1])
+        values = prefixes[column.path]
+        categorical = pd.Categorical(values) if column.dtype == "category" else None
+        # fastparquet cannot read back a categorical without categories
+        if categorical is not None and len(categorical.categories):
+            columns[column.name] = categorical
+        elif column.dtype in ("category", "object"):
+            columns[column.name] = np.array(values, dtype=object)
+        elif column.dtype.startswith("float"):
+            # None becomes NaN
+            columns[column.name] = np.array(values, dtype=float).astype(column.dtype)
+        else:
+            columns[column.name] = pd.array(values, dtype=column.dtype)
+    return pd.DataFrame(columns)
+
+
+def uuid_keys(values) -> np.ndarray:
+    """UUID strings as 16-byte binary keys."""
+    values = list(values)
+    hex_digits = "".join(values).replace("-", "")
+    return np.frombuffer(bytes.fromhex(hex_digits), dtype="S16", count=len(values))
+
+
+def uuid_words(keys) -> tuple[np.ndarray, np.ndarray]:
+    """16-byte keys as two 64-bit integers, which hash faster than bytes."""
+    # Re-pad the keys whose trailing zero bytes numpy stripped
+    words = np.asarray(keys, dtype="S16").view("<u8").reshape(-1, 2)
+    return words[:, 0], words[:, 1]
+
+
+def uuid_strings(keys) -> list[str]:
+    """16-byte keys back as UUID strings."""
+    raw = np.asarray(keys, dtype="S16").tobytes()
+    return [str(uuid.UUID(bytes=raw[i : i + 16])) for i in range(0, len(raw), 16)]
+
+
+def flatten_three_sixty(frames: list) -> pd.DataFrame:
+    """
+    Put three sixty frames into a DataFrame keyed by 16-byte event UUIDs.
+
+    Args:
+    frames (list): Decoded three sixty frames
+
+    Returns:
+    pd.DataFrame: One row per frame
+    """
+    return pd.DataFrame(
+        {
+            "event_uuid": uuid_keys(frame["event_uuid"] for frame in frames),
+            "visible_area": [frame.get("visible_area") for frame in frames],
+            "freeze_frame": [frame.get("freeze_frame") for frame in frames],
+        }
+    )
@@ -1,32 +1,165 @@
-import json
+import hashlib
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import lru_cache
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import BaseClient
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from mypy_boto3_s3 import ServiceResource
 from mypy_boto3_s3.service_resource import Bucket
 
 from football_analysis.config import cc
+from football_analysis.config.constant import DOWNLOAD_CHUNK_SIZE
+from football_analysis.io import json
+
+try:
+    import zstandard
+except ImportError:  # zstd uploads are optional
+    zstandard = None
+
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class GzipStream:
+    """
+    Read-only file object that gzip-compresses another one on the fly.
+
+    Args:
+    source: File object to read uncompressed bytes from
+    chunk_size (int): Number of bytes read from the source at a time
+    """
+
+    def __init__(self, source, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self._compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        self._buffer = bytearray()
+        self._eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self.source.read(self.chunk_size)
+            if chunk:
+                self._buffer += self._compressor.compress(chunk)
+            else:
+                self._buffer += self._compressor.flush()
+                self._eof = True
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class HashingStream:
+    """
+    Read-only file object that hashes and counts the bytes read through it.
+
+    Args:
+    source: File object to read from
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        self.hash.update(data)
+        self.size += len(data)
+        return data
+
+    @property
+    def sha256(self) -> str:
+        return self.hash.hexdigest()
+
+
+def compress_stream(fileobj, compression: str | None = None):
+    """
+    Wrap a file object so that reading it returns compressed bytes.
+
+    Args:
+    fileobj: File object to read uncompressed bytes from
+    compression (str): None, "gzip" or "zstd" (requires zstandard)
+
+    Returns:
+    File object to read (compressed) bytes from
+    """
+    if compression is None:
+        return fileobj
+    if compression == "gzip":
+        return GzipStream(fileobj)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package")
+        return zstandard.ZstdCompressor().stream_reader(
+            fileobj, read_size=DOWNLOAD_CHUNK_SIZE
+        )
+    raise ValueError(f"Unknown compression {compression!r}")
 
 
 @dataclass
 class AWS:
+    """
+    Long-lived handle on the object storage bucket.
+
+    The boto3 client is thread-safe and shared by every upload; its connection
+    pool is sized for ``max_pool_connections`` concurrent requests. boto3
+    resources are not thread-safe, so ``resource`` and ``bucket`` are created
+    lazily once per thread.
+
+    Args:
+    max_pool_connections (int): Size of the client connection pool
+    max_workers (int): Default number of parallel uploads in save_many
+    """
+
+    max_pool_connections: int = 32
+    max_workers: int = 16
+
     def __post_init__(self):
-        self.client: BaseClient = boto3.client(
-            "s3",
+        # A private session: the default boto3 session is not thread-safe
+        self.session = boto3.session.Session(
             aws_access_key_id=cc.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=cc.AWS_SECRET_ACCESS_KEY,
             region_name=cc.AWS_DEFAULT_REGION,
-            endpoint_url=cc.AWS_ENDPOINT_URL,
         )
-        self.resource: ServiceResource = boto3.resource(
+        self.client: BaseClient = self.session.client(
             "s3",
-            aws_access_key_id=cc.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=cc.AWS_SECRET_ACCESS_KEY,
-            region_name=cc.AWS_DEFAULT_REGION,
             endpoint_url=cc.AWS_ENDPOINT_URL,
+            config=Config(
+                max_pool_connections=self.max_pool_connections,
+                retries={"max_attempts": 5, "mode": "standard"},
+            ),
+        )
+        # Streams larger than one chunk are sent as multipart uploads
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=MULTIPART_CHUNK_SIZE,
+            max_concurrency=4,
         )
-        self.bucket: Bucket = self.resource.Bucket(cc.AWS_BUCKET_NAME)
+        self._local = threading.local()
+        self._session_lock = threading.Lock()
+
+    @property
+    def resource(self) -> ServiceResource:
+        if not hasattr(self._local, "resource"):
+            with self._session_lock:
+                self._local.resource = self.session.resource(
+                    "s3", endpoint_url=cc.AWS_ENDPOINT_URL
+                )
+        return self._local.resource
+
+    @property
+    def bucket(self) -> Bucket:
+        return self.resource.Bucket(cc.AWS_BUCKET_NAME)
 
     def save_to_json(self, data: dict, path: str, file_name: str):
         self.client.put_object(
@@ -34,3 +167,81 @@ class AWS:
             Bucket=cc.AWS_BUCKET_NAME,
             Key=f"{path}/{file_name}.json",
         )
+
+    def upload_stream(
+        self, fileobj, path: str, file_name: str, compression: str | None = None
+    ) -> str:
+        """
+        Stream raw JSON bytes to the bucket without decoding them.
+
+        The file object is read chunk by chunk (and compressed on the fly), so
+        at most one multipart chunk per concurrent part is held in memory.
+
+        Args:
+        fileobj: File object to read the JSON bytes from (e.g. a response body)
+        path (str): Folder of the object
+        file_name (str): Object name, without extension
+        compression (str): None, "gzip" or "zstd"
+
+        Returns:
+        str: Object key, ending in .json, .json.gz or .json.zst
+        """
+        stream = compress_stream(fileobj, compression)
+        key = f"{path}/{file_name}.json{COMPRESSION_SUFFIXES[compression]}"
+        extra_args = {"ContentType": "application/json"}
+        if compression is not None:
+            extra_args["ContentEncoding"] = compression
+        self.client.upload_fileobj(
+            stream,
+            cc.AWS_BUCKET_NAME,
+            key,
+            ExtraArgs=extra_args,
+            Config=self.transfer_config,
+        )
+        return key
+
+    def object_etag(self, key: str) -> str | None:
+        """Return the ETag of an object of the bucket, or None if it is missing."""
+        try:
+            return self.client.head_object(Bucket=cc.AWS_BUCKET_NAME, Key=key)["ETag"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    def _timed_save_to_json(self, data: dict, path: str, file_name: str) -> float:
+        start = time.perf_counter()
+        self.save_to_json(data, path, file_name)
+        return time.perf_counter() - start
+
+    def save_many(self, items, max_workers: int | None = None) -> dict[str, float]:
+        """
+        Upload many JSON objects in parallel.
+
+        Items are submitted as they are produced, so a generator of downloads
+        overlaps with the uploads of the files already downloaded.
+
+        Args:
+        items (Iterable[tuple]): (data, path, file_name) per object
+        max_workers (int): Number of parallel uploads (default: self.max_workers)
+
+        Returns:
+        dict: Object key -> upload time in seconds
+        """
+        timings = {}
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as pool:
+            futures = {
+                pool.submit(self._timed_save_to_json, data, path, file_name): (
+                    f"{path}/{file_name}.json"
+                )
+                for data, path, file_name in items
+            }
+            for future in as_completed(futures):
+                timings[futures[future]] = future.result()
+        return timings
+
+
+@lru_cache(maxsize=1)
+def get_aws() -> AWS:
+    """Return the process-wide storage handle."""
+    return AWS()
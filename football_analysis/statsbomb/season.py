@@ -0,0 +1,329 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from football_analysis.config import cc
+from football_analysis.statsbomb.dataset import ParquetDataset
+from football_analysis.statsbomb.events import (
+    EVENT_COUNT_TYPES,
+    PASS_TYPE_ID,
+    SHOT_TYPE_ID,
+)
+
+# Columns of the events dataset read for every match
+SEASON_COLUMNS = [
+    "id",
+    "period",
+    "minute",
+    "second",
+    "type_id",
+    "type_name",
+    "possession_team_id",
+    "team_id",
+    "player_id",
+    "player_name",
+    "location_x",
+    "location_y",
+    "pass_recipient_id",
+    "shot_statsbomb_xg",
+    "shot_end_x",
+    "shot_end_y",
+    "shot_outcome_name",
+    "shot_type_name",
+    "shot_body_part_name",
+]
+SHOT_COLUMNS = [
+    "match_id",
+    "id",
+    "period",
+    "minute",
+    "second",
+    "player_id",
+    "player_name",
+    "location_x",
+    "location_y",
+    "shot_statsbomb_xg",
+    "shot_end_x",
+    "shot_end_y",
+    "shot_outcome_name",
+    "shot_type_name",
+    "shot_body_part_name",
+]
+
+
+def _empty_passers() -> pd.DataFrame:
+    return pd.DataFrame(
+        {"x_sum": [], "y_sum": [], "passes_given": []},
+        index=pd.Index([], dtype=np.int64, name="player_id"),
+    )
+
+
+def _empty_counts(*names: str) -> pd.Series:
+    if len(names) == 1:
+        index = pd.Index([], dtype=np.int64, name=names[0])
+    else:
+        index = pd.MultiIndex.from_arrays([[], []], names=list(names))
+    return pd.Series([], index=index, dtype=np.int64)
+
+
+@dataclass
+class SeasonAggregate:
+    """
+    Additive aggregates of the events of a team over a set of matches.
+
+    Every field is a sum or a count, so the aggregates of two disjoint sets of
+    matches merge into the aggregate of their union without going back to the
+    events. Averages are only computed when reading the results.
+
+    Args:
+    team_id (int): Team the passes and shots belong to
+    player_id (int): Player the event counts are restricted to, if any
+    match_ids (frozenset): Matches aggregated
+    passers (pd.DataFrame): Sum of pass locations and number of passes, by passer
+    received (pd.Series): Number of passes received, by recipient
+    pairs (pd.Series): Number of passes, by (passer, recipient)
+    shots (pd.DataFrame): Shots of the team, one row per shot
+    event_count (Counter): Events of the team in possession, by type name
+    opp_event_count (Counter): Events of both teams, by type name
+    """
+
+    team_id: int
+    player_id: int | None = None
+    match_ids: frozenset = frozenset()
+    passers: pd.DataFrame = field(default_factory=_empty_passers)
+    received: pd.Series = field(
+        default_factory=lambda: _empty_counts("pass_recipient_id")
+    )
+    pairs: pd.Series = field(
+        default_factory=lambda: _empty_counts("player_id", "pass_recipient_id")
+    )
+    shots: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(columns=SHOT_COLUMNS)
+    )
+    event_count: Counter = field(default_factory=Counter)
+    opp_event_count: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "SeasonAggregate") -> "SeasonAggregate":
+        """Aggregate of the matches of both aggregates, which must not overlap."""
+        if (self.team_id, self.player_id) != (other.team_id, other.player_id):
+            raise ValueError("Cannot merge aggregates of different teams or players")
+        overlap = self.match_ids & other.match_ids
+        if overlap:
+            raise ValueError(f"Matches {sorted(overlap)} are aggregated twice")
+        shots = [df for df in (self.shots, other.shots) if len(df)]
+        return SeasonAggregate(
+            team_id=self.team_id,
+            player_id=self.player_id,
+            match_ids=self.match_ids | other.match_ids,
+            passers=self.passers.add(other.passers, fill_value=0),
+            received=self.received.add(other.received, fill_value=0).astype(np.int64),
+            pairs=self.pairs.add(other.pairs, fill_value=0).astype(np.int64),
+            shots=(
+                pd.concat(shots, ignore_index=True) if shots else self.shots.iloc[:0]
+            ),
+            event_count=self.event_count + other.event_count,
+            opp_event_count=self.opp_event_count + other.opp_event_count,
+        )
+
+    __add__ = merge
+
+    def passers_avg_location(self) -> pd.DataFrame:
+        """Same columns as PassAnalysis.passers_avg_location."""
+        passers = self.passers.reset_index()
+        df = pd.DataFrame(
+            {
+                "player_id": passers["player_id"],
+                "x": passers["x_sum"] / passers["passes_given"],
+                "y": passers["y_sum"] / passers["passes_given"],
+                "passes_given": passers["passes_given"].astype(np.int64),
+            }
+        )
+        df["passes_received"] = df["player_id"].map(self.received)
+        df["total_passes"] = df["passes_given"] + df["passes_received"]
+        return df
+
+    def passes_between(self, directed: bool = False) -> pd.DataFrame:
+        """Same columns as PassAnalysis.passes_between after enrichment."""
+        pairs = self.pairs
+        if not directed and len(pairs):
+            # Count A->B and B->A as the same (sorted) pair
+            passer = pairs.index.get_level_values(0).to_numpy()
+            recipient = pairs.index.get_level_values(1).to_numpy()
+            pairs = pairs.groupby(
+                [np.minimum(passer, recipient), np.maximum(passer, recipient)]
+            ).sum()
+        df = pd.DataFrame(
+            {
+                "player_id": pairs.index.get_level_values(0).astype(np.int32),
+                "pass_recipient_id": pairs.index.get_level_values(1).astype(np.int32),
+                "pass_count": pairs.to_numpy(),
+            }
+        )
+        location = self.passers_avg_location().set_index("player_id")
+        for column, key in [("", "player_id"), ("_end", "pass_recipient_id")]:
+            df[f"x{column}"] = df[key].map(location["x"])
+            df[f"y{column}"] = df[key].map(location["y"])
+        return df
+
+
+def match_aggregate(
+    match_id,
+    team_id: int,
+    player_id: int | None = None,
+    dataset_root: str = cc.EVENTS_DATASET_PATH,
+) -> SeasonAggregate:
+    """
+    Aggregate the events of one match, read from its dataset partition.
+
+    Args:
+    match_id: Match id
+    team_id (int): Team the passes and shots belong to
+    player_id (int): Player the event counts are restricted to, if any
+    dataset_root (str): Root of the events dataset
+
+    Returns:
+    SeasonAggregate: Aggregate of the match
+    """
+    events = ParquetDataset(dataset_root).read_match(match_id, columns=SEASON_COLUMNS)
+    if events is None:
+        raise ValueError(
+            f"Match {match_id} is not in {dataset_root}, run jobs/process_data.py"
+        )
+    team = (events["team_id"] == team_id).to_numpy()
+    type_id = events["type_id"].to_numpy()
+
+    passes = events.loc[team & (type_id == PASS_TYPE_ID)]
+    passer = passes["player_id"].to_numpy(dtype=np.int64, na_value=-1)
+    passers = (
+        pd.DataFrame(
+            {
+                "player_id": passer,
+                "x_sum": passes["location_x"].to_numpy(dtype=np.float64),
+                "y_sum": passes["location_y"].to_numpy(dtype=np.float64),
+                "passes_given": 1.0,
+            }
+        )
+        .groupby("player_id")
+        .sum()
+    )
+
+    # Directed pairs, packed into one int64 key as in PassAnalysis
+    has_recipient = passes["pass_recipient_id"].notna().to_numpy()
+    recipient = passes["pass_recipient_id"].to_numpy(dtype=np.int64, na_value=-1)
+    passer, recipient = passer[has_recipient], recipient[has_recipient]
+    recipient_ids, received = np.unique(recipient, return_counts=True)
+    pair_keys, pass_count = np.unique((passer << 32) | recipient, return_counts=True)
+    received = pd.Series(
+        received, index=pd.Index(recipient_ids, name="pass_recipient_id")
+    )
+    pairs = pd.Series(
+        pass_count,
+        index=pd.MultiIndex.from_arrays(
+            [pair_keys >> 32, pair_keys & 0xFFFFFFFF],
+            names=["player_id", "pass_recipient_id"],
+        ),
+    )
+
+    shots = events.loc[team & (type_id == SHOT_TYPE_ID)].assign(match_id=match_id)
+
+    # Same selection as analysis.Event.get_event_count
+    counted = events.loc[events["type_name"].isin(EVENT_COUNT_TYPES)]
+    if player_id is not None:
+        counted = counted.loc[counted["player_id"] == player_id]
+    in_possession = counted["possession_team_id"] == team_id
+
+    return SeasonAggregate(
+        team_id=team_id,
+        player_id=player_id,
+        match_ids=frozenset([str(match_id)]),
+        passers=passers,
+        received=received,
+        pairs=pairs,
+        shots=shots[SHOT_COLUMNS].reset_index(drop=True),
+        event_count=Counter(counted.loc[in_possession, "type_name"].astype(str)),
+        opp_event_count=Counter(counted["type_name"].astype(str)),
+    )
+
+
+def aggregate_matches(
+    match_ids,
+    team_id: int,
+    player_id: int | None = None,
+    workers: int = 1,
+    dataset_root: str = cc.EVENTS_DATASET_PATH,
+) -> SeasonAggregate:
+    """
+    Aggregate the events of a set of matches, in parallel across matches.
+
+    Args:
+    match_ids (Iterable): Match ids
+    team_id (int): Team the passes and shots belong to
+    player_id (int): Player the event counts are restricted to, if any
+    workers (int): Number of worker processes
+    dataset_root (str): Root of the events dataset
+
+    Returns:
+    SeasonAggregate: Aggregate of all the matches
+    """
+    match_ids = list(match_ids)
+    arguments = (repeat(team_id), repeat(player_id), repeat(dataset_root))
+    if workers > 1 and len(match_ids) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(match_aggregate, match_ids, *arguments))
+    else:
+        partials = list(map(match_aggregate, match_ids, *arguments))
+
+    aggregate = SeasonAggregate(team_id=team_id, player_id=player_id)
+    for partial in partials:
+        aggregate = aggregate.merge(partial)
+    return aggregate
+
+
+class SeasonAnalysis:
+    """
+    Pass network, shots and event counts of a team over many matches.
+
+    The matches are read from the events dataset and aggregated in one
+    vectorized pass each; more matches can be added later without
+    recomputing the ones already aggregated.
+
+    Args:
+    match_ids (Iterable): Match ids
+    team_id (int): Team to analyse
+    player_id (int): Restrict the event counts to this player
+    workers (int): Number of worker processes
+    dataset_root (str): Root of the events dataset
+    """
+
+    def __init__(
+        self,
+        match_ids,
+        team_id: int,
+        player_id: int | None = None,
+        workers: int = 1,
+        dataset_root: str = cc.EVENTS_DATASET_PATH,
+    ):
+        self.team_id = team_id
+        self.player_id = player_id
+        self.workers = workers
+        self.dataset_root = dataset_root
+        self.aggregate = SeasonAggregate(team_id=team_id, player_id=player_id)
+        self.add_matches(match_ids)
+
+    def add_matches(self, match_ids):
+        """Aggregate more matches; the ones already aggregated are skipped."""
+        new = [m for m in match_ids if str(m) not in self.aggregate.match_ids]
+        self.aggregate = self.aggregate.merge(
+            aggregate_matches(
+                new, self.team_id, self.player_id, self.workers, self.dataset_root
+            )
+        )
+        self.passers_avg_location = self.aggregate.passers_avg_location()
+        self.passes_between = self.aggregate.passes_between()
+        self.team_shots_df = self.aggregate.shots
+        self.event_count = dict(sorted(self.aggregate.event_count.items()))
+        self.opp_event_count = dict(sorted(self.aggregate.opp_event_count.items()))
@@ -0,0 +1,86 @@
+import json
+from itertools import islice
+from typing import Iterator
+
+try:
+    import ijson
+except ImportError:  # the stdlib decoder is used without ijson
+    ijson = None
+
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_BATCH_SIZE = 1000
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def _iter_array(f, chunk_size: int) -> Iterator:
+    """Decode the items of a top-level JSON array with the stdlib decoder."""
+    buffer = f.read(chunk_size).lstrip(_WHITESPACE)
+    if not buffer.startswith("["):
+        raise ValueError(f"{f.name} does not hold a JSON array")
+    position = 1
+    eof = False
+
+    while True:
+        # Skip the separators and stop at the end of the array
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE + ",":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+        if position == len(buffer):
+            raise ValueError(f"{f.name} ends before the end of the array")
+        if buffer[position] == "]":
+            return
+
+        # Decode one item, reading more of the file until it is complete
+        while True:
+            try:
+                item, end = _decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A complete item is followed by a separator
+                if end < len(buffer) or eof:
+                    break
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+
+        yield item
+        position = end
+
+
+def iter_events(path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Yield the events of an event or three sixty file one at a time.
+
+    Only one event and one chunk of the file are held in memory, instead of
+    the whole decoded file. ijson is used when it is installed, otherwise
+    the stdlib decoder decodes one event at a time from a sliding buffer.
+
+    Args:
+    path (str): JSON file holding a list of events
+    chunk_size (int): Bytes read from the file at a time
+
+    Returns:
+    Iterator[dict]: Decoded events, in file order
+    """
+    if ijson is not None:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "item", use_float=True, buf_size=chunk_size)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from _iter_array(f, chunk_size)
+
+
+def batched(iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of ``size`` items (the last may be shorter)."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
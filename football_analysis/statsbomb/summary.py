@@ -0,0 +1,262 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from football_analysis.config import cc
+from football_analysis.statsbomb.dataset import ParquetDataset
+from football_analysis.statsbomb.events import (
+    EVENT_COUNT_TYPES,
+    PASS_TYPE_ID,
+    SHOT_TYPE_ID,
+)
+from football_analysis.statsbomb.season import SeasonAggregate
+
+# Columns of the events dataset the summaries are computed from
+SUMMARY_COLUMNS = [
+    "type_id",
+    "type_name",
+    "possession_team_id",
+    "team_id",
+    "player_id",
+    "location_x",
+    "location_y",
+    "pass_recipient_id",
+    "shot_statsbomb_xg",
+    "shot_outcome_name",
+]
+SUMMARY_TABLES = ("event_counts", "pass_locations", "pass_pairs", "shots")
+
+
+def summarize_match(events: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    Additive summary tables of the events of one match.
+
+    Every value is a count or a sum, so the tables of several matches are
+    combined by concatenating them and summing by key.
+
+    - event_counts: events by team, possession team, player and type
+    - pass_locations: sum of pass locations, passes given and received, by
+      team and player
+    - pass_pairs: passes by team, passer and recipient
+    - shots: shots, goals and xG by team and player
+
+    Args:
+    events (pd.DataFrame): Events of the match, with SUMMARY_COLUMNS
+
+    Returns:
+    dict: Table name -> DataFrame
+    """
+    event_counts = (
+        events.groupby(
+            ["team_id", "possession_team_id", "player_id", "type_id", "type_name"],
+            dropna=False,
+            observed=True,
+        )
+        .size()
+        .rename("count")
+        .reset_index()
+        .astype({"type_name": str})
+    )
+
+    passes = events.loc[events["type_id"] == PASS_TYPE_ID]
+    given = (
+        passes.astype({"location_x": np.float64, "location_y": np.float64})
+        .groupby(["team_id", "player_id"])
+        .agg(
+            x_sum=("location_x", "sum"),
+            y_sum=("location_y", "sum"),
+            passes_given=("type_id", "size"),
+        )
+    )
+    received = (
+        passes.groupby(["team_id", "pass_recipient_id"])
+        .size()
+        .rename("passes_received")
+        .rename_axis(["team_id", "player_id"])
+    )
+    pass_locations = (
+        given.join(received, how="outer")
+        .fillna({"x_sum": 0.0, "y_sum": 0.0, "passes_given": 0, "passes_received": 0})
+        .astype({"passes_given": np.int64, "passes_received": np.int64})
+        .reset_index()
+    )
+    pass_pairs = (
+        passes.groupby(["team_id", "player_id", "pass_recipient_id"])
+        .size()
+        .rename("pass_count")
+        .reset_index()
+    )
+
+    shots = events.loc[events["type_id"] == SHOT_TYPE_ID]
+    shots = (
+        shots.assign(
+            goal=(shots["shot_outcome_name"] == "Goal").astype(np.int64),
+            xg=shots["shot_statsbomb_xg"].astype(np.float64),
+        )
+        .groupby(["team_id", "player_id"])
+        .agg(shots=("type_id", "size"), goals=("goal", "sum"), xg_sum=("xg", "sum"))
+        .reset_index()
+    )
+
+    return {
+        "event_counts": event_counts,
+        "pass_locations": pass_locations,
+        "pass_pairs": pass_pairs,
+        "shots": shots,
+    }
+
+
+def count_events(
+    event_counts: pd.DataFrame, team_id: int, player_id: int | None = None
+) -> tuple[dict, dict]:
+    """
+    Same counts as analysis.Event.get_event_count, from event_counts rows.
+
+    Args:
+    event_counts (pd.DataFrame): Rows of the event_counts table
+    team_id (int): Team in possession for the team counts
+    player_id (int): Only count the events of this player
+
+    Returns:
+    tuple: (event_count, opp_event_count), by type name
+    """
+    df = event_counts.loc[event_counts["type_name"].isin(EVENT_COUNT_TYPES)]
+    if player_id is not None:
+        df = df.loc[df["player_id"] == player_id]
+    # opponent events are not filtered by possession team, as in Event
+    team = df.loc[df["possession_team_id"] == team_id]
+    return tuple(
+        dict(sorted(rows.groupby("type_name")["count"].sum().astype(int).items()))
+        for rows in (team, df)
+    )
+
+
+@dataclass
+class SummaryStore:
+    """
+    Per-match summary tables written by jobs/process_data.py.
+
+    Each table is a dataset partitioned like the events dataset, under
+    ``{root}/{table}``. Queries over any set of matches, team or player sum
+    the rows of the small tables instead of scanning the events.
+
+    Args:
+    root (str): Folder of the summary datasets
+    """
+
+    root: str = cc.SUMMARY_DATASET_PATH
+
+    def read(self, table: str, match_ids) -> pd.DataFrame | None:
+        """
+        Rows of a summary table for some matches.
+
+        Args:
+        table (str): One of SUMMARY_TABLES
+        match_ids (Iterable): Match ids
+
+        Returns:
+        pd.DataFrame: Rows of every match, or None if a match is not summarized
+        """
+        dataset = ParquetDataset(os.path.join(self.root, table))
+        frames = []
+        for match_id in match_ids:
+            df = dataset.read_match(match_id)
+            if df is None:
+                return None
+            frames.append(df)
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+    def event_count(
+        self, match_ids, team_id: int, player_id: int | None = None
+    ) -> tuple[dict, dict] | None:
+        """
+        Same counts as analysis.Event.get_event_count, over several matches.
+
+        Args:
+        match_ids (Iterable): Match ids
+        team_id (int): Team in possession for the team counts
+        player_id (int): Only count the events of this player
+
+        Returns:
+        tuple: (event_count, opp_event_count), or None if a match is not
+            summarized
+        """
+        df = self.read("event_counts", match_ids)
+        if df is None:
+            return None
+        return count_events(df, team_id, player_id)
+
+    def pass_aggregate(self, match_ids, team_id: int) -> SeasonAggregate | None:
+        """
+        Pass network of a team over several matches, without its shot rows.
+
+        Args:
+        match_ids (Iterable): Match ids
+        team_id (int): Team of the passes
+
+        Returns:
+        SeasonAggregate: Aggregate whose passers_avg_location and
+            passes_between match PassAnalysis, or None if a match is not
+            summarized
+        """
+        match_ids = [str(match_id) for match_id in match_ids]
+        locations = self.read("pass_locations", match_ids)
+        pairs = self.read("pass_pairs", match_ids)
+        if locations is None or pairs is None:
+            return None
+        locations = (
+            locations.loc[locations["team_id"] == team_id]
+            .astype({"player_id": np.int64})
+            .groupby("player_id")[["x_sum", "y_sum", "passes_given", "passes_received"]]
+            .sum()
+        )
+        passers = locations.loc[locations["passes_given"] > 0]
+        received = locations.loc[locations["passes_received"] > 0, "passes_received"]
+        pairs = (
+            pairs.loc[pairs["team_id"] == team_id]
+            .astype({"player_id": np.int64, "pass_recipient_id": np.int64})
+            .groupby(["player_id", "pass_recipient_id"])["pass_count"]
+            .sum()
+        )
+        return SeasonAggregate(
+            team_id=team_id,
+            match_ids=frozenset(match_ids),
+            passers=passers[["x_sum", "y_sum", "passes_given"]].astype(np.float64),
+            received=received.rename_axis("pass_recipient_id").astype(np.int64),
+            pairs=pairs.astype(np.int64),
+        )
+
+    def shot_totals(
+        self, match_ids, team_id: int | None = None, player_id: int | None = None
+    ) -> pd.DataFrame | None:
+        """
+        Shots, goals and xG by team and player over several matches.
+
+        Args:
+        match_ids (Iterable): Match ids
+        team_id (int): Only this team
+        player_id (int): Only this player
+
+        Returns:
+        pd.DataFrame: One row per (team_id, player_id), or None if a match is
+            not summarized
+        """
+        df = self.read("shots", match_ids)
+        if df is None:
+            return None
+        if team_id is not None:
+            df = df.loc[df["team_id"] == team_id]
+        if player_id is not None:
+            df = df.loc[df["player_id"] == player_id]
+        return (
+            df.groupby(["team_id", "player_id"])[["shots", "goals", "xg_sum"]]
+            .sum()
+            .reset_index()
+        )
+
+
+summary_store = SummaryStore()
@@ -0,0 +1,603 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import fastparquet
+import pandas
+from download_data import create_session, download_events_data
+from process_data import merge_data, process_files
+from pydantic import TypeAdapter
+
+from football_analysis.config import cc
+from football_analysis.config.constant import (
+    BAYER_LEVERKUSEN_GAMES_BUNDESLIGA_23_24,
+    DATA_REPOSITORY_URL,
+)
+from football_analysis.io import json as fast_json
+from football_analysis.models import Event, StatsBombEvent
+from football_analysis.models.validation import EVENTS_ADAPTER
+from football_analysis.statsbomb.analysis import (
+    PASS_DF_COLUMNS,
+    PassAnalysis,
+    ShotAnalysis,
+    build_pass_df,
+    read_pass_df,
+)
+from football_analysis.statsbomb.dataset import PARTITION_KEYS, ParquetDataset
+from football_analysis.statsbomb.events import PASS_TYPE_ID
+from football_analysis.statsbomb.manifest import DownloadManifest
+from football_analysis.statsbomb.schema import uuid_strings
+from football_analysis.statsbomb.scrape import AWS, zstandard
+from football_analysis.statsbomb.season import SeasonAnalysis, match_aggregate
+from football_analysis.statsbomb.stream import ijson, iter_events
+
+
+def measure(func, *args, repeat: int = 3, **kwargs):
+    """
+    Time a function and trace the peak memory it allocates.
+
+    Args:
+    func (Callable): Function to measure
+    *args: Positional arguments of func
+    repeat (int): Number of timed runs, the fastest one is reported
+    **kwargs: Keyword arguments of func
+
+    Returns:
+    tuple: (result, best time in seconds, peak traced memory in bytes)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def report(name: str, seconds: float, peak: int, **extra):
+    """Print one benchmark line."""
+    columns = " ".join(f"{key}={value}" for key, value in extra.items())
+    print(f"{name:<28} {seconds * 1000:>10.1f} ms {peak / 2**20:>10.1f} MiB {columns}")
+
+
+def load_season_passes(data_folder: str = "data/events/") -> list:
+    """Read every pass of every match in the events folder."""
+    passes = []
+    for file in sorted(os.listdir(data_folder)):
+        with open(f"{data_folder}{file}", "rb") as f:
+            passes.extend(x for x in fast_json.loads(f.read()) if x["type"]["id"] == 30)
+    return passes
+
+
+def legacy_pass_df(passes: list) -> pandas.DataFrame:
+    """PassAnalysis.get_pass_df as it was before the single-pass builder."""
+    return pandas.DataFrame(
+        {
+            "id": [i["id"] for i in passes],
+            "index": [i["index"] for i in passes],
+            "period": [i["period"] for i in passes],
+            "timestamp": [i["timestamp"] for i in passes],
+            "minute": [i["minute"] for i in passes],
+            "second": [i["second"] for i in passes],
+            "type_name": [i["type"]["name"] for i in passes],
+            "type_id": [i["type"]["id"] for i in passes],
+            "possession": [i["possession"] for i in passes],
+            "possession_team_id": [i["possession_team"]["id"] for i in passes],
+            "possession_team_name": [i["possession_team"]["name"] for i in passes],
+            "play_pattern_id": [i["play_pattern"]["id"] for i in passes],
+            "play_pattern_name": [i["play_pattern"]["name"] for i in passes],
+            "team_id": [i["team"]["id"] for i in passes],
+            "team_name": [i["team"]["name"] for i in passes],
+            "player_id": [i["player"]["id"] for i in passes],
+            "player_name": [i["player"]["name"] for i in passes],
+            "position_id": [i["position"]["id"] for i in passes],
+            "position_name": [i["position"]["name"] for i in passes],
+            "location_x": [i["location"][0] for i in passes],
+            "location_y": [i["location"][1] for i in passes],
+            "duration": [i["duration"] for i in passes],
+            "pass_recipient_id": [
+                i["pass"].get("recipient", {}).get("id", None) for i in passes
+            ],
+            "pass_recipient_name": [
+                i["pass"].get("recipient", {}).get("name", None) for i in passes
+            ],
+            "pass_length": [i["pass"]["length"] for i in passes],
+            "pass_angle": [i["pass"]["angle"] for i in passes],
+            "pass_height_id": [i["pass"]["height"]["id"] for i in passes],
+            "pass_height_name": [i["pass"]["height"]["name"] for i in passes],
+            "pass_end_location_x": [i["pass"]["end_location"][0] for i in passes],
+            "pass_end_location_y": [i["pass"]["end_location"][1] for i in passes],
+            "pass_outcome_id": [
+                i["pass"].get("outcome", {}).get("id", None) for i in passes
+            ],
+            "pass_outcome_name": [
+                i["pass"].get("outcome", {}).get("name", None) for i in passes
+            ],
+        }
+    )
+
+
+def benchmark_pass_df(data_folder: str = "data/events/", repeat: int = 3):
+    """
+    Compare the legacy and columnar pass DataFrame builders on a full season.
+
+    Args:
+    data_folder (str): Local folder to read events from
+    repeat (int): Number of timed runs per builder
+
+    Returns:
+    None
+    """
+    passes = load_season_passes(data_folder)
+    print(f"Building pass DataFrames from {len(passes)} passes")
+    for name, builder in [("legacy", legacy_pass_df), ("columnar", build_pass_df)]:
+        df, seconds, peak = measure(builder, passes, repeat=repeat)
+        frame_mib = df.memory_usage(deep=True).sum() / 2**20
+        report(name, seconds, peak, frame_mib=f"{frame_mib:.1f}")
+
+
+def benchmark_storage(objects: int = 50, repeat: int = 3):
+    """
+    Compare per-object upload overhead of the storage handle strategies.
+
+    Runs against the bucket configured in CentralConfig (e.g. the MinIO of
+    docker-compose).
+
+    Args:
+    objects (int): Number of small objects uploaded per strategy
+    repeat (int): Number of timed runs per strategy
+
+    Returns:
+    None
+    """
+    payload = {"events": list(range(1000))}
+    items = [(payload, "benchmark", f"object_{i}") for i in range(objects)]
+
+    def new_handle_per_object():
+        for data, path, file_name in items:
+            AWS().save_to_json(data, path, file_name)
+
+    shared = AWS()
+
+    def shared_handle():
+        for data, path, file_name in items:
+            shared.save_to_json(data, path, file_name)
+
+    def shared_handle_save_many():
+        shared.save_many(items)
+
+    print(f"Uploading {objects} objects per run")
+    for name, upload in [
+        ("AWS() per object", new_handle_per_object),
+        ("shared AWS", shared_handle),
+        ("shared AWS save_many", shared_handle_save_many),
+    ]:
+        _, seconds, peak = measure(upload, repeat=repeat)
+        report(name, seconds, peak, per_object_ms=f"{seconds / objects * 1000:.2f}")
+
+
+def peak_rss() -> int:
+    """Peak resident set size of the current process in bytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _upload_events(
+    game_ids: list, data_repository_url: str, pass_through: bool, compression
+) -> tuple:
+    """Upload the events of every game and return (seconds, RSS growth)."""
+    aws = AWS()
+    # An empty manifest, so that every file is uploaded
+    manifest_folder = tempfile.TemporaryDirectory()
+    manifest = DownloadManifest(os.path.join(manifest_folder.name, "manifest.json"))
+    baseline = peak_rss()
+    start = time.perf_counter()
+    with create_session() as session, contextlib.redirect_stdout(io.StringIO()):
+        download_events_data(
+            game_ids,
+            data_repository_url,
+            session=session,
+            aws=aws,
+            manifest=manifest,
+            pass_through=pass_through,
+            compression=compression,
+        )
+    return time.perf_counter() - start, peak_rss() - baseline
+
+
+def benchmark_upload(
+    game_ids: list = BAYER_LEVERKUSEN_GAMES_BUNDESLIGA_23_24,
+    data_repository_url: str = DATA_REPOSITORY_URL,
+    repeat: int = 3,
+):
+    """
+    Compare the peak memory of decoding uploads and pass-through uploads.
+
+    Every run happens in a fresh process, since the peak RSS of a process
+    never goes down.
+
+    Args:
+    game_ids (list): List of game ids
+    data_repository_url (str): URL to download data from
+    repeat (int): Number of runs per mode
+
+    Returns:
+    None
+    """
+    modes = [
+        ("decode + json.dumps", False, None),
+        ("pass-through", True, None),
+        ("pass-through gzip", True, "gzip"),
+    ]
+    if zstandard is not None:
+        modes.append(("pass-through zstd", True, "zstd"))
+
+    print(f"Uploading the events of {len(game_ids)} games")
+    context = multiprocessing.get_context("spawn")
+    for name, pass_through, compression in modes:
+        best, rss = float("inf"), 0
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                seconds, growth = executor.submit(
+                    _upload_events,
+                    game_ids,
+                    data_repository_url,
+                    pass_through,
+                    compression,
+                ).result()
+            best, rss = min(best, seconds), max(rss, growth)
+        report(name, best, rss)
+
+
+def benchmark_process(data_folder: str = "data/events/", repeat: int = 3):
+    """
+    Measure how processing event files into parquet scales with worker processes.
+
+    Point ``data_folder`` at a folder holding several seasons of matches to get
+    enough files per worker.
+
+    Args:
+    data_folder (str): Local folder to read events from
+    repeat (int): Number of timed runs per worker count
+
+    Returns:
+    None
+    """
+    workers = [1]
+    while workers[-1] * 2 <= os.cpu_count():
+        workers.append(workers[-1] * 2)
+    if workers[-1] != os.cpu_count():
+        workers.append(os.cpu_count())
+
+    print(f"Processing {len(os.listdir(data_folder))} event files")
+    with tempfile.TemporaryDirectory() as folder:
+        output_folder = os.path.join(folder, "events")
+        baseline = None
+        for count in workers:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    process_files(data_folder, output_folder, count)
+                best = min(best, time.perf_counter() - start)
+            baseline = baseline or best
+            print(f"{count:>3} workers {best * 1000:>10.1f} ms {baseline / best:.2f}x")
+
+
+def benchmark_dataset(dataset_folder: str = cc.EVENTS_DATASET_PATH, repeat: int = 3):
+    """
+    Compare loading one match from the partitioned dataset and a monolithic file.
+
+    The monolithic file (one file for every match, as process_data used to
+    write) is built from the dataset in a temporary folder.
+
+    Args:
+    dataset_folder (str): Root of the events dataset written by process_data
+    repeat (int): Number of timed runs per read
+
+    Returns:
+    None
+    """
+    dataset = ParquetDataset(dataset_folder)
+    events = dataset.read()
+    match_id = events["match_id"].iloc[0]
+    team_id = int(events.loc[events["match_id"] == match_id, "team_id"].iloc[0])
+    pass_columns = list(PASS_DF_COLUMNS.values())
+
+    with tempfile.TemporaryDirectory() as folder:
+        monolithic = os.path.join(folder, "all_matches_events.parquet")
+        events["match_id"] = events["match_id"].astype(int)
+        fastparquet.write(monolithic, events)
+        matches = events["match_id"].nunique()
+        del events
+
+        def monolithic_match():
+            df = fastparquet.ParquetFile(monolithic).to_pandas()
+            return df.loc[df["match_id"] == int(match_id)]
+
+        def monolithic_passes():
+            df = fastparquet.ParquetFile(monolithic).to_pandas(
+                columns=[*pass_columns, "match_id"]
+            )
+            return df.loc[
+                (df["match_id"] == int(match_id))
+                & (df["type_id"] == PASS_TYPE_ID)
+                & (df["team_id"] == team_id)
+            ]
+
+        print(f"Loading match {match_id} out of {matches} matches")
+        for name, read in [
+            ("monolithic match", monolithic_match),
+            ("dataset match", lambda: dataset.read_match(match_id)),
+            ("monolithic passes", monolithic_passes),
+            ("dataset passes", lambda: read_pass_df(match_id, team_id)),
+        ]:
+            df, seconds, peak = measure(read, repeat=repeat)
+            report(name, seconds, peak, rows=len(df))
+
+
+def _merge(output_folder: str, streaming: bool) -> tuple:
+    """Merge events and three sixty data and return (seconds, RSS growth)."""
+    baseline = peak_rss()
+    start = time.perf_counter()
+    if streaming:
+        with contextlib.redirect_stdout(io.StringIO()):
+            merge_data(output_folder)
+    else:
+        # merge_data before per-match merging: both datasets in memory and
+        # UUIDs joined as strings
+        events = ParquetDataset(f"{output_folder}events").read()
+        events_360 = ParquetDataset(f"{output_folder}three-sixty").read()
+        events_360["event_uuid"] = uuid_strings(events_360["event_uuid"])
+        merged_data = events.merge(
+            events_360,
+            how="left",
+            left_on=[*PARTITION_KEYS, "id"],
+            right_on=[*PARTITION_KEYS, "event_uuid"],
+            suffixes=("_events", "_360"),
+        )
+        fastparquet.write(f"{output_folder}all_matches_merged.parquet", merged_data)
+    return time.perf_counter() - start, peak_rss() - baseline
+
+
+def benchmark_merge(output_folder: str = "data/processed/", repeat: int = 3):
+    """
+    Compare the peak memory of merging whole datasets and merging per match.
+
+    Runs on the events and three-sixty datasets written by process_data; the
+    merged partitions are written to a temporary folder. Every run happens in
+    a fresh process, since the peak RSS of a process never goes down.
+
+    Args:
+    output_folder (str): Folder of the processed datasets
+    repeat (int): Number of runs per strategy
+
+    Returns:
+    None
+    """
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as folder:
+        for dataset in ("events", "three-sixty"):
+            os.symlink(
+                os.path.abspath(f"{output_folder}{dataset}"),
+                os.path.join(folder, dataset),
+            )
+
+        print(f"Merging {len(glob.glob(f'{folder}/events/*/*/*'))} matches")
+        for name, streaming in [("whole datasets", False), ("per match", True)]:
+            best, rss = float("inf"), 0
+            for _ in range(repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    seconds, growth = executor.submit(
+                        _merge, f"{folder}/", streaming
+                    ).result()
+                best, rss = min(best, seconds), max(rss, growth)
+            report(name, best, rss)
+
+
+def _read_events(data_folder: str, streaming: bool) -> tuple:
+    """Decode every event of a folder and return (events, seconds, RSS growth)."""
+    baseline = peak_rss()
+    start = time.perf_counter()
+    events = 0
+    for file in sorted(os.listdir(data_folder)):
+        if streaming:
+            events += sum(1 for _ in iter_events(f"{data_folder}{file}"))
+        else:
+            with open(f"{data_folder}{file}") as f:
+                events += len(json.load(f))
+    return events, time.perf_counter() - start, peak_rss() - baseline
+
+
+def benchmark_stream(data_folder: str = "data/three-sixty/", repeat: int = 3):
+    """
+    Compare the throughput and peak memory of json.load and iter_events.
+
+    Every run happens in a fresh process, since the peak RSS of a process
+    never goes down.
+
+    Args:
+    data_folder (str): Local folder to read events (or three sixty frames) from
+    repeat (int): Number of runs per reader
+
+    Returns:
+    None
+    """
+    backend = "ijson" if ijson is not None else "stdlib"
+    print(f"Reading {len(os.listdir(data_folder))} files of {data_folder}")
+    context = multiprocessing.get_context("spawn")
+    for name, streaming in [("json.load", False), (f"iter_events {backend}", True)]:
+        best, rss = float("inf"), 0
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                events, seconds, growth = executor.submit(
+                    _read_events, data_folder, streaming
+                ).result()
+            best, rss = min(best, seconds), max(rss, growth)
+        report(name, best, rss, events_per_second=f"{events / best:,.0f}")
+
+
+def benchmark_json(data_folder: str = "data/events/", repeat: int = 3):
+    """
+    Compare the parse time and memory of the JSON backends on a season of events.
+
+    Args:
+    data_folder (str): Local folder to read events from
+    repeat (int): Number of timed runs per backend
+
+    Returns:
+    None
+    """
+    raws = []
+    for file in sorted(os.listdir(data_folder)):
+        with open(f"{data_folder}{file}", "rb") as f:
+            raws.append(f.read())
+    events = sum(len(json.loads(raw)) for raw in raws)
+
+    decoders = [
+        (backend.name, backend.loads) for backend in fast_json.BACKENDS.values()
+    ]
+    # Typed events: msgspec structs if installed, else pydantic models
+    typed = "msgspec structs" if fast_json.msgspec is not None else "pydantic models"
+    decoders.append((typed, fast_json.decode_events))
+    if fast_json.msgspec is not None:
+        decoders.append(("pydantic models", EVENTS_ADAPTER.validate_json))
+
+    print(f"Decoding {events} events from {len(raws)} files")
+    for name, decode in decoders:
+        _, seconds, peak = measure(
+            lambda: [decode(raw) for raw in raws], repeat=repeat  # noqa: B023
+        )
+        report(name, seconds, peak, events_per_second=f"{events / seconds:,.0f}")
+
+    data = [json.loads(raw) for raw in raws]
+    for backend in fast_json.BACKENDS.values():
+        _, seconds, peak = measure(
+            lambda: [backend.dumps(x) for x in data], repeat=repeat  # noqa: B023
+        )
+        report(f"{backend.name} dumps", seconds, peak)
+
+
+def benchmark_validation(data_folder: str = "data/events/", repeat: int = 3):
+    """
+    Compare the validation throughput of the flat and tagged-union event models.
+
+    Args:
+    data_folder (str): Local folder to read events from
+    repeat (int): Number of timed runs per model
+
+    Returns:
+    None
+    """
+    raws = []
+    for file in sorted(os.listdir(data_folder)):
+        with open(f"{data_folder}{file}", "rb") as f:
+            raws.append(f.read())
+    events = sum(len(json.loads(raw)) for raw in raws)
+
+    print(f"Validating {events} events from {len(raws)} files")
+    for name, model in [
+        ("flat StatsBombEvent", StatsBombEvent),
+        ("tagged Event", Event),
+    ]:
+        adapter = TypeAdapter(list[model])
+        _, seconds, peak = measure(
+            lambda: [adapter.validate_json(raw) for raw in raws],  # noqa: B023
+            repeat=repeat,
+        )
+        report(name, seconds, peak, events_per_second=f"{events / seconds:,.0f}")
+
+
+def benchmark_season(dataset_folder: str = cc.EVENTS_DATASET_PATH, repeat: int = 3):
+    """
+    Compare per-match analyses with SeasonAnalysis over every match of a team.
+
+    Args:
+    dataset_folder (str): Root of the events dataset written by process_data
+    repeat (int): Number of timed runs per approach
+
+    Returns:
+    None
+    """
+    events = ParquetDataset(dataset_folder).read(columns=["team_id", "match_id"])
+    team_id = int(events["team_id"].value_counts().index[0])
+    match_ids = sorted(
+        map(str, events.loc[events["team_id"] == team_id, "match_id"].unique())
+    )
+    del events
+    workers = min(os.cpu_count() or 1, len(match_ids))
+
+    def per_match():
+        return [(PassAnalysis(m, team_id), ShotAnalysis(m, team_id)) for m in match_ids]
+
+    print(f"Analysing {len(match_ids)} matches of team {team_id}")
+    for name, analyse in [
+        ("per-match analyses", per_match),
+        (
+            "season, 1 worker",
+            lambda: SeasonAnalysis(match_ids, team_id, dataset_root=dataset_folder),
+        ),
+        (
+            f"season, {workers} workers",
+            lambda: SeasonAnalysis(
+                match_ids, team_id, workers=workers, dataset_root=dataset_folder
+            ),
+        ),
+    ]:
+        _, seconds, peak = measure(analyse, repeat=repeat)
+        report(name, seconds, peak)
+
+    # Adding one match to an existing aggregate only reads that match
+    season = SeasonAnalysis(match_ids[:-1], team_id, dataset_root=dataset_folder)
+    _, seconds, peak = measure(
+        lambda: season.aggregate.merge(
+            match_aggregate(match_ids[-1], team_id, dataset_root=dataset_folder)
+        ),
+        repeat=repeat,
+    )
+    report("merge one more match", seconds, peak)
+
+
+BENCHMARKS = {
+    "dataset": benchmark_dataset,
+    "json": benchmark_json,
+    "merge": benchmark_merge,
+    "pass-df": benchmark_pass_df,
+    "process": benchmark_process,
+    "season": benchmark_season,
+    "storage": benchmark_storage,
+    "stream": benchmark_stream,
+    "upload": benchmark_upload,
+    "validation": benchmark_validation,
+}
+
+
+def main():
+    """
+    Run one of the performance benchmarks against the local data folder.
+
+    Returns:
+    None
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__.strip().splitlines()[0])
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
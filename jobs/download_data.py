@@ -1,133 +1,413 @@
-import json
+import argparse
+import contextlib
+import hashlib
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from football_analysis.config import cc
 from football_analysis.config.constant import (
     BAYER_LEVERKUSEN_GAMES_BUNDESLIGA_23_24,
     DATA_REPOSITORY_URL,
+    DOWNLOAD_CONCURRENCY,
+    DOWNLOAD_RETRIES,
+    DOWNLOAD_TIMEOUT,
+)
+from football_analysis.io import json
+from football_analysis.statsbomb.manifest import DownloadManifest
+from football_analysis.statsbomb.scrape import (
+    AWS,
+    COMPRESSION_SUFFIXES,
+    HashingStream,
+    get_aws,
 )
-from football_analysis.statsbomb.scrape import AWS
 
 
-def download_events_data(
-    game_ids: list, data_repository_url: str, local_data_folder: str = "data/events/"
+def create_session(
+    concurrency: int = DOWNLOAD_CONCURRENCY, retries: int = DOWNLOAD_RETRIES
+) -> requests.Session:
+    """
+    Create an HTTP session shared by all download threads.
+
+    The connection pool holds one connection per thread, and failed requests
+    (connection errors, 429 and 5xx responses) are retried with exponential
+    backoff.
+
+    Args:
+    concurrency (int): Number of concurrent downloads
+    retries (int): Number of retries per request
+
+    Returns:
+    requests.Session: Pooled session
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=concurrency, pool_maxsize=concurrency, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@contextlib.contextmanager
+def shared_session(
+    session: requests.Session | None = None, concurrency: int = DOWNLOAD_CONCURRENCY
+):
+    """Yield the given session, or a new one that is closed on exit."""
+    if session is not None:
+        yield session
+        return
+    with create_session(concurrency) as session:
+        yield session
+
+
+def sync_json(
+    session: requests.Session,
+    aws: AWS,
+    manifest: DownloadManifest,
+    url: str,
+    path: str,
+    file_name: str,
+    pass_through: bool = False,
+    compression: str | None = None,
+    resume: bool = False,
+    timeout: float = DOWNLOAD_TIMEOUT,
 ):
     """
-    Download events data from StatsBomb repository
+    Bring one object of the bucket up to date with the repository.
+
+    Objects recorded in the manifest that are still in the bucket are
+    requested conditionally, so an unchanged file costs a 304 response. With
+    ``resume``, recorded objects are skipped without any request.
+
+    Args:
+    session (requests.Session): Shared session
+    aws (AWS): Storage handle
+    manifest (DownloadManifest): Record of the objects already in the bucket
+    url (str): File URL
+    path (str): Folder of the object
+    file_name (str): Object name, without extension
+    pass_through (bool): Stream the raw file to the bucket without decoding it
+    compression (str): None, "gzip" or "zstd" (pass-through only)
+    resume (bool): Trust the manifest and skip the objects it records
+    timeout (float): Connect/read timeout in seconds
+
+    Returns:
+    tuple: (status, object key, time in seconds), status being "resumed",
+    "not modified", "unchanged" (decoding mode only) or "saved"
+    """
+    start = time.perf_counter()
+    suffix = COMPRESSION_SUFFIXES[compression if pass_through else None]
+    key = f"{path}/{file_name}.json{suffix}"
+
+    entry = manifest.get(key)
+    if entry and resume:
+        return "resumed", key, time.perf_counter() - start
+    in_bucket = entry is not None and aws.object_etag(key) == entry["object_etag"]
+    headers = manifest.conditional_headers(key) if in_bucket else {}
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as resp:
+        if resp.status_code == 304:
+            return "not modified", key, time.perf_counter() - start
+        resp.raise_for_status()
+
+        if pass_through:
+            # Undo any HTTP content encoding, the bucket stores plain JSON bytes
+            resp.raw.decode_content = True
+            body = HashingStream(resp.raw)
+            # The hash is only known once the stream is uploaded
+            aws.upload_stream(body, path, file_name, compression)
+            sha256, size, status = body.sha256, body.size, "saved"
+        else:
+            content = resp.content
+            sha256, size = hashlib.sha256(content).hexdigest(), len(content)
+            # Changed ETag but same bytes: the object in the bucket is up to date
+            if in_bucket and sha256 == entry["sha256"]:
+                status = "unchanged"
+            else:
+                aws.save_to_json(json.loads(content), path, file_name)
+                status = "saved"
+
+        manifest.record(
+            key,
+            url=url,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            sha256=sha256,
+            size=size,
+            object_etag=aws.object_etag(key),
+        )
+    return status, key, time.perf_counter() - start
+
+
+def sync_many(
+    session: requests.Session,
+    aws: AWS,
+    manifest: DownloadManifest,
+    gh_folder: str,
+    game_ids: list,
+    data_repository_url: str,
+    concurrency: int = DOWNLOAD_CONCURRENCY,
+    **options,
+):
+    """
+    Bring one object per game up to date concurrently.
 
     Args:
+    session (requests.Session): Shared session
+    aws (AWS): Storage handle
+    manifest (DownloadManifest): Record of the objects already in the bucket
+    gh_folder (str): Folder of the StatsBomb repository (events, three-sixty, ...)
     game_ids (list): List of game ids
     data_repository_url (str): URL to download data from
-    local_data_folder (str): Local folder to save data
+    concurrency (int): Number of concurrent transfers
+    options: pass_through, compression and resume, see sync_json
 
     Returns:
-    None
+    Iterator[tuple]: (game_id, status, object key, time in seconds)
     """
-    for game_id in game_ids:
-        print(f"Downloading {game_id=}")
-        gh_folder = "events"
-        resp = requests.get(data_repository_url.format(gh_folder, game_id))
-        data = json.loads(resp.text)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(
+                sync_json,
+                session,
+                aws,
+                manifest,
+                data_repository_url.format(gh_folder, game_id),
+                gh_folder,
+                game_id,
+                **options,
+            ): game_id
+            for game_id in game_ids
+        }
+        for future in as_completed(futures):
+            yield futures[future], *future.result()
 
-        # Save as json file in data folder
-        file_path = f"{local_data_folder}{game_id}.json"
 
-        # with open(file_path, 'w') as f:
-        #     json.dump(data, f)
+def download_events_data(
+    game_ids: list,
+    data_repository_url: str,
+    session: requests.Session | None = None,
+    concurrency: int = DOWNLOAD_CONCURRENCY,
+    aws: AWS | None = None,
+    manifest: DownloadManifest | None = None,
+    **options,
+) -> Counter:
+    """
+    Download events data from StatsBomb repository
 
-        print(f"Saved {game_id=}")
+    Args:
+    game_ids (list): List of game ids
+    data_repository_url (str): URL to download data from
+    session (requests.Session): Shared session (created if not given)
+    concurrency (int): Number of concurrent downloads
+    aws (AWS): Storage handle (the shared one if not given)
+    manifest (DownloadManifest): Record of the objects already in the bucket
+    options: pass_through, compression and resume, see sync_json
 
-        # Save to aws/minio
-        aws = AWS()
-        aws.save_to_json(data, gh_folder, game_id)
+    Returns:
+    Counter: Number of files per status
+    """
+    statuses = Counter()
+    with shared_session(session, concurrency) as session:
+        for game_id, status, key, seconds in sync_many(
+            session,
+            aws or get_aws(),
+            manifest or DownloadManifest(),
+            "events",
+            game_ids,
+            data_repository_url,
+            concurrency,
+            **options,
+        ):
+            print(f"{status.capitalize()} {game_id=} ({key}) in {seconds:.2f}s")
+            statuses[status] += 1
+    return statuses
 
 
 def download_match_metadata(
-    data_repository_url: str, file_path: str = "data/matches/9/281.json"
-):
+    data_repository_url: str,
+    session: requests.Session | None = None,
+    aws: AWS | None = None,
+    manifest: DownloadManifest | None = None,
+    **options,
+) -> Counter:
     """
     Download match metadata from StatsBomb repository.
 
     Args:
     data_repository_url (str): URL to download data from
-    file_path (str): Local file path to save data
+    session (requests.Session): Shared session (created if not given)
+    aws (AWS): Storage handle (the shared one if not given)
+    manifest (DownloadManifest): Record of the objects already in the bucket
+    options: pass_through, compression and resume, see sync_json
 
     Returns:
-    None
+    Counter: Number of files per status
     """
-    ##  Downloading match metadata
-    matches_metadata = requests.get(data_repository_url.format("matches/9", "281"))
-
-    matches_metadata = json.loads(matches_metadata.text)
-
-    # Save as json file in data folder
-    # with open(file_path, 'w') as f:
-    #     json.dump(matches_metadata, f)
-
-    print(f"Saved {file_path}")
-
-    # Save to aws/minio
-    aws = AWS()
-    aws.save_to_json(matches_metadata, "matches/9", "281")
+    with shared_session(session, 1) as session:
+        status, key, seconds = sync_json(
+            session,
+            aws or get_aws(),
+            manifest or DownloadManifest(),
+            data_repository_url.format("matches/9", "281"),
+            "matches/9",
+            "281",
+            **options,
+        )
+    print(f"{status.capitalize()} matches/9/281 ({key}) in {seconds:.2f}s")
+    return Counter([status])
 
 
 def download_three_sixty_data(
     game_ids: list,
     data_repository_url: str,
-    local_data_folder: str = "data/three-sixty/",
-):
+    session: requests.Session | None = None,
+    concurrency: int = DOWNLOAD_CONCURRENCY,
+    aws: AWS | None = None,
+    manifest: DownloadManifest | None = None,
+    **options,
+) -> Counter:
     """
     Download three sixty data from StatsBomb repository.
 
     Args:
     game_ids (list): List of game ids
     data_repository_url (str): URL to download data from
-    local_data_folder (str): Local folder to save data
+    session (requests.Session): Shared session (created if not given)
+    concurrency (int): Number of concurrent downloads
+    aws (AWS): Storage handle (the shared one if not given)
+    manifest (DownloadManifest): Record of the objects already in the bucket
+    options: pass_through, compression and resume, see sync_json
 
     Returns:
-    None
+    Counter: Number of files per status
     """
-    for game_id in game_ids:
-        response = requests.get(data_repository_url.format("three-sixty", game_id))
-        data = json.loads(response.text)
-
-        # Save as json file in data folder
-        file_path = f"{local_data_folder}{game_id}.json"
-
-        # with open(file_path, 'w') as f:
-        #     json.dump(data, f)
-
-        print(f"Saved {file_path}")
-
-        # Save to aws/minio
-        aws = AWS()
-        aws.save_to_json(data, "three-sixty", game_id)
+    statuses = Counter()
+    with shared_session(session, concurrency) as session:
+        for game_id, status, key, seconds in sync_many(
+            session,
+            aws or get_aws(),
+            manifest or DownloadManifest(),
+            "three-sixty",
+            game_ids,
+            data_repository_url,
+            concurrency,
+            **options,
+        ):
+            print(
+                f"{status.capitalize()} three-sixty {game_id=} ({key})"
+                f" in {seconds:.2f}s"
+            )
+            statuses[status] += 1
+    return statuses
 
 
 def main(
     game_ids: list,
     data_repository_url: str,
+    concurrency: int = DOWNLOAD_CONCURRENCY,
+    retries: int = DOWNLOAD_RETRIES,
+    manifest_path: str = cc.DOWNLOAD_MANIFEST_PATH,
+    **options,
 ):
     """
     Main function to download data from StatsBomb repository.
 
+    Only files that changed upstream, or are missing from the bucket, are
+    uploaded again.
+
     Args:
     game_ids (list): List of game ids
     data_repository_url (str): URL to download data from
+    concurrency (int): Number of concurrent downloads
+    retries (int): Number of retries per request
+    manifest_path (str): JSON file recording what is already in the bucket
+    options: pass_through, compression and resume, see sync_json
 
     Returns:
     None
     """
-    download_events_data(game_ids=game_ids, data_repository_url=data_repository_url)
-    download_match_metadata(data_repository_url=data_repository_url)
-    download_three_sixty_data(
-        game_ids=game_ids, data_repository_url=data_repository_url
-    )
+    start = time.perf_counter()
+    aws = get_aws()
+    manifest = DownloadManifest(manifest_path)
+    with create_session(concurrency, retries) as session:
+        statuses = download_events_data(
+            game_ids=game_ids,
+            data_repository_url=data_repository_url,
+            session=session,
+            concurrency=concurrency,
+            aws=aws,
+            manifest=manifest,
+            **options,
+        )
+        statuses += download_match_metadata(
+            data_repository_url=data_repository_url,
+            session=session,
+            aws=aws,
+            manifest=manifest,
+            **options,
+        )
+        statuses += download_three_sixty_data(
+            game_ids=game_ids,
+            data_repository_url=data_repository_url,
+            session=session,
+            concurrency=concurrency,
+            aws=aws,
+            manifest=manifest,
+            **options,
+        )
+    summary = ", ".join(f"{count} {status}" for status, count in statuses.items())
+    print(f"Synced everything ({summary}) in {time.perf_counter() - start:.1f}s")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download StatsBomb open data.")
+    parser.add_argument("--concurrency", type=int, default=DOWNLOAD_CONCURRENCY)
+    parser.add_argument("--retries", type=int, default=DOWNLOAD_RETRIES)
+    parser.add_argument(
+        "--data-repository-url",
+        default=DATA_REPOSITORY_URL,
+        help="URL template with two {} for folder and file name",
+    )
+    parser.add_argument(
+        "--pass-through",
+        action="store_true",
+        help="Stream the raw files to the bucket without decoding them",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["gzip", "zstd"],
+        default=None,
+        help="Compress pass-through uploads on the fly",
+    )
+    parser.add_argument("--manifest", default=cc.DOWNLOAD_MANIFEST_PATH)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip the files recorded in the manifest without checking upstream",
+    )
+    args = parser.parse_args()
+    if args.compression and not args.pass_through:
+        parser.error("--compression requires --pass-through")
 
     main(
         game_ids=BAYER_LEVERKUSEN_GAMES_BUNDESLIGA_23_24[:],
-        data_repository_url=DATA_REPOSITORY_URL,
+        data_repository_url=args.data_repository_url,
+        concurrency=args.concurrency,
+        retries=args.retries,
+        manifest_path=args.manifest,
+        resume=args.resume,
+        pass_through=args.pass_through,
+        compression=args.compression,
     )
@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from plotly.utils import PlotlyJSONEncoder
+
+# The figure builders live next to the dashboard in app/
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+from callback_cache import MatchVersions
+from figures import (
+    match_scoreboard,
+    pass_network_figure,
+    player_passes_figure,
+    radar_chart_figure,
+    shot_bubble_figure,
+    shot_chart_figure,
+)
+
+from football_analysis.config import cc
+from football_analysis.config.constant import (
+    BAYER_LEVERKUSEN_TEAM_ID,
+    BUNDESLIGA_COMPETITION_ID,
+    SEASON_2023_24_ID,
+)
+from football_analysis.statsbomb.figure_store import FigureStore
+from football_analysis.statsbomb.metadata import match_index
+
+PLAYER_FIGURES = {
+    "player_passes": player_passes_figure,
+    "shot_chart": shot_chart_figure,
+    "radar_chart": radar_chart_figure,
+    "shot_bubble": shot_bubble_figure,
+}
+
+
+def save(store: FigureStore, figure) -> str:
+    """Serialize a figure the way Dash would and save it in the store."""
+    return store.put(json.dumps(figure, cls=PlotlyJSONEncoder).encode())
+
+
+def precompute_game(
+    game_id: str, store_root: str = cc.FIGURE_STORE_PATH
+) -> tuple[str, dict]:
+    """
+    Precompute every figure of a game, for the whole team and for each player.
+
+    Args:
+    game_id (str): Game id
+    store_root (str): Folder of the figure store
+
+    Returns:
+    tuple: (version of the game data, store key -> digest of every figure),
+    or (None, {}) if the data changed while the figures were built
+    """
+    store = FigureStore(store_root)
+    entries = {}
+    # jobs/process_data.py writes the ledger after its outputs, so a version
+    # read first is never newer than the data the figures are built from
+    versions = MatchVersions()
+    version = versions.get(game_id)
+
+    figure, player_options = pass_network_figure(game_id)
+    entries[store.key("pass_network", game_id)] = save(store, [figure, player_options])
+    entries[store.key("match_info", game_id)] = save(store, match_scoreboard(game_id))
+
+    # None is the dashboard state before a player is selected
+    for player_id in [None] + [option["value"] for option in player_options]:
+        for name, build_figure in PLAYER_FIGURES.items():
+            entries[store.key(name, game_id, player_id)] = save(
+                store, build_figure(game_id, player_id)
+            )
+    if versions.get(game_id) != version:
+        # Reprocessed meanwhile: the figures may mix both versions of the data
+        return None, {}
+    return version, entries
+
+
+def main(
+    game_ids: list, store_root: str = cc.FIGURE_STORE_PATH, workers: int | None = None
+):
+    """
+    Precompute all dashboard figures in parallel and write the store index.
+
+    Args:
+    game_ids (list): List of game ids
+    store_root (str): Folder of the figure store
+    workers (int): Number of worker processes (default: CPU count)
+
+    Returns:
+    None
+    """
+    start = time.perf_counter()
+    entries, versions = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(precompute_game, game_id, store_root): game_id
+            for game_id in game_ids
+        }
+        for future in as_completed(futures):
+            game_id = futures[future]
+            version, game_entries = future.result()
+            if version is None:
+                print(f"Skipped {game_id}, its data changed while precomputing")
+                continue
+            versions[str(game_id)] = version
+            entries.update(game_entries)
+            print(f"Precomputed {len(game_entries)} figures for {game_id}")
+
+    FigureStore(store_root).write_index(entries, versions)
+    print(
+        f"Saved {len(entries)} figures ({len(set(entries.values()))} unique)"
+        f" to {store_root} in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute dashboard figures.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=cc.FIGURE_STORE_PATH)
+    args = parser.parse_args()
+
+    game_ids = list(
+        match_index.titles(
+            BUNDESLIGA_COMPETITION_ID, SEASON_2023_24_ID, BAYER_LEVERKUSEN_TEAM_ID
+        )
+    )
+    main(game_ids=game_ids, store_root=args.output, workers=args.workers)
@@ -1,158 +1,525 @@
-import json
+import argparse
+import glob
 import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
+import fastparquet
 import pandas
 
-from football_analysis.models import StatsBombEvent
-
-
-def process_data(
-    data_folder: str = "data/events/", output_folder: str = "data/processed/"
-):
+from football_analysis.config import cc
+from football_analysis.models import ValidationReport, validate_batch
+from football_analysis.statsbomb.dataset import (
+    match_seasons,
+    partition_path,
+    replace_partition,
+    write_batches,
+    write_partition,
+)
+from football_analysis.statsbomb.ledger import ProcessingLedger
+from football_analysis.statsbomb.schema import (
+    flatten_events,
+    flatten_three_sixty,
+    uuid_keys,
+    uuid_words,
+)
+from football_analysis.statsbomb.stream import (
+    STREAM_BATCH_SIZE,
+    batched,
+    iter_events,
+)
+from football_analysis.statsbomb.summary import (
+    SUMMARY_COLUMNS,
+    SUMMARY_TABLES,
+    summarize_match,
+)
+
+# Columns of the three sixty files, for matches without three sixty data
+THREE_SIXTY_COLUMNS = ["event_uuid", "visible_area", "freeze_frame"]
+
+
+def process_file(
+    data_folder: str,
+    file: str,
+    staging_folder: str,
+    seasons: dict,
+    validate: bool = False,
+    sample: float = 1.0,
+    to_frame=pandas.DataFrame,
+    type_row_groups: bool = False,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> tuple:
     """
-    Process data from StatsBomb repository.
+    Read one match file and save it as a partition of the staging dataset.
+
+    The file is streamed: only one batch of decoded events is held in memory
+    at a time, plus the flattened rows of one row group, or of the whole match
+    when it is sorted into type row groups (see write_batches).
 
     Args:
     data_folder (str): Local folder to read data from
-    output_folder (str): Local folder to save data
+    file (str): File name
+    staging_folder (str): Root of the dataset to write the partition in
+    seasons (dict): match_id -> (competition_id, season_id), see match_seasons
+    validate (bool): Validate the events with pydantic
+    sample (float): Share of the events to validate, between 0 and 1
+    to_frame (Callable): Builds the DataFrame of a batch of decoded events
+    type_row_groups (bool): Write one row group per event type
+    batch_size (int): Number of events decoded at a time
 
     Returns:
-    None
+    tuple: (partition folder relative to the dataset root, ValidationReport or
+    None)
+    """
+    match_id = file.replace(".json", "")
+    if match_id not in seasons:
+        raise ValueError(f"Match {match_id} is not in the matches metadata")
+
+    report = ValidationReport() if validate else None
+
+    def frames():
+        # Events are decoded, validated and flattened one batch at a time
+        offset = 0
+        for batch in batched(iter_events(f"{data_folder}{file}"), batch_size):
+            if report is not None:
+                report.merge(validate_batch(batch, file, offset, sample))
+            offset += len(batch)
+            yield to_frame(batch)
+        if not offset:
+            yield to_frame([])
+
+    # The match is identified by the partition folder
+    partition = partition_path("", *seasons[match_id], match_id)
+    write_batches(frames(), os.path.join(staging_folder, partition), type_row_groups)
+    return partition, report
+
+
+def process_files(
+    data_folder: str,
+    output_folder: str,
+    workers: int = 1,
+    validate: bool = False,
+    sample: float = 1.0,
+    to_frame=pandas.DataFrame,
+    type_row_groups: bool = False,
+    matches_folder: str = "data/matches/",
+    ledger: ProcessingLedger | None = None,
+    full: bool = False,
+) -> set:
     """
-    # Create output folder if it does not exist
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+    Convert the match files of a folder into a partitioned parquet dataset.
+
+    Each match is written to its own
+    ``competition_id=/season_id=/match_id=`` partition, in parallel with a
+    process pool when ``workers`` > 1. Partitions are staged next to the
+    dataset and only moved in place once every file is converted. Validation
+    errors of all files are reported together, and nothing is written if
+    there are any.
 
-    # Get list of files in data folder
-    files = os.listdir(data_folder)
-    print(f"Processing {len(files)} event files")
+    With a ledger, files already processed with the same content and options
+    are skipped (unless ``full``), and the partitions of files removed from
+    the folder are deleted. The ledger entries are only staged; the caller
+    commits them once the outputs derived from the partitions are rebuilt.
 
-    match_dfs = []
-    for file in files[:]:
-        # Read json file
-        with open(f"{data_folder}{file}") as f:
-            data = json.load(f)
+    Args:
+    data_folder (str): Local folder to read data from
+    output_folder (str): Root of the dataset to write
+    workers (int): Number of worker processes
+    validate (bool): Validate the events with pydantic
+    sample (float): Share of the events to validate, between 0 and 1
+    to_frame (Callable): Builds the DataFrame of a decoded file
+    type_row_groups (bool): Write one row group per event type
+    matches_folder (str): Local folder of the matches metadata
+    ledger (ProcessingLedger): Files already processed into the dataset
+    full (bool): Reprocess every file, even the ones the ledger has current
 
-        # Validate data with pydantic
-        for event in data:
-            try:
-                StatsBombEvent(**event)
-                print(f"Validated {event['id']} in {file}")
-            except Exception as e:
-                raise f"Error in {file}: {e}"
+    Returns:
+    set: Partitions written or deleted, relative to the dataset root
+    """
+    source = os.path.basename(os.path.normpath(data_folder))
+    options = {"to_frame": to_frame.__name__, "type_row_groups": type_row_groups}
+    files = sorted(os.listdir(data_folder))
+
+    changed = set()
+    if ledger is not None:
+        for key in ledger.keys(source):
+            if os.path.basename(key) not in files:
+                partition = ledger.get(key)["partition"]
+                shutil.rmtree(os.path.join(output_folder, partition), True)
+                ledger.stage_removal(key)
+                changed.add(partition)
+    if ledger is not None and not full:
+        files = [
+            file
+            for file in files
+            if not ledger.is_current(
+                f"{source}/{file}", f"{data_folder}{file}", output_folder, **options
+            )
+        ]
+
+    seasons = match_seasons(matches_folder)
+    parent = os.path.dirname(os.path.normpath(output_folder))
+    os.makedirs(parent or ".", exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=parent or ".") as folder:
+        arguments = (seasons, validate, sample, to_frame, type_row_groups)
+        if workers > 1 and len(files) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        process_file,
+                        repeat(data_folder),
+                        files,
+                        repeat(folder),
+                        *(repeat(argument) for argument in arguments),
+                    )
+                )
+        else:
+            results = [
+                process_file(data_folder, file, folder, *arguments) for file in files
+            ]
+        partitions, reports = zip(*results) if results else ((), ())
+
+        if validate:
+            report = ValidationReport()
+            for file_report in reports:
+                report.merge(file_report)
+            print(report)
+            if not report.ok:
+                raise ValueError(f"Invalid events in {data_folder}\n{report}")
+
+        for file, partition in zip(files, partitions, strict=True):
+            replace_partition(
+                os.path.join(folder, partition), os.path.join(output_folder, partition)
+            )
+            if ledger is not None:
+                ledger.stage_file(
+                    f"{source}/{file}", f"{data_folder}{file}", partition, **options
+                )
+            changed.add(partition)
+    return changed
 
-        # Create dataframe
-        df = pandas.DataFrame(data)
-        df["match_id"] = file.replace(".json", "")
 
-        # Save as csv file
-        output_file = f'{output_folder}{file.replace(".json", ".csv")}'
-        match_dfs.append(df)
+def process_data(
+    data_folder: str = "data/events/",
+    output_folder: str = "data/processed/",
+    workers: int = 1,
+    sample: float = 1.0,
+    type_row_groups: bool = False,
+    ledger: ProcessingLedger | None = None,
+    full: bool = False,
+) -> set:
+    """
+    Process data from StatsBomb repository.
 
-    # Concatenate dataframes
-    match_dfs = pandas.concat(match_dfs)
+    Args:
+    data_folder (str): Local folder to read data from
+    output_folder (str): Local folder to save data
+    workers (int): Number of worker processes
+    sample (float): Share of the events to validate, between 0 and 1
+    type_row_groups (bool): Write one row group per event type
+    ledger (ProcessingLedger): Files already processed, to skip them
+    full (bool): Reprocess every file, even the unchanged ones
 
-    # Save as parquet file
-    output_file = f"{output_folder}all_matches_events.parquet"
-    match_dfs.to_parquet(output_file, index=False)
+    Returns:
+    set: Partitions written or deleted
+    """
+    print(f"Processing {len(os.listdir(data_folder))} event files")
+
+    # Save as partitioned parquet dataset
+    output_dataset = f"{output_folder}events"
+    # Events are flattened into the typed columns of EVENT_SCHEMA
+    changed = process_files(
+        data_folder,
+        output_dataset,
+        workers,
+        validate=True,
+        sample=sample,
+        to_frame=flatten_events,
+        type_row_groups=type_row_groups,
+        ledger=ledger,
+        full=full,
+    )
 
-    print(f"Saved {output_file}")
+    print(f"Updated {len(changed)} partitions of {output_dataset}")
+    return changed
 
 
 def process_data_360(
-    data_folder: str = "data/three-sixty/", output_folder: str = "data/processed/"
-):
+    data_folder: str = "data/three-sixty/",
+    output_folder: str = "data/processed/",
+    workers: int = 1,
+    ledger: ProcessingLedger | None = None,
+    full: bool = False,
+) -> set:
     """
     Process three sixty data from StatsBomb repository.
 
     Args:
     data_folder (str): Local folder to read data from
     output_folder (str): Local folder to save data
+    workers (int): Number of worker processes
+    ledger (ProcessingLedger): Files already processed, to skip them
+    full (bool): Reprocess every file, even the unchanged ones
 
     Returns:
-    None
+    set: Partitions written or deleted
     """
-    # Create output folder if it does not exist
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+    print(f"Processing {len(os.listdir(data_folder))} three-sixty files")
+
+    # Save as partitioned parquet dataset
+    output_dataset = f"{output_folder}three-sixty"
+    # Frames are keyed by their event UUID as 16 bytes
+    changed = process_files(
+        data_folder,
+        output_dataset,
+        workers,
+        to_frame=flatten_three_sixty,
+        ledger=ledger,
+        full=full,
+    )
 
-    # Get list of files in data folder
-    files = os.listdir(data_folder)
-    print(f"Processing {len(files)} three-sixty files")
+    print(f"Updated {len(changed)} partitions of {output_dataset}")
+    return changed
 
-    match_dfs = []
-    for file in files:
-        # Read json file
-        with open(f"{data_folder}{file}") as f:
-            data = json.load(f)
 
-        # Create dataframe
-        df = pandas.DataFrame(data)
-        df["match_id"] = file.replace(".json", "")
+def _read_partition(
+    dataset: str, partition: str, columns: list | None = None
+) -> pandas.DataFrame | None:
+    """Read one partition of a dataset, or None if it does not exist."""
+    files = sorted(glob.glob(os.path.join(dataset, partition, "*.parquet")))
+    if not files:
+        return None
+    return fastparquet.ParquetFile(files).to_pandas(columns=columns)
 
-        match_dfs.append(df)
 
-    # Concatenate dataframes
-    match_dfs = pandas.concat(match_dfs)
+def merge_match(
+    events: pandas.DataFrame, events_360: pandas.DataFrame
+) -> pandas.DataFrame:
+    """
+    Left-join the three sixty frames of one match onto its events.
 
-    # Save as parquet file
-    output_file = f"{output_folder}all_matches_360.parquet"
-    match_dfs.to_parquet(output_file, index=False)
+    Event ids and frame UUIDs are joined as 16-byte keys, split into two
+    64-bit integers, rather than as 36-character strings.
 
-    print(f"Saved {output_file}")
+    Args:
+    events (pd.DataFrame): Events of the match
+    events_360 (pd.DataFrame): Three sixty frames of the match
+
+    Returns:
+    pd.DataFrame: One row per event, without the duplicate event_uuid
+    """
+    keys = ["uuid_hi", "uuid_lo"]
+    event_words = uuid_words(uuid_keys(events["id"]))
+    frame_words = uuid_words(events_360["event_uuid"].tolist())
+    return (
+        events.assign(**dict(zip(keys, event_words, strict=True)))
+        .merge(
+            events_360.drop(columns="event_uuid").assign(
+                **dict(zip(keys, frame_words, strict=True))
+            ),
+            how="left",
+            on=keys,
+            suffixes=("_events", "_360"),
+        )
+        .drop(columns=keys)
+    )
 
 
-def merge_data(output_folder: str = "data/processed/"):
+def merge_data(output_folder: str = "data/processed/", partitions=None):
     """
     Merge data from StatsBomb repository.
 
+    Events and three sixty data are merged one match partition at a time,
+    so memory is bounded by the largest match, and each merged partition
+    replaces the previous one.
+
     Args:
     output_folder (str): Local folder to save data
+    partitions (Iterable): Partitions to merge again (default: every
+        partition of the events dataset)
 
     Returns:
     None
     """
-    # Read data
-    events = pandas.read_parquet(f"{output_folder}all_matches_events.parquet")
-    events_360 = pandas.read_parquet(f"{output_folder}all_matches_360.parquet")
-
-    print("Merge data...")
-
-    # Merge data
-    merged_data = events.merge(
-        events_360,
-        how="left",
-        left_on=["match_id", "id"],
-        right_on=["match_id", "event_uuid"],
-        suffixes=("_events", "_360"),
-    )
-
-    # Save as parquet file
-    output_file = f"{output_folder}all_matches_merged.parquet"
-    merged_data.to_parquet(output_file, index=False)
+    events_dataset = f"{output_folder}events"
+    output_dataset = f"{output_folder}merged"
+    if partitions is None:
+        # Merged partitions of removed matches are deleted too
+        partitions = [
+            os.path.relpath(os.path.dirname(file), dataset)
+            for dataset in (events_dataset, output_dataset)
+            for file in glob.glob(os.path.join(dataset, "*/*/*/*.parquet"))
+        ]
+    partitions = sorted(set(partitions))
+
+    print(f"Merge {len(partitions)} partitions...")
+
+    os.makedirs(output_dataset, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output_folder) as folder:
+        for partition in partitions:
+            events = _read_partition(events_dataset, partition)
+            if events is None:
+                # The match was removed
+                shutil.rmtree(os.path.join(output_dataset, partition), True)
+                continue
+            events_360 = _read_partition(f"{output_folder}three-sixty", partition)
+            if events_360 is None:
+                events_360 = pandas.DataFrame(columns=THREE_SIXTY_COLUMNS)
+
+            merged_data = merge_match(events, events_360)
+            write_partition(merged_data, os.path.join(folder, partition))
+            replace_partition(
+                os.path.join(folder, partition),
+                os.path.join(output_dataset, partition),
+            )
+
+    print(f"Saved {output_dataset}")
+
+
+def summarize_data(output_folder: str = "data/processed/", partitions=None):
+    """
+    Write the per-match summary tables of the events dataset.
 
-    print(f"Saved {output_file}")
-    print(merged_data.head())
-    print(merged_data.columns)
+    Each table of summarize_match is a dataset of its own under
+    ``{output_folder}summary/``, partitioned like the events, so that the
+    dashboard answers counts over any set of matches by summing a few rows
+    per match.
 
+    Args:
+    output_folder (str): Local folder to save data
+    partitions (Iterable): Partitions to summarize again (default: every
+        partition of the events dataset)
 
-def main(output_folder: str = "data/processed/"):
+    Returns:
+    None
+    """
+    events_dataset = f"{output_folder}events"
+    summary_folder = f"{output_folder}summary"
+    if partitions is None:
+        # Summaries of removed matches are deleted too
+        partitions = [
+            os.path.relpath(os.path.dirname(file), dataset)
+            for dataset in [
+                events_dataset,
+                *(os.path.join(summary_folder, table) for table in SUMMARY_TABLES),
+            ]
+            for file in glob.glob(os.path.join(dataset, "*/*/*/*.parquet"))
+        ]
+    else:
+        partitions = list(partitions)
+        # Matches processed before their summaries existed
+        for file in glob.glob(os.path.join(events_dataset, "*/*/*/*.parquet")):
+            partition = os.path.relpath(os.path.dirname(file), events_dataset)
+            if not all(
+                os.path.isdir(os.path.join(summary_folder, table, partition))
+                for table in SUMMARY_TABLES
+            ):
+                partitions.append(partition)
+    partitions = sorted(set(partitions))
+
+    print(f"Summarize {len(partitions)} partitions...")
+
+    os.makedirs(summary_folder, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output_folder) as folder:
+        for partition in partitions:
+            events = _read_partition(events_dataset, partition, SUMMARY_COLUMNS)
+            if events is None:
+                # The match was removed
+                for table in SUMMARY_TABLES:
+                    shutil.rmtree(os.path.join(summary_folder, table, partition), True)
+                continue
+
+            for table, df in summarize_match(events).items():
+                write_partition(df, os.path.join(folder, table, partition))
+                replace_partition(
+                    os.path.join(folder, table, partition),
+                    os.path.join(summary_folder, table, partition),
+                )
+
+    print(f"Saved {summary_folder}")
+
+
+def main(
+    output_folder: str = "data/processed/",
+    workers: int = 1,
+    sample: float = 1.0,
+    type_row_groups: bool = False,
+    full: bool = False,
+    ledger_path: str = cc.PROCESSING_LEDGER_PATH,
+):
     """
     Main function to process data from StatsBomb repository.
 
+    Only the files added or changed since the last run are processed, and
+    only their partitions of the merged and summary datasets are rebuilt.
+    The ledger is written last, once every output is up to date, so a run
+    interrupted midway is redone by the next one.
+
     Args:
-    data_folder (str): Local folder to read data from
     output_folder (str): Local folder to save data
+    workers (int): Number of worker processes
+    sample (float): Share of the events to validate, between 0 and 1
+    type_row_groups (bool): Write one row group per event type
+    full (bool): Reprocess every file, even the ones the ledger has current;
+        the ledger is kept, so the partitions of removed files are deleted
+    ledger_path (str): JSON file recording the files already processed
 
     Returns:
     None
     """
-    process_data(data_folder="data/events/", output_folder=output_folder)
-    process_data_360(data_folder="data/three-sixty/", output_folder=output_folder)
-    merge_data(
-        output_folder=output_folder
+    ledger = ProcessingLedger(ledger_path)
+
+    changed = process_data(
+        data_folder="data/events/",
+        output_folder=output_folder,
+        workers=workers,
+        sample=sample,
+        type_row_groups=type_row_groups,
+        ledger=ledger,
+        full=full,
+    )
+    changed |= process_data_360(
+        data_folder="data/three-sixty/",
+        output_folder=output_folder,
+        workers=workers,
+        ledger=ledger,
+        full=full,
     )
+    merge_data(output_folder=output_folder, partitions=None if full else changed)
+    summarize_data(output_folder=output_folder, partitions=None if full else changed)
+    ledger.commit()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Process StatsBomb open data.")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output-folder", default="data/processed/")
+    parser.add_argument(
+        "--validate-sample",
+        type=float,
+        default=1.0,
+        help="Share of the events to validate, e.g. 0.05 for large backfills",
+    )
+    parser.add_argument(
+        "--type-row-groups",
+        action="store_true",
+        help="Write one row group per event type, to skip other types on read",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Reprocess every file instead of only the new and changed ones",
+    )
+    parser.add_argument("--ledger", default=cc.PROCESSING_LEDGER_PATH)
+    args = parser.parse_args()
+
+    main(
+        output_folder=args.output_folder,
+        workers=args.workers,
+        sample=args.validate_sample,
+        type_row_groups=args.type_row_groups,
+        full=args.full,
+        ledger_path=args.ledger,
+    )
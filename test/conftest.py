@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from football_analysis.io import json
+from football_analysis.statsbomb.scrape import COMPRESSION_SUFFIXES, compress_stream
+
+# The jobs are scripts, imported the way they import each other
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "jobs"))
+
+
+def _etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data, usedforsecurity=False).hexdigest()}"'
+
+
+class OpenDataRepository:
+    """
+    Files of the StatsBomb open-data layout, served over HTTP from a thread.
+
+    Args:
+    files (dict): URL path (e.g. "/data/events/1.json") -> content
+    """
+
+    def __init__(self, files: dict[str, bytes] | None = None):
+        self.files = dict(files or {})
+        self.etags: dict[str, str] = {}
+        # URL path -> statuses answered before the file itself
+        self.failures: dict[str, list[int]] = {}
+        self.delay = 0.0
+        self.requests: dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.url = ""
+
+    def etag(self, path: str) -> str:
+        if path not in self.etags:
+            self.etags[path] = _etag(self.files[path])
+        return self.etags[path]
+
+    def put(self, path: str, content: bytes, etag: str | None = None):
+        self.files[path] = content
+        self.etags.pop(path, None)
+        if etag is not None:
+            self.etags[path] = etag
+
+    def handler(self):
+        repository = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                with repository._lock:
+                    repository.requests[self.path] = (
+                        repository.requests.get(self.path, 0) + 1
+                    )
+                    repository.in_flight += 1
+                    repository.max_in_flight = max(
+                        repository.max_in_flight, repository.in_flight
+                    )
+                    failures = repository.failures.get(self.path)
+                    status = failures.pop(0) if failures else None
+                try:
+                    time.sleep(repository.delay)
+                    self._respond(status)
+                finally:
+                    with repository._lock:
+                        repository.in_flight -= 1
+
+            def _respond(self, status: int | None):
+                if status is not None:
+                    self.send_error(status)
+                    return
+                if self.path not in repository.files:
+                    self.send_error(404)
+                    return
+                etag = repository.etag(self.path)
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                content = repository.files[self.path]
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class StubAWS:
+    """In-memory stand-in for scrape.AWS, with the methods the download job uses."""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def object_etag(self, key: str) -> str | None:
+        with self._lock:
+            data = self.objects.get(key)
+        return None if data is None else _etag(data)
+
+    def save_to_json(self, data, path: str, file_name: str):
+        with self._lock:
+            self.objects[f"{path}/{file_name}.json"] = json.dumps(data)
+
+    def upload_stream(
+        self, fileobj, path: str, file_name: str, compression: str | None = None
+    ) -> str:
+        key = f"{path}/{file_name}.json{COMPRESSION_SUFFIXES[compression]}"
+        stream = compress_stream(fileobj, compression)
+        chunks = []
+        while chunk := stream.read(64 * 1024):
+            chunks.append(chunk)
+        with self._lock:
+            self.objects[key] = b"".join(chunks)
+        return key
+
+
+@pytest.fixture
+def open_data():
+    """OpenDataRepository served on a free local port; url is the URL template."""
+    repository = OpenDataRepository()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), repository.handler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    repository.url = f"http://127.0.0.1:{server.server_port}/data/{{}}/{{}}.json"
+    yield repository
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_aws():
+    return StubAWS()
@@ -0,0 +1,54 @@
+import copy
+
+import pandas as pd
+
+from football_analysis.statsbomb.analysis import PassAnalysis
+
+
+def network() -> PassAnalysis:
+    analysis = PassAnalysis.__new__(PassAnalysis)
+    analysis.passes_between = pd.DataFrame(
+        {
+            "player_id": [1, 1, 2],
+            "pass_recipient_id": [2, 3, 1],
+            "pass_count": [4, 2, 1],
+            "x": [10.0, 10.0, 30.0],
+            "y": [20.0, 20.0, 40.0],
+            "x_end": [30.0, 50.0, 10.0],
+            "y_end": [40.0, 60.0, 20.0],
+        }
+    )
+    analysis.passers_avg_location = pd.DataFrame(
+        {
+            "player_id": [1, 2, 3],
+            "x": [10.0, 30.0, 50.0],
+            "y": [20.0, 40.0, 60.0],
+            "total_passes": [6, 1, 0],
+        }
+    )
+    analysis.players_to_plot = [1, 2]
+    analysis.players_df = pd.DataFrame(
+        {
+            "player_id": [1, 2, 3],
+            "player_name": ["A", "B", "C"],
+            "jersey_number": [4, 8, 9],
+            "position_id": [1, 2, 3],
+            "position_name": ["Goalkeeper", "Right Back", "Left Back"],
+        }
+    )
+    return analysis
+
+
+def test_plotly_network_leaves_the_shared_frames_untouched():
+    analysis = network()
+    view = copy.copy(analysis)
+    passes_between = analysis.passes_between.copy()
+    passers_avg_location = analysis.passers_avg_location.copy()
+
+    lines, nodes = view.plotly_test_network()
+
+    pd.testing.assert_frame_equal(analysis.passes_between, passes_between)
+    pd.testing.assert_frame_equal(analysis.passers_avg_location, passers_avg_location)
+    assert lines["width"].tolist() == [18.0, 4.5]
+    assert nodes["jersey_number"].tolist() == [4, 8]
+    assert nodes["font_size"].tolist() == [20.0, 10 + 10 / 6]
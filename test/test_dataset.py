@@ -0,0 +1,118 @@
+import fastparquet
+import numpy as np
+import pandas as pd
+import pytest
+
+from football_analysis.statsbomb.dataset import (
+    ParquetDataset,
+    partition_path,
+    write_batches,
+)
+from football_analysis.statsbomb.schema import flatten_events
+
+
+def event(index: int, player: str | None = None, outcome: str | None = None):
+    event = {
+        "id": f"00000000-0000-0000-0000-{index:012d}",
+        "index": index,
+        "period": 1,
+        "timestamp": "00:00:01.000",
+        "minute": 0,
+        "second": 1,
+        "type": {"id": 30, "name": "Pass"},
+        "possession": 1,
+        "possession_team": {"id": 904, "name": "Bayer Leverkusen"},
+        "play_pattern": {"id": 1, "name": "Regular Play"},
+        "team": {"id": 904, "name": "Bayer Leverkusen"},
+    }
+    if player is not None:
+        event["player"] = {"id": index, "name": player}
+    if outcome is not None:
+        event["pass"] = {"outcome": {"id": 9, "name": outcome}}
+    return event
+
+
+def batches(events: list, size: int) -> list:
+    return [flatten_events(events[i : i + size]) for i in range(0, len(events), size)]
+
+
+def assert_same_rows(df: pd.DataFrame, events: list):
+    expected = flatten_events(events)
+    categorical = [
+        column
+        for column in expected.columns
+        if isinstance(expected[column].dtype, pd.CategoricalDtype)
+    ]
+    pd.testing.assert_frame_equal(
+        df.astype(dict.fromkeys(categorical, object)),
+        expected.astype(dict.fromkeys(categorical, object)),
+        check_dtype=False,
+    )
+
+
+@pytest.fixture
+def events():
+    # Players and outcomes only show up in the later batches, and no event has
+    # a technique
+    return [
+        *(event(i) for i in range(4)),
+        *(event(i, player=f"Player {i % 3}") for i in range(4, 8)),
+        *(event(i, player=f"Player {i}", outcome="Incomplete") for i in range(8, 10)),
+    ]
+
+
+def test_batches_are_appended_as_row_groups(tmp_path, events):
+    path = write_batches(batches(events, 2), str(tmp_path), row_group_size=2)
+
+    pf = fastparquet.ParquetFile(path)
+    assert len(pf.row_groups) == 5
+    df = pf.to_pandas()
+    assert_same_rows(df, events)
+    assert df["player_name"].dtype == "category"
+    assert set(df["player_name"].cat.categories) == {
+        "Player 0",
+        "Player 1",
+        "Player 2",
+        "Player 8",
+        "Player 9",
+    }
+    # Never filled: read back as strings, not as a placeholder category
+    assert df["pass_technique_name"].dtype == object
+    assert df["pass_technique_name"].isna().all()
+
+
+def test_batches_are_gathered_into_row_groups(tmp_path, events):
+    path = write_batches(batches(events, 2), str(tmp_path), row_group_size=5)
+
+    pf = fastparquet.ParquetFile(path)
+    assert [rg.num_rows for rg in pf.row_groups] == [6, 4]
+    assert_same_rows(pf.to_pandas(), events)
+
+
+def test_categories_may_outgrow_the_codes_of_the_first_row_group(tmp_path):
+    events = [event(i, player=f"Player {i}") for i in range(300)]
+    path = write_batches(batches(events, 100), str(tmp_path), row_group_size=100)
+
+    df = fastparquet.ParquetFile(path).to_pandas()
+    assert_same_rows(df, events)
+    assert len(df["player_name"].cat.categories) == 300
+    assert df["player_name"].cat.codes.dtype == np.int16
+
+
+def test_read_match_of_appended_row_groups(tmp_path, events):
+    dataset = ParquetDataset(str(tmp_path))
+    folder = partition_path(dataset.root, 9, 281, 1)
+    write_batches(batches(events, 3), folder, row_group_size=3)
+
+    df = dataset.read_match(1, columns=["index", "player_name", "pass_outcome_name"])
+    assert df["player_name"][:4].isna().all()
+    assert df["player_name"][4:].tolist() == [
+        "Player 1",
+        "Player 2",
+        "Player 0",
+        "Player 1",
+        "Player 8",
+        "Player 9",
+    ]
+    assert df["pass_outcome_name"][:8].isna().all()
+    assert df["pass_outcome_name"][8:].tolist() == ["Incomplete"] * 2
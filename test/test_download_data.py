@@ -0,0 +1,185 @@
+import gzip
+import json
+
+import pytest
+import requests
+from download_data import (
+    create_session,
+    download_events_data,
+    shared_session,
+    sync_json,
+    sync_many,
+)
+
+from football_analysis.statsbomb.manifest import DownloadManifest
+
+GAME_IDS = ["1", "2", "3"]
+
+
+def events(game_id: str, version: int = 0) -> bytes:
+    return json.dumps([{"id": f"{game_id}-{version}", "index": 1}]).encode()
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return DownloadManifest(str(tmp_path / "manifest.json"))
+
+
+@pytest.fixture
+def repository(open_data):
+    for game_id in GAME_IDS:
+        open_data.put(f"/data/events/{game_id}.json", events(game_id))
+    return open_data
+
+
+def sync(repository, aws, manifest, concurrency=4, retries=3, **options) -> dict:
+    with create_session(concurrency, retries) as session:
+        return {
+            game_id: status
+            for game_id, status, _, _ in sync_many(
+                session,
+                aws,
+                manifest,
+                "events",
+                GAME_IDS,
+                repository.url,
+                concurrency,
+                **options,
+            )
+        }
+
+
+def test_first_run_saves_every_file(repository, stub_aws, manifest):
+    assert sync(repository, stub_aws, manifest) == dict.fromkeys(GAME_IDS, "saved")
+    for game_id in GAME_IDS:
+        key = f"events/{game_id}.json"
+        assert json.loads(stub_aws.objects[key]) == json.loads(events(game_id))
+        assert manifest.get(key)["object_etag"] == stub_aws.object_etag(key)
+
+
+def test_rerun_is_answered_by_304(repository, stub_aws, manifest):
+    sync(repository, stub_aws, manifest)
+    assert sync(repository, stub_aws, manifest) == dict.fromkeys(
+        GAME_IDS, "not modified"
+    )
+    # Every file was requested twice, the second time conditionally
+    assert all(count == 2 for count in repository.requests.values())
+
+
+def test_statuses_follow_upstream_and_bucket_changes(repository, stub_aws, manifest):
+    sync(repository, stub_aws, manifest)
+    # New ETag, same bytes
+    repository.put("/data/events/1.json", events("1"), etag='"moved"')
+    # New content
+    repository.put("/data/events/2.json", events("2", version=1))
+    # Object deleted from the bucket: downloaded again without a condition
+    del stub_aws.objects["events/3.json"]
+
+    assert sync(repository, stub_aws, manifest) == {
+        "1": "unchanged",
+        "2": "saved",
+        "3": "saved",
+    }
+    assert json.loads(stub_aws.objects["events/2.json"]) == json.loads(
+        events("2", version=1)
+    )
+    assert "events/3.json" in stub_aws.objects
+
+
+def test_resume_skips_recorded_files_without_requests(repository, stub_aws, manifest):
+    sync(repository, stub_aws, manifest)
+    requests_before = dict(repository.requests)
+    assert sync(repository, stub_aws, manifest, resume=True) == dict.fromkeys(
+        GAME_IDS, "resumed"
+    )
+    assert repository.requests == requests_before
+
+
+def test_pass_through_streams_compressed_bytes(repository, stub_aws, manifest):
+    statuses = sync(
+        repository, stub_aws, manifest, pass_through=True, compression="gzip"
+    )
+    assert statuses == dict.fromkeys(GAME_IDS, "saved")
+    for game_id in GAME_IDS:
+        assert gzip.decompress(stub_aws.objects[f"events/{game_id}.json.gz"]) == (
+            events(game_id)
+        )
+    assert sync(
+        repository, stub_aws, manifest, pass_through=True, compression="gzip"
+    ) == dict.fromkeys(GAME_IDS, "not modified")
+
+
+def test_downloads_run_concurrently(repository, stub_aws, manifest):
+    game_ids = [str(i) for i in range(8)]
+    for game_id in game_ids:
+        repository.put(f"/data/events/{game_id}.json", events(game_id))
+    repository.delay = 0.2
+
+    with create_session(4) as session:
+        results = list(
+            sync_many(
+                session, stub_aws, manifest, "events", game_ids, repository.url, 4
+            )
+        )
+
+    assert sorted(game_id for game_id, *_ in results) == sorted(game_ids)
+    assert 1 < repository.max_in_flight <= 4
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_failed_requests_are_retried(repository, stub_aws, manifest, status):
+    repository.failures["/data/events/1.json"] = [status]
+    assert sync(repository, stub_aws, manifest)["1"] == "saved"
+    assert repository.requests["/data/events/1.json"] == 2
+
+
+def test_gives_up_after_the_retries(repository, stub_aws, manifest):
+    repository.failures["/data/events/1.json"] = [503] * 3
+    with create_session(1, retries=1) as session, pytest.raises(
+        requests.exceptions.RetryError
+    ):
+        sync_json(
+            session,
+            stub_aws,
+            manifest,
+            repository.url.format("events", "1"),
+            "events",
+            "1",
+        )
+    assert manifest.get("events/1.json") is None
+
+
+def test_missing_file_raises(repository, stub_aws, manifest):
+    with create_session(1) as session, pytest.raises(requests.HTTPError):
+        sync_json(
+            session,
+            stub_aws,
+            manifest,
+            repository.url.format("events", "404"),
+            "events",
+            "404",
+        )
+
+
+def test_sessions_created_by_the_job_are_closed(
+    repository, stub_aws, manifest, monkeypatch
+):
+    closed = []
+
+    class Session(requests.Session):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    monkeypatch.setattr("download_data.create_session", lambda *args: Session())
+    statuses = download_events_data(
+        GAME_IDS, repository.url, aws=stub_aws, manifest=manifest
+    )
+    assert statuses == {"saved": len(GAME_IDS)}
+    assert len(closed) == 1
+
+    # A session given by the caller is left open
+    session = Session()
+    with shared_session(session) as shared:
+        assert shared is session
+    assert closed == [closed[0]]
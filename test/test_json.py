@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from football_analysis.io import json as fast_json
+
+EVENT = {
+    "id": "40ed4973-9f8e-4c93-b915-58470da95c4b",
+    "index": 1,
+    "period": 1,
+    "timestamp": "00:00:01.000",
+    "minute": 0,
+    "second": 1,
+    "type": {"id": 30, "name": "Pass"},
+    "possession": 1,
+    "possession_team": {"id": 904, "name": "Bayer Leverkusen"},
+    "play_pattern": {"id": 1, "name": "Regular Play"},
+    "team": {"id": 904, "name": "Bayer Leverkusen"},
+    "player": {"id": 1, "name": "Player 1"},
+    "position": {"id": 9, "name": "Right Defensive Midfield"},
+    "location": [10.0, 20.0],
+    "duration": 1.0,
+    "pass": {
+        "recipient": {"id": 2, "name": "Player 2"},
+        "length": 5.0,
+        "angle": 0.1,
+        "height": {"id": 1, "name": "Ground Pass"},
+        "end_location": [15.0, 20.0],
+    },
+}
+
+
+@pytest.mark.parametrize("backend", list(fast_json.BACKENDS))
+def test_backends_round_trip(backend):
+    backend = fast_json.get_backend(backend)
+    assert backend.loads(backend.dumps([EVENT], sort_keys=True)) == [EVENT]
+
+
+@pytest.mark.parametrize(
+    "with_msgspec",
+    [
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                fast_json.msgspec is None, reason="msgspec is not installed"
+            ),
+        ),
+        False,
+    ],
+)
+def test_decode_events(monkeypatch, with_msgspec):
+    if not with_msgspec:
+        monkeypatch.setattr(fast_json, "msgspec", None)
+    (event,) = fast_json.decode_events(json.dumps([EVENT]).encode())
+    assert str(event.id) == EVENT["id"]
+    assert event.type.name == "Pass"
+    assert event.pass_.recipient.id == 2
+
+
+def test_structs_import_without_msgspec():
+    code = (
+        "import sys; sys.modules['msgspec'] = None;"
+        "from football_analysis.models import structs;"
+        "assert structs.msgspec is None and structs.Event.__name__ == 'Event'"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)  # noqa: S603
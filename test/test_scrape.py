@@ -0,0 +1,118 @@
+import gzip
+import hashlib
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from football_analysis.io import json
+from football_analysis.statsbomb.scrape import AWS, HashingStream
+
+PAYLOAD_SIZE = 128 * 1024 * 1024
+
+
+class StubClient:
+    """Stand-in for the boto3 S3 client that keeps put objects in memory."""
+
+    def __init__(self, delay: float = 0.0):
+        self.objects: dict[str, bytes] = {}
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def put_object(self, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.objects[kwargs["Key"]] = kwargs["Body"]
+            self.in_flight -= 1
+
+    def upload_fileobj(self, fileobj, bucket, key, **kwargs):
+        # Read part by part like a multipart upload, keeping only a digest
+        digest = hashlib.sha256()
+        while part := fileobj.read(kwargs["Config"].multipart_chunksize):
+            digest.update(part)
+        self.objects[key] = (digest.hexdigest(), kwargs["ExtraArgs"])
+
+
+class JsonSource:
+    """Response-like file object generating a large JSON array chunk by chunk."""
+
+    def __init__(self, size: int):
+        self.remaining = size
+        self.digest = hashlib.sha256()
+        self._block = b'{"id": 1, "type": {"id": 30, "name": "Pass"}},' * 1024
+
+    def read(self, size: int = -1) -> bytes:
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = (self._block * (size // len(self._block) + 1))[:size]
+        self.remaining -= size
+        self.digest.update(data)
+        return data
+
+
+@pytest.fixture
+def aws():
+    aws = AWS(max_workers=4)
+    aws.client = StubClient()
+    return aws
+
+
+def test_save_many_uploads_in_parallel(aws):
+    aws.client.delay = 0.1
+    items = (({"file": i}, "events", str(i)) for i in range(8))
+
+    timings = aws.save_many(items)
+
+    assert sorted(timings) == sorted(f"events/{i}.json" for i in range(8))
+    assert all(seconds >= 0.1 for seconds in timings.values())
+    assert {key: json.loads(body) for key, body in aws.client.objects.items()} == {
+        f"events/{i}.json": {"file": i} for i in range(8)
+    }
+    assert 1 < aws.client.max_in_flight <= 4
+
+
+def test_save_many_raises_upload_errors(aws):
+    def put_object(**kwargs):
+        raise RuntimeError("bucket unavailable")
+
+    aws.client.put_object = put_object
+    with pytest.raises(RuntimeError, match="bucket unavailable"):
+        aws.save_many([({}, "events", "1")])
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_upload_stream_memory_is_bounded(aws, compression):
+    source = JsonSource(PAYLOAD_SIZE)
+    body = HashingStream(source)
+
+    tracemalloc.start()
+    try:
+        key = aws.upload_stream(body, "events", "1", compression)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert key == "events/1.json" + (".gz" if compression else "")
+    assert body.size == PAYLOAD_SIZE
+    assert body.sha256 == source.digest.hexdigest()
+    if compression is None:
+        assert aws.client.objects[key][0] == body.sha256
+    # A few multipart chunks at most, never the whole payload
+    assert peak < PAYLOAD_SIZE / 4
+
+
+def test_gzip_upload_round_trips(aws):
+    chunks = []
+    aws.client.upload_fileobj = lambda fileobj, *args, **kwargs: chunks.append(
+        fileobj.read()
+    )
+    source = JsonSource(1024 * 1024)
+    aws.upload_stream(HashingStream(source), "events", "1", "gzip")
+    assert hashlib.sha256(gzip.decompress(chunks[0])).hexdigest() == (
+        source.digest.hexdigest()
+    )